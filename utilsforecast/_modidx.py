@@ -22,6 +22,8 @@ d = { 'settings': { 'branch': 'main',
                                           'utilsforecast.evaluation.evaluate': ('evaluation.html#evaluate', 'utilsforecast/evaluation.py')},
             'utilsforecast.feature_engineering': { 'utilsforecast.feature_engineering._add_features': ( 'feature_engineering.html#_add_features',
                                                                                                         'utilsforecast/feature_engineering.py'),
+                                                   'utilsforecast.feature_engineering._add_features_lazy': ( 'feature_engineering.html#_add_features_lazy',
+                                                                                                             'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering._add_time_features': ( 'feature_engineering.html#_add_time_features',
                                                                                                              'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering._assign_slices': ( 'feature_engineering.html#_assign_slices',
@@ -30,8 +32,12 @@ d = { 'settings': { 'branch': 'main',
                                                                                                                 'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering._fourier': ( 'feature_engineering.html#_fourier',
                                                                                                    'utilsforecast/feature_engineering.py'),
+                                                   'utilsforecast.feature_engineering._fourier_exprs': ( 'feature_engineering.html#_fourier_exprs',
+                                                                                                         'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering._trend': ( 'feature_engineering.html#_trend',
                                                                                                  'utilsforecast/feature_engineering.py'),
+                                                   'utilsforecast.feature_engineering._trend_exprs': ( 'feature_engineering.html#_trend_exprs',
+                                                                                                       'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering.fourier': ( 'feature_engineering.html#fourier',
                                                                                                   'utilsforecast/feature_engineering.py'),
                                                    'utilsforecast.feature_engineering.future_exog_to_historic': ( 'feature_engineering.html#future_exog_to_historic',
@@ -52,24 +58,103 @@ d = { 'settings': { 'branch': 'main',
                                                                                                    'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.__repr__': ( 'grouped_array.html#groupedarray.__repr__',
                                                                                                     'utilsforecast/grouped_array.py'),
-                                             'utilsforecast.grouped_array.GroupedArray._take_from_ranges': ( 'grouped_array.html#groupedarray._take_from_ranges',
-                                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray._float_like': ( 'grouped_array.html#groupedarray._float_like',
+                                                                                                       'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray._reduce': ( 'grouped_array.html#groupedarray._reduce',
+                                                                                                   'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray._rolling': ( 'grouped_array.html#groupedarray._rolling',
+                                                                                                    'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray._take_segments': ( 'grouped_array.html#groupedarray._take_segments',
+                                                                                                          'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.append': ( 'grouped_array.html#groupedarray.append',
                                                                                                   'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.append_several': ( 'grouped_array.html#groupedarray.append_several',
                                                                                                           'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.count_nonnan': ( 'grouped_array.html#groupedarray.count_nonnan',
+                                                                                                        'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.diff': ( 'grouped_array.html#groupedarray.diff',
+                                                                                                'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.expanding_mean': ( 'grouped_array.html#groupedarray.expanding_mean',
+                                                                                                          'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.from_sorted_df': ( 'grouped_array.html#groupedarray.from_sorted_df',
                                                                                                           'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.max': ( 'grouped_array.html#groupedarray.max',
+                                                                                               'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.mean': ( 'grouped_array.html#groupedarray.mean',
+                                                                                                'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.min': ( 'grouped_array.html#groupedarray.min',
+                                                                                               'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.quantile': ( 'grouped_array.html#groupedarray.quantile',
+                                                                                                    'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.rolling_max': ( 'grouped_array.html#groupedarray.rolling_max',
+                                                                                                       'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.rolling_mean': ( 'grouped_array.html#groupedarray.rolling_mean',
+                                                                                                        'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.rolling_min': ( 'grouped_array.html#groupedarray.rolling_min',
+                                                                                                       'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.rolling_std': ( 'grouped_array.html#groupedarray.rolling_std',
+                                                                                                       'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.shift': ( 'grouped_array.html#groupedarray.shift',
+                                                                                                 'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.std': ( 'grouped_array.html#groupedarray.std',
+                                                                                               'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GroupedArray.sum': ( 'grouped_array.html#groupedarray.sum',
+                                                                                               'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.take': ( 'grouped_array.html#groupedarray.take',
                                                                                                 'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array.GroupedArray.take_from_groups': ( 'grouped_array.html#groupedarray.take_from_groups',
                                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray': ( 'grouped_array.html#growablegroupedarray',
+                                                                                                   'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.__getitem__': ( 'grouped_array.html#growablegroupedarray.__getitem__',
+                                                                                                               'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.__init__': ( 'grouped_array.html#growablegroupedarray.__init__',
+                                                                                                            'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.__len__': ( 'grouped_array.html#growablegroupedarray.__len__',
+                                                                                                           'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.__repr__': ( 'grouped_array.html#growablegroupedarray.__repr__',
+                                                                                                            'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray._grow': ( 'grouped_array.html#growablegroupedarray._grow',
+                                                                                                         'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray._relocate': ( 'grouped_array.html#growablegroupedarray._relocate',
+                                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.append': ( 'grouped_array.html#growablegroupedarray.append',
+                                                                                                          'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.append_several': ( 'grouped_array.html#growablegroupedarray.append_several',
+                                                                                                                  'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.compact': ( 'grouped_array.html#growablegroupedarray.compact',
+                                                                                                           'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.n_rows': ( 'grouped_array.html#growablegroupedarray.n_rows',
+                                                                                                          'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array.GrowableGroupedArray.reserve': ( 'grouped_array.html#growablegroupedarray.reserve',
+                                                                                                           'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array._append_one': ( 'grouped_array.html#_append_one',
                                                                                           'utilsforecast/grouped_array.py'),
                                              'utilsforecast.grouped_array._append_several': ( 'grouped_array.html#_append_several',
-                                                                                              'utilsforecast/grouped_array.py')},
+                                                                                              'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._copy_segments': ( 'grouped_array.html#_copy_segments',
+                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._copy_segments_kernel': ( 'grouped_array.html#_copy_segments_kernel',
+                                                                                                    'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._reduce_kernel': ( 'grouped_array.html#_reduce_kernel',
+                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._reduce_numpy': ( 'grouped_array.html#_reduce_numpy',
+                                                                                            'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._reduce_segment': ( 'grouped_array.html#_reduce_segment',
+                                                                                              'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._rolling_kernel': ( 'grouped_array.html#_rolling_kernel',
+                                                                                              'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._rolling_numpy': ( 'grouped_array.html#_rolling_numpy',
+                                                                                             'utilsforecast/grouped_array.py'),
+                                             'utilsforecast.grouped_array._slice_bounds': ( 'grouped_array.html#_slice_bounds',
+                                                                                            'utilsforecast/grouped_array.py')},
             'utilsforecast.losses': { 'utilsforecast.losses._base_docstring': ('losses.html#_base_docstring', 'utilsforecast/losses.py'),
+                                      'utilsforecast.losses._pa_agg_values': ('losses.html#_pa_agg_values', 'utilsforecast/losses.py'),
+                                      'utilsforecast.losses._pa_float_values': ('losses.html#_pa_float_values', 'utilsforecast/losses.py'),
+                                      'utilsforecast.losses._pa_group_agg': ('losses.html#_pa_group_agg', 'utilsforecast/losses.py'),
+                                      'utilsforecast.losses._pd_group_agg': ('losses.html#_pd_group_agg', 'utilsforecast/losses.py'),
                                       'utilsforecast.losses._pl_agg_expr': ('losses.html#_pl_agg_expr', 'utilsforecast/losses.py'),
+                                      'utilsforecast.losses._segment_nan_agg': ('losses.html#_segment_nan_agg', 'utilsforecast/losses.py'),
                                       'utilsforecast.losses._zero_to_nan': ('losses.html#_zero_to_nan', 'utilsforecast/losses.py'),
                                       'utilsforecast.losses.bias': ('losses.html#bias', 'utilsforecast/losses.py'),
                                       'utilsforecast.losses.calibration': ('losses.html#calibration', 'utilsforecast/losses.py'),
@@ -89,34 +174,256 @@ d = { 'settings': { 'branch': 'main',
                                         'utilsforecast.plotting.plot_series': ('plotting.html#plot_series', 'utilsforecast/plotting.py')},
             'utilsforecast.preprocessing': { 'utilsforecast.preprocessing._determine_bound': ( 'preprocessing.html#_determine_bound',
                                                                                                'utilsforecast/preprocessing.py'),
-                                             'utilsforecast.preprocessing._determine_bound_pl': ( 'preprocessing.html#_determine_bound_pl',
+                                             'utilsforecast.preprocessing._fill_gaps_arrow': ( 'preprocessing.html#_fill_gaps_arrow',
+                                                                                               'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._grid_from_bounds': ( 'preprocessing.html#_grid_from_bounds',
+                                                                                                'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._id_time_grid_arrow': ( 'preprocessing.html#_id_time_grid_arrow',
                                                                                                   'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._pa_grid': ( 'preprocessing.html#_pa_grid',
+                                                                                       'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._pa_times_from_int': ( 'preprocessing.html#_pa_times_from_int',
+                                                                                                 'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._pl_bound_expr': ( 'preprocessing.html#_pl_bound_expr',
+                                                                                             'utilsforecast/preprocessing.py'),
+                                             'utilsforecast.preprocessing._warn_if_values_lost': ( 'preprocessing.html#_warn_if_values_lost',
+                                                                                                   'utilsforecast/preprocessing.py'),
                                              'utilsforecast.preprocessing.fill_gaps': ( 'preprocessing.html#fill_gaps',
                                                                                         'utilsforecast/preprocessing.py'),
                                              'utilsforecast.preprocessing.id_time_grid': ( 'preprocessing.html#id_time_grid',
                                                                                            'utilsforecast/preprocessing.py')},
-            'utilsforecast.processing': { 'utilsforecast.processing.DataFrameProcessor': ( 'processing.html#dataframeprocessor',
+            'utilsforecast.processing': { 'utilsforecast.processing.BacktestSplitIndices': ( 'processing.html#backtestsplitindices',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.BacktestSplitIndices.train_idxs': ( 'processing.html#backtestsplitindices.train_idxs',
+                                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.BacktestSplitIndices.train_sizes': ( 'processing.html#backtestsplitindices.train_sizes',
+                                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.BacktestSplitIndices.valid_idxs': ( 'processing.html#backtestsplitindices.valid_idxs',
+                                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.BacktestSplitIndices.valid_sizes': ( 'processing.html#backtestsplitindices.valid_sizes',
+                                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.DataFrameProcessor': ( 'processing.html#dataframeprocessor',
                                                                                            'utilsforecast/processing.py'),
                                           'utilsforecast.processing.DataFrameProcessor.__init__': ( 'processing.html#dataframeprocessor.__init__',
                                                                                                     'utilsforecast/processing.py'),
                                           'utilsforecast.processing.DataFrameProcessor.process': ( 'processing.html#dataframeprocessor.process',
                                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.DataFrameProcessor.update': ( 'processing.html#dataframeprocessor.update',
+                                                                                                  'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.EncodedIds': ( 'processing.html#encodedids',
+                                                                                   'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.FactorizedIds': ( 'processing.html#factorizedids',
+                                                                                      'utilsforecast/processing.py'),
                                           'utilsforecast.processing.ProcessedDF': ( 'processing.html#processeddf',
                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex': ( 'processing.html#seriesindex',
+                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.__init__': ( 'processing.html#seriesindex.__init__',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.__len__': ( 'processing.html#seriesindex.__len__',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.__repr__': ( 'processing.html#seriesindex.__repr__',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.check_df': ( 'processing.html#seriesindex.check_df',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.from_df': ( 'processing.html#seriesindex.from_df',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.get_range': ( 'processing.html#seriesindex.get_range',
+                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.n_rows': ( 'processing.html#seriesindex.n_rows',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.n_series': ( 'processing.html#seriesindex.n_series',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.sizes': ( 'processing.html#seriesindex.sizes',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.SeriesIndex.sort': ( 'processing.html#seriesindex.sort',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._as_int_array': ( 'processing.html#_as_int_array',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._assign_columns_arrow': ( 'processing.html#_assign_columns_arrow',
+                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._assign_columns_pandas': ( 'processing.html#_assign_columns_pandas',
+                                                                                               'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._assign_columns_polars': ( 'processing.html#_assign_columns_polars',
+                                                                                               'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._backend_dispatch': ( 'processing.html#_backend_dispatch',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._backtest_windows': ( 'processing.html#_backtest_windows',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._between_arrow': ( 'processing.html#_between_arrow',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._between_pandas': ( 'processing.html#_between_pandas',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._between_polars': ( 'processing.html#_between_polars',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._cast_arrow': ( 'processing.html#_cast_arrow',
+                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._cast_pandas': ( 'processing.html#_cast_pandas',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._cast_polars': ( 'processing.html#_cast_polars',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._check_list_assignment': ( 'processing.html#_check_list_assignment',
+                                                                                               'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._column_names': ( 'processing.html#_column_names',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._column_to_numpy': ( 'processing.html#_column_to_numpy',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._compare_keys': ( 'processing.html#_compare_keys',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._counting_argsort': ( 'processing.html#_counting_argsort',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._datetime_ranges': ( 'processing.html#_datetime_ranges',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._day_months': ( 'processing.html#_day_months',
+                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._drop_columns_arrow': ( 'processing.html#_drop_columns_arrow',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._drop_columns_pandas': ( 'processing.html#_drop_columns_pandas',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._drop_columns_polars': ( 'processing.html#_drop_columns_polars',
+                                                                                             'utilsforecast/processing.py'),
                                           'utilsforecast.processing._ensure_month_ends': ( 'processing.html#_ensure_month_ends',
                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._fill_null_arrow': ( 'processing.html#_fill_null_arrow',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._fill_null_pandas': ( 'processing.html#_fill_null_pandas',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._fill_null_polars': ( 'processing.html#_fill_null_polars',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._filter_with_mask_arrow': ( 'processing.html#_filter_with_mask_arrow',
+                                                                                                'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._filter_with_mask_indexable': ( 'processing.html#_filter_with_mask_indexable',
+                                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._filter_with_mask_polars': ( 'processing.html#_filter_with_mask_polars',
+                                                                                                 'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._group_by_agg_arrow': ( 'processing.html#_group_by_agg_arrow',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._group_by_agg_pandas': ( 'processing.html#_group_by_agg_pandas',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._group_by_agg_polars': ( 'processing.html#_group_by_agg_polars',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._group_by_pandas': ( 'processing.html#_group_by_pandas',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._group_by_polars': ( 'processing.html#_group_by_polars',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._hash_join_indices': ( 'processing.html#_hash_join_indices',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._index_dtype': ( 'processing.html#_index_dtype',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._indptr_from_sizes': ( 'processing.html#_indptr_from_sizes',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_in_arrow': ( 'processing.html#_is_in_arrow',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_in_pandas': ( 'processing.html#_is_in_pandas',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_in_polars': ( 'processing.html#_is_in_polars',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_marked_sorted': ( 'processing.html#_is_marked_sorted',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_nan_arrow': ( 'processing.html#_is_nan_arrow',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_nan_or_none_arrow': ( 'processing.html#_is_nan_or_none_arrow',
+                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_nan_pandas': ( 'processing.html#_is_nan_pandas',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_nan_polars': ( 'processing.html#_is_nan_polars',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_none_arrow': ( 'processing.html#_is_none_arrow',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_none_pandas': ( 'processing.html#_is_none_pandas',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_none_polars': ( 'processing.html#_is_none_polars',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._is_sorted_by_id_time': ( 'processing.html#_is_sorted_by_id_time',
+                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._join_from_indices': ( 'processing.html#_join_from_indices',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._join_key_codes': ( 'processing.html#_join_key_codes',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._keys_are_sorted': ( 'processing.html#_keys_are_sorted',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._map_int_values': ( 'processing.html#_map_int_values',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._mark_sorted': ( 'processing.html#_mark_sorted',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._merge_sorted_keys': ( 'processing.html#_merge_sorted_keys',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._month_starts': ( 'processing.html#_month_starts',
+                                                                                      'utilsforecast/processing.py'),
                                           'utilsforecast.processing._multiply_pl_freq': ( 'processing.html#_multiply_pl_freq',
                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._n_chunks': ( 'processing.html#_n_chunks',
+                                                                                  'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._offset_dt64': ( 'processing.html#_offset_dt64',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._offset_pl_times': ( 'processing.html#_offset_pl_times',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._pa_times_to_pandas': ( 'processing.html#_pa_times_to_pandas',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._pd_key_codes': ( 'processing.html#_pd_key_codes',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._pd_values': ( 'processing.html#_pd_values',
+                                                                                   'utilsforecast/processing.py'),
                                           'utilsforecast.processing._polars_categorical_to_numerical': ( 'processing.html#_polars_categorical_to_numerical',
                                                                                                          'utilsforecast/processing.py'),
-                                          'utilsforecast.processing._single_split': ( 'processing.html#_single_split',
+                                          'utilsforecast.processing._ranges_to_positions': ( 'processing.html#_ranges_to_positions',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._rename_arrow': ( 'processing.html#_rename_arrow',
                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._rename_pandas': ( 'processing.html#_rename_pandas',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._rename_polars': ( 'processing.html#_rename_polars',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._run_values': ( 'processing.html#_run_values',
+                                                                                    'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._segment_searchsorted': ( 'processing.html#_segment_searchsorted',
+                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._segment_searchsorted_kernel': ( 'processing.html#_segment_searchsorted_kernel',
+                                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._shift_bdays': ( 'processing.html#_shift_bdays',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._shift_months': ( 'processing.html#_shift_months',
+                                                                                      'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._shift_weeks': ( 'processing.html#_shift_weeks',
+                                                                                     'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_arrow_array': ( 'processing.html#_sort_arrow_array',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_arrow_table': ( 'processing.html#_sort_arrow_table',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_pandas_1d': ( 'processing.html#_sort_pandas_1d',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_pandas_frame': ( 'processing.html#_sort_pandas_frame',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_polars_frame': ( 'processing.html#_sort_polars_frame',
+                                                                                           'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._sort_polars_series': ( 'processing.html#_sort_polars_series',
+                                                                                            'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._stack_columns': ( 'processing.html#_stack_columns',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._take_rows_arrow': ( 'processing.html#_take_rows_arrow',
+                                                                                         'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._take_rows_indexable': ( 'processing.html#_take_rows_indexable',
+                                                                                             'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._take_rows_pandas': ( 'processing.html#_take_rows_pandas',
+                                                                                          'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._times_to_numpy': ( 'processing.html#_times_to_numpy',
+                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._union_pd_categoricals': ( 'processing.html#_union_pd_categoricals',
+                                                                                               'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._union_pl_categoricals': ( 'processing.html#_union_pl_categoricals',
+                                                                                               'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._units_per_day': ( 'processing.html#_units_per_day',
+                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing._unsupported_type': ( 'processing.html#_unsupported_type',
+                                                                                          'utilsforecast/processing.py'),
                                           'utilsforecast.processing.add_insample_levels': ( 'processing.html#add_insample_levels',
                                                                                             'utilsforecast/processing.py'),
                                           'utilsforecast.processing.anti_join': ( 'processing.html#anti_join',
                                                                                   'utilsforecast/processing.py'),
                                           'utilsforecast.processing.assign_columns': ( 'processing.html#assign_columns',
                                                                                        'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.backtest_split_indices': ( 'processing.html#backtest_split_indices',
+                                                                                               'utilsforecast/processing.py'),
                                           'utilsforecast.processing.backtest_splits': ( 'processing.html#backtest_splits',
                                                                                         'utilsforecast/processing.py'),
                                           'utilsforecast.processing.between': ('processing.html#between', 'utilsforecast/processing.py'),
@@ -126,12 +433,18 @@ d = { 'settings': { 'branch': 'main',
                                           'utilsforecast.processing.counts_by_id': ( 'processing.html#counts_by_id',
                                                                                      'utilsforecast/processing.py'),
                                           'utilsforecast.processing.cv_times': ('processing.html#cv_times', 'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.decode_ids': ( 'processing.html#decode_ids',
+                                                                                   'utilsforecast/processing.py'),
                                           'utilsforecast.processing.drop_columns': ( 'processing.html#drop_columns',
                                                                                      'utilsforecast/processing.py'),
                                           'utilsforecast.processing.drop_index_if_pandas': ( 'processing.html#drop_index_if_pandas',
                                                                                              'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.encode_ids': ( 'processing.html#encode_ids',
+                                                                                   'utilsforecast/processing.py'),
                                           'utilsforecast.processing.ensure_sorted': ( 'processing.html#ensure_sorted',
                                                                                       'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.factorize_ids': ( 'processing.html#factorize_ids',
+                                                                                      'utilsforecast/processing.py'),
                                           'utilsforecast.processing.fill_null': ( 'processing.html#fill_null',
                                                                                   'utilsforecast/processing.py'),
                                           'utilsforecast.processing.filter_with_mask': ( 'processing.html#filter_with_mask',
@@ -147,6 +460,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                        'utilsforecast/processing.py'),
                                           'utilsforecast.processing.is_none': ('processing.html#is_none', 'utilsforecast/processing.py'),
                                           'utilsforecast.processing.join': ('processing.html#join', 'utilsforecast/processing.py'),
+                                          'utilsforecast.processing.join_indices': ( 'processing.html#join_indices',
+                                                                                     'utilsforecast/processing.py'),
                                           'utilsforecast.processing.make_future_dataframe': ( 'processing.html#make_future_dataframe',
                                                                                               'utilsforecast/processing.py'),
                                           'utilsforecast.processing.match_if_categorical': ( 'processing.html#match_if_categorical',
@@ -177,6 +492,8 @@ d = { 'settings': { 'branch': 'main',
                                                                                       'utilsforecast/validation.py'),
                                           'utilsforecast.validation._is_int_dtype': ( 'validation.html#_is_int_dtype',
                                                                                       'utilsforecast/validation.py'),
+                                          'utilsforecast.validation._pl_lazy_schema': ( 'validation.html#_pl_lazy_schema',
+                                                                                        'utilsforecast/validation.py'),
                                           'utilsforecast.validation.ensure_shallow_copy': ( 'validation.html#ensure_shallow_copy',
                                                                                             'utilsforecast/validation.py'),
                                           'utilsforecast.validation.ensure_time_dtype': ( 'validation.html#ensure_time_dtype',
@@ -16,6 +16,7 @@ try:
     import polars as pl
     from polars import DataFrame as pl_DataFrame
     from polars import Expr as pl_Expr
+    from polars import LazyFrame as pl_LazyFrame
     from polars import Series as pl_Series
 
     DFType = TypeVar("DFType", pd.DataFrame, polars.DataFrame)
@@ -27,11 +28,30 @@ except ImportError:
 
     class pl_Expr: ...
 
+    class pl_LazyFrame: ...
+
     class pl_Series: ...
 
     DFType = pd.DataFrame
     POLARS_INSTALLED = False
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import ChunkedArray as pa_ChunkedArray
+    from pyarrow import Table as pa_Table
+
+    PYARROW_INSTALLED = True
+except ImportError:
+    pa = None
+    pc = None
+
+    class pa_ChunkedArray: ...
+
+    class pa_Table: ...
+
+    PYARROW_INSTALLED = False
+
 try:
     import plotly  # noqa: F401
 
@@ -47,8 +67,12 @@ except ImportError:
     PLOTLY_RESAMPLER_INSTALLED = False
 
 try:
-    from numba import njit  # noqa: F04
+    from numba import njit, prange  # noqa: F04
+
+    NUMBA_INSTALLED = True
 except ImportError:
+    NUMBA_INSTALLED = False
+    prange = range
 
     def _doublewrap(f):
         @wraps(f)
@@ -84,7 +108,7 @@ try:
 except ModuleNotFoundError:
     pass
 
-DataFrame = Union[pd.DataFrame, pl_DataFrame]
+DataFrame = Union[pd.DataFrame, pl_DataFrame, pa_Table]
 Series = Union[pd.Series, pl_Series]
 DistributedDFType = TypeVar(
     "DistributedDFType",
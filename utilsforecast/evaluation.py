@@ -13,7 +13,17 @@ import numpy as np
 import pandas as pd
 
 import utilsforecast.processing as ufp
-from .compat import AnyDFType, DFType, DistributedDFType, pl, pl_DataFrame
+from utilsforecast.compat import (
+    AnyDFType,
+    DFType,
+    DistributedDFType,
+    pa,
+    pa_Table,
+    pc,
+    pl,
+    pl_DataFrame,
+    pl_LazyFrame,
+)
 
 # %% ../nbs/evaluation.ipynb 4
 def _function_name(f: Callable):
@@ -161,12 +171,13 @@ def evaluate(
     time_col: str = "ds",
     target_col: str = "y",
     agg_fn: Optional[str] = None,
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> AnyDFType:
     """Evaluate forecast using different metrics.
 
     Parameters
     ----------
-    df : pandas, polars, dask or spark DataFrame.
+    df : pandas, polars, dask or spark DataFrame, polars LazyFrame or pyarrow Table.
         Forecasts to evaluate.
         Must have `id_col`, `time_col`, `target_col` and models' predictions.
     metrics : list of callable
@@ -174,7 +185,7 @@ def evaluate(
     models : list of str, optional (default=None)
         Names of the models to evaluate.
         If `None` will use every column in the dataframe after removing id, time and target.
-    train_df : pandas, polars, dask or spark DataFrame, optional (default=None)
+    train_df : pandas, polars, dask or spark DataFrame, polars LazyFrame or pyarrow Table, optional (default=None)
         Training set. Used to evaluate metrics such as `mase`.
     level : list of int, optional (default=None)
         Prediction interval levels. Used to compute losses that rely on quantiles.
@@ -186,14 +197,18 @@ def evaluate(
         Column that contains the target.
     agg_fn : str, optional (default=None)
         Statistic to compute on the scores by id to reduce them to a single number.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`, passed to the metrics that support it.
 
     Returns
     -------
-    pandas, polars, dask or spark DataFrame
+    pandas, polars, dask or spark DataFrame or pyarrow Table
         Metrics with one row per (id, metric) combination and one column per model.
         If `agg_fn` is not `None`, there is only one row per metric.
     """
-    if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+    if not isinstance(df, (pd.DataFrame, pl_DataFrame, pl_LazyFrame, pa_Table)):
+        if series_index is not None:
+            raise ValueError("`series_index` is not supported in distributed")
         return _distributed_evaluate(
             df=df,
             metrics=metrics,
@@ -206,7 +221,9 @@ def evaluate(
             agg_fn=agg_fn,
         )
     if models is None:
-        model_cols = _get_model_cols(df.columns, id_col, time_col, target_col)
+        model_cols = _get_model_cols(
+            ufp._column_names(df), id_col, time_col, target_col
+        )
     else:
         model_cols = models
 
@@ -218,7 +235,7 @@ def evaluate(
             for side in ("lo", "hi")
             for lvl in level
         }
-        missing = expected_cols - set(df.columns)
+        missing = expected_cols - set(ufp._column_names(df))
         if missing:
             raise ValueError(
                 f"The following columns are required for level={level} "
@@ -250,11 +267,19 @@ def evaluate(
                 "Please provide `train_df`."
             )
         train_df = ufp.sort(train_df, by=[id_col, time_col])
-        missing_series = set(df[id_col].unique()) - set(train_df[id_col].unique())
-        if missing_series:
-            raise ValueError(
-                f"The following series are missing from the train_df: {reprlib.repr(missing_series)}"
-            )
+        # the ids of a LazyFrame are only known after collecting it
+        if not isinstance(df, pl_LazyFrame):
+            if isinstance(df, pa_Table):
+                ids = set(pc.unique(df[id_col]).to_pylist())
+                train_ids = set(pc.unique(train_df[id_col]).to_pylist())
+            else:
+                ids = set(df[id_col].unique())
+                train_ids = set(train_df[id_col].unique())
+            missing_series = ids - train_ids
+            if missing_series:
+                raise ValueError(
+                    f"The following series are missing from the train_df: {reprlib.repr(missing_series)}"
+                )
 
     results_per_metric = []
     for metric in metrics:
@@ -263,6 +288,8 @@ def evaluate(
         if metric_requires_y_train[metric_name]:
             kwargs["train_df"] = train_df
         metric_params = inspect.signature(metric).parameters
+        if series_index is not None and "series_index" in metric_params:
+            kwargs["series_index"] = series_index
         if "baseline" in metric_params:
             metric_name = f"{metric_name}_{metric_params['baseline'].default}"
         if "q" in metric_params or metric_params["models"].annotation is Dict[str, str]:
@@ -305,11 +332,16 @@ def evaluate(
             results_per_metric.append(result)
     if isinstance(df, pd.DataFrame):
         df = pd.concat(results_per_metric).reset_index(drop=True)
+    elif isinstance(df, pa_Table):
+        df = pa.concat_tables(results_per_metric)
     else:
         df = pl.concat(results_per_metric, how="diagonal")
     id_cols = [id_col, "metric"]
-    model_cols = [c for c in df.columns if c not in id_cols]
-    df = df[id_cols + model_cols]
+    model_cols = [c for c in ufp._column_names(df) if c not in id_cols]
+    if isinstance(df, (pl_LazyFrame, pa_Table)):
+        df = df.select(id_cols + model_cols)
+    else:
+        df = df[id_cols + model_cols]
     if agg_fn is not None:
         df = ufp.group_by_agg(
             df,
@@ -11,7 +11,14 @@ import numpy as np
 import pandas as pd
 
 import utilsforecast.processing as ufp
-from .compat import DFType, DataFrame, pl, pl_DataFrame, pl_Expr
+from utilsforecast.compat import (
+    DFType,
+    DataFrame,
+    pl,
+    pl_DataFrame,
+    pl_Expr,
+    pl_LazyFrame,
+)
 from .validation import validate_format, validate_freq
 
 # %% ../nbs/feature_engineering.ipynb 4
@@ -25,30 +32,41 @@ def _add_features(
     id_col: str,
     time_col: str,
     f: Callable[[np.ndarray, int], _Features],
+    f_expr: Callable[[pl_Expr], List[pl_Expr]],
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> Tuple[DFType, DFType]:
     # validations
     if not isinstance(h, int) or h < 0:
         raise ValueError("`h` must be a non-negative integer")
     validate_format(df, id_col, time_col, None)
+    if isinstance(df, pl_LazyFrame):
+        return _add_features_lazy(  # type: ignore[return-value]
+            df=df,
+            freq=freq,
+            h=h,
+            id_col=id_col,
+            time_col=time_col,
+            f_expr=f_expr,
+            series_index=series_index,
+        )
     validate_freq(df[time_col], freq)
 
     # decompose series
-    id_counts = ufp.counts_by_id(df, id_col)
-    uids = id_counts[id_col]
-    sizes = id_counts["counts"].to_numpy()
+    if series_index is None:
+        series_index = ufp.SeriesIndex.from_df(df, id_col, time_col)
+    else:
+        series_index.check_df(df)
+    sizes = series_index.sizes
 
     # compute values
     cols, vals, future_vals = f(sizes=sizes, h=h)  # type: ignore
 
     # assign back to df
-    sort_idxs = ufp.maybe_compute_sort_indices(df, id_col, time_col)
-    times = df[time_col]
+    sort_idxs = series_index.sort_idxs
     if sort_idxs is not None:
         restore_idxs = np.empty_like(sort_idxs)
         restore_idxs[sort_idxs] = np.arange(sort_idxs.size)
         vals = vals[restore_idxs]
-        times = ufp.take_rows(times, sort_idxs)
-    last_times = ufp.take_rows(times, sizes.cumsum() - 1)
     df = ufp.copy_if_pandas(df, deep=False)
     transformed = ufp.assign_columns(df, cols, vals)
 
@@ -57,8 +75,8 @@ def _add_features(
 
     # future vals
     future_df = ufp.make_future_dataframe(
-        uids=uids,
-        last_times=last_times,
+        uids=series_index.uids,
+        last_times=series_index.last_times,
         freq=freq,
         h=h,
         id_col=id_col,
@@ -68,16 +86,59 @@ def _add_features(
     return transformed, future_df
 
 
+def _add_features_lazy(
+    df: pl_LazyFrame,
+    freq: Union[str, int],
+    h: int,
+    id_col: str,
+    time_col: str,
+    f_expr: Callable[[pl_Expr], List[pl_Expr]],
+    series_index: Optional[ufp.SeriesIndex] = None,
+) -> Tuple[pl_LazyFrame, pl_LazyFrame]:
+    if series_index is not None:
+        raise ValueError("`series_index` is only supported for collected DataFrames.")
+    validate_freq(df.select(time_col).head(0).collect()[time_col], freq)
+
+    # step of each row in the grid shared by all series, see `_assign_slices`
+    sizes = pl.len().over(id_col)
+    positions = pl.col(time_col).rank("ordinal").over(id_col)
+    t = (sizes.max() - sizes + positions).cast(pl.Float32)
+    transformed = df.with_columns(f_expr(t))
+
+    if h == 0:
+        return transformed, pl_LazyFrame({})
+
+    # future vals, only the last time and size of each serie are collected
+    times_by_id = (
+        df.group_by(id_col)
+        .agg(pl.col(time_col).max(), pl.len().alias("size"))
+        .sort(id_col)
+        .collect()
+    )
+    future_df = ufp.make_future_dataframe(
+        uids=times_by_id[id_col],
+        last_times=times_by_id[time_col],
+        freq=freq,
+        h=h,
+        id_col=id_col,
+        time_col=time_col,
+    )
+    future_t = (times_by_id["size"].max() + positions).cast(pl.Float32)
+    future_exprs = [e.cast(pl.Float64) for e in f_expr(future_t)]
+    return transformed, future_df.lazy().with_columns(future_exprs)
+
+
 def _assign_slices(
     sizes: np.ndarray,
     feats: np.ndarray,
     h: int,
 ) -> Tuple[np.ndarray, np.ndarray]:
     max_samples, n_feats = feats.shape
-    vals = np.empty((sizes.sum(), n_feats), dtype=np.float32)
+    vals = np.empty((sizes.sum(dtype=np.int64), n_feats), dtype=np.float32)
     future_vals = np.empty((h * sizes.size, n_feats))
     start = 0
-    for i, size in enumerate(sizes):
+    # python ints, so that the offsets can't overflow the int32 sizes
+    for i, size in enumerate(sizes.tolist()):
         vals[start : start + size, :] = feats[max_samples - size - h : max_samples - h]
         future_vals[i * h : (i + 1) * h] = feats[max_samples - h :]
         start += size
@@ -101,12 +162,25 @@ def _fourier(
     return cols, vals, future_vals
 
 
+def _fourier_exprs(t: pl_Expr, season_length: int, k: int) -> List[pl_Expr]:
+    x = (2 * np.pi * np.arange(1, k + 1) / season_length).astype(np.float32)
+    return [
+        getattr(t * float(x[i]), op)().alias(f"{op}{i+1}_{season_length}")
+        for op in ("sin", "cos")
+        for i in range(k)
+    ]
+
+
 def _trend(sizes: np.ndarray, h: int) -> _Features:
     t = np.arange(1, sizes.max() + 1 + h, dtype=np.float32).reshape(-1, 1)
     cols = ["trend"]
     vals, future_vals = _assign_slices(sizes=sizes, feats=t, h=h)
     return cols, vals, future_vals
 
+
+def _trend_exprs(t: pl_Expr) -> List[pl_Expr]:
+    return [t.alias("trend")]
+
 # %% ../nbs/feature_engineering.ipynb 5
 def fourier(
     df: DFType,
@@ -116,12 +190,13 @@ def fourier(
     h: int = 0,
     id_col: str = "unique_id",
     time_col: str = "ds",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> Tuple[DFType, DFType]:
     """Compute fourier seasonal terms for training and forecasting
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or polars LazyFrame
         Dataframe with ids, times and values for the exogenous regressors.
     freq : str or int
         Frequency of the data. Must be a valid pandas or polars offset alias, or an integer.
@@ -135,22 +210,27 @@ def fourier(
         Column that identifies each serie.
     time_col : str (default='ds')
         Column that identifies each timestep, its values can be timestamps or integers.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. If `None`, it's computed from the data.
 
     Returns
     -------
-    transformed_df : pandas or polars DataFrame
+    transformed_df : pandas or polars DataFrame or polars LazyFrame
         Original DataFrame with the computed features
-    future_df : pandas or polars DataFrame
+    future_df : pandas or polars DataFrame or polars LazyFrame
         DataFrame with future values
     """
     f = partial(_fourier, season_length=season_length, k=k)
+    f_expr = partial(_fourier_exprs, season_length=season_length, k=k)
     return _add_features(
         df=df,
         freq=freq,
         h=h,
         id_col=id_col,
         time_col=time_col,
+        series_index=series_index,
         f=f,
+        f_expr=f_expr,
     )
 
 # %% ../nbs/feature_engineering.ipynb 12
@@ -160,12 +240,13 @@ def trend(
     h: int = 0,
     id_col: str = "unique_id",
     time_col: str = "ds",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> Tuple[DFType, DFType]:
     """Add a trend column with consecutive integers for training and forecasting
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or polars LazyFrame
         Dataframe with ids, times and values for the exogenous regressors.
     freq : str or int
         Frequency of the data. Must be a valid pandas or polars offset alias, or an integer.
@@ -175,12 +256,14 @@ def trend(
         Column that identifies each serie.
     time_col : str (default='ds')
         Column that identifies each timestep, its values can be timestamps or integers.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. If `None`, it's computed from the data.
 
     Returns
     -------
-    transformed_df : pandas or polars DataFrame
+    transformed_df : pandas or polars DataFrame or polars LazyFrame
         Original DataFrame with the computed features
-    future_df : pandas or polars DataFrame
+    future_df : pandas or polars DataFrame or polars LazyFrame
         DataFrame with future values
     """
     return _add_features(
@@ -189,7 +272,9 @@ def trend(
         h=h,
         id_col=id_col,
         time_col=time_col,
+        series_index=series_index,
         f=_trend,
+        f_expr=_trend_exprs,
     )
 
 # %% ../nbs/feature_engineering.ipynb 15
@@ -224,15 +309,14 @@ def _add_time_features(
     time_col: str = "ds",
 ) -> DFType:
     df = ufp.copy_if_pandas(df, deep=False)
-    unique_times = df[time_col].unique()
     if isinstance(df, pd.DataFrame):
-        times = pd.Index(unique_times)
+        times = pd.Index(df[time_col].unique())
         time2pos = {time: i for i, time in enumerate(times)}
         restore_idxs = df[time_col].map(time2pos)
         for feature in features:
             name, vals = _compute_time_feature(times, feature)
             df[name] = vals[restore_idxs]
-    elif isinstance(df, pl_DataFrame):
+    elif isinstance(df, (pl_DataFrame, pl_LazyFrame)):
         exprs = []
         for feature in features:
             name, vals = _compute_time_feature(pl.col(time_col), feature)
@@ -241,8 +325,8 @@ def _add_time_features(
             else:
                 assert isinstance(vals, pl_Expr)
                 exprs.append(vals.alias(name))
-        feats = unique_times.to_frame().with_columns(*exprs)
-        df = df.join(feats, on=time_col, how="left")
+        feats = df.select(pl.col(time_col).unique()).with_columns(*exprs)
+        df = ufp.join(df, feats, on=time_col, how="left")
     return df
 
 # %% ../nbs/feature_engineering.ipynb 16
@@ -253,12 +337,13 @@ def time_features(
     h: int = 0,
     id_col: str = "unique_id",
     time_col: str = "ds",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> Tuple[DFType, DFType]:
     """Compute timestamp-based features for training and forecasting
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or polars LazyFrame
         Dataframe with ids, times and values for the exogenous regressors.
     freq : str or int
         Frequency of the data. Must be a valid pandas or polars offset alias, or an integer.
@@ -270,31 +355,46 @@ def time_features(
         Column that identifies each serie.
     time_col : str (default='ds')
         Column that identifies each timestep, its values can be timestamps or integers.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. If `None`, it's computed from the data.
 
     Returns
     -------
-    transformed_df : pandas or polars DataFrame
+    transformed_df : pandas or polars DataFrame or polars LazyFrame
         Original DataFrame with the computed features
-    future_df : pandas or polars DataFrame
+    future_df : pandas or polars DataFrame or polars LazyFrame
         DataFrame with future values
     """
     transformed = _add_time_features(df=df, features=features, time_col=time_col)
     if h == 0:
         return transformed, type(df)({})
-    times_by_id = ufp.group_by_agg(df, id_col, {time_col: "max"}, maintain_order=True)
-    times_by_id = ufp.sort(times_by_id, id_col)
+    if series_index is None:
+        times_by_id = ufp.group_by_agg(
+            df, id_col, {time_col: "max"}, maintain_order=True
+        )
+        times_by_id = ufp.sort(times_by_id, id_col)
+        if isinstance(times_by_id, pl_LazyFrame):
+            times_by_id = times_by_id.collect()
+        uids = times_by_id[id_col]
+        last_times = times_by_id[time_col]
+    else:
+        series_index.check_df(df)
+        uids = series_index.uids
+        last_times = series_index.last_times
     future = ufp.make_future_dataframe(
-        uids=times_by_id[id_col],
-        last_times=times_by_id[time_col],
+        uids=uids,
+        last_times=last_times,
         freq=freq,
         h=h,
         id_col=id_col,
         time_col=time_col,
     )
+    if isinstance(df, pl_LazyFrame):
+        future = future.lazy()
     future = _add_time_features(df=future, features=features, time_col=time_col)
     return transformed, future
 
-# %% ../nbs/feature_engineering.ipynb 19
+# %% ../nbs/feature_engineering.ipynb 20
 def future_exog_to_historic(
     df: DFType,
     freq: Union[str, int],
@@ -307,7 +407,7 @@ def future_exog_to_historic(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or polars LazyFrame
         Dataframe with ids, times and values for the exogenous regressors.
     freq : str or int
         Frequency of the data. Must be a valid pandas or polars offset alias, or an integer.
@@ -322,23 +422,31 @@ def future_exog_to_historic(
 
     Returns
     -------
-    transformed_df : pandas or polars DataFrame
+    transformed_df : pandas or polars DataFrame or polars LazyFrame
         Original DataFrame with the computed features
-    future_df : pandas or polars DataFrame
+    future_df : pandas or polars DataFrame or polars LazyFrame
         DataFrame with future values
     """
     if h == 0:
         return df, type(df)({})
-    new_feats = ufp.copy_if_pandas(df[[id_col, time_col, *features]])
-    new_feats = ufp.assign_columns(
-        new_feats,
-        time_col,
-        ufp.offset_times(new_feats[time_col], freq=freq, n=h),
-    )
+    new_feats: Union[DataFrame, pl_LazyFrame]
+    if isinstance(df, pl_LazyFrame):
+        new_feats = df.select(id_col, time_col, *features).with_columns(
+            pl.col(time_col).map_batches(partial(ufp.offset_times, freq=freq, n=h))
+        )
+    else:
+        new_feats = ufp.copy_if_pandas(df[[id_col, time_col, *features]])
+        new_feats = ufp.assign_columns(
+            new_feats,
+            time_col,
+            ufp.offset_times(new_feats[time_col], freq=freq, n=h),
+        )
     df = ufp.drop_columns(df, features)
-    df = ufp.join(df, new_feats, on=[id_col, time_col], how="left")
+    df = ufp.join(df, new_feats, on=[id_col, time_col], how="left", sorted_keys=True)
     times_by_id = ufp.group_by_agg(df, id_col, {time_col: "max"}, maintain_order=True)
     times_by_id = ufp.sort(times_by_id, id_col)
+    if isinstance(times_by_id, pl_LazyFrame):
+        times_by_id = times_by_id.collect()
     future = ufp.make_future_dataframe(
         uids=times_by_id[id_col],
         last_times=times_by_id[time_col],
@@ -347,10 +455,14 @@ def future_exog_to_historic(
         id_col=id_col,
         time_col=time_col,
     )
-    future = ufp.join(future, new_feats, on=[id_col, time_col], how="left")
+    if isinstance(df, pl_LazyFrame):
+        future = future.lazy()
+    future = ufp.join(
+        future, new_feats, on=[id_col, time_col], how="left", sorted_keys=True
+    )
     return df, future
 
-# %% ../nbs/feature_engineering.ipynb 25
+# %% ../nbs/feature_engineering.ipynb 26
 def pipeline(
     df: DFType,
     features: List[Callable],
@@ -363,7 +475,7 @@ def pipeline(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or polars LazyFrame
         Dataframe with ids, times and values for the exogenous regressors.
     features : list of callable
         List of features to compute. Must take only df, freq, h, id_col and time_col (other arguments must be fixed).
@@ -378,9 +490,9 @@ def pipeline(
 
     Returns
     -------
-    transformed_df : pandas or polars DataFrame
+    transformed_df : pandas or polars DataFrame or polars LazyFrame
         Original DataFrame with the computed features
-    future_df : pandas or polars DataFrame
+    future_df : pandas or polars DataFrame or polars LazyFrame
         DataFrame with future values
     """
     transformed: Optional[DataFrame] = None
@@ -393,7 +505,15 @@ def pipeline(
             transformed = f_transformed
             future = f_future
         else:
-            feat_cols = [c for c in f_future.columns if c not in (id_col, time_col)]
-            transformed = ufp.horizontal_concat([transformed, f_transformed[feat_cols]])
-            future = ufp.horizontal_concat([future, f_future[feat_cols]])
+            feat_cols = [
+                c for c in ufp._column_names(f_future) if c not in (id_col, time_col)
+            ]
+            if isinstance(f_transformed, pl_LazyFrame):
+                f_transformed = f_transformed.select(feat_cols)
+                f_future = f_future.select(feat_cols)
+            else:
+                f_transformed = f_transformed[feat_cols]
+                f_future = f_future[feat_cols]
+            transformed = ufp.horizontal_concat([transformed, f_transformed])
+            future = ufp.horizontal_concat([future, f_future])
     return transformed, future
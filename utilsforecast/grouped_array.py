@@ -1,17 +1,54 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/grouped_array.ipynb.
 
 # %% auto 0
-__all__ = ['GroupedArray']
+__all__ = ['GroupedArray', 'GrowableGroupedArray']
 
 # %% ../nbs/grouped_array.ipynb 1
-from typing import Sequence, Tuple, Union
+from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from .compat import DataFrame
-from .processing import counts_by_id, value_cols_to_numpy
+from .compat import NUMBA_INSTALLED, DataFrame, njit, prange
+from utilsforecast.processing import (
+    _index_dtype,
+    _indptr_from_sizes,
+    _ranges_to_positions,
+    counts_by_id,
+    value_cols_to_numpy,
+)
 
 # %% ../nbs/grouped_array.ipynb 2
+@njit(nogil=True, cache=True, parallel=True)
+def _copy_segments_kernel(
+    src: np.ndarray,
+    src_starts: np.ndarray,
+    sizes: np.ndarray,
+    dst: np.ndarray,
+    dst_starts: np.ndarray,
+) -> None:
+    for i in prange(sizes.size):
+        size = sizes[i]
+        dst[dst_starts[i] : dst_starts[i] + size] = src[
+            src_starts[i] : src_starts[i] + size
+        ]
+
+
+def _copy_segments(
+    src: np.ndarray,
+    src_starts: np.ndarray,
+    sizes: np.ndarray,
+    dst: np.ndarray,
+    dst_starts: np.ndarray,
+) -> None:
+    """Copy `sizes[i]` rows of `src` starting at `src_starts[i]` to `dst` starting at `dst_starts[i]`."""
+    if NUMBA_INSTALLED:
+        _copy_segments_kernel(src, src_starts, sizes, dst, dst_starts)
+        return
+    dst[_ranges_to_positions(dst_starts, dst_starts + sizes)] = src[
+        _ranges_to_positions(src_starts, src_starts + sizes)
+    ]
+
+# %% ../nbs/grouped_array.ipynb 3
 def _append_one(
     data: np.ndarray, indptr: np.ndarray, new: np.ndarray
 ) -> Tuple[np.ndarray, np.ndarray]:
@@ -22,16 +59,16 @@ def _append_one(
         new_data = np.empty_like(data, shape=(n_rows, data.shape[1]))
     else:
         new_data = np.empty_like(data, shape=n_rows)
-    new_indptr = indptr.copy()
+    new_indptr = indptr.astype(_index_dtype(n_rows))
     new_indptr[1:] += np.arange(1, n_groups + 1)
-    for i in range(n_groups):
-        prev_slice = slice(indptr[i], indptr[i + 1])
-        new_slice = slice(new_indptr[i], new_indptr[i + 1] - 1)
-        new_data[new_slice] = data[prev_slice]
-        new_data[new_indptr[i + 1] - 1] = new[i]
+    _copy_segments(data, indptr[:-1], np.diff(indptr), new_data, new_indptr[:-1])
+    if data.ndim == 2:
+        # one value per group is broadcasted to all the columns
+        new = new.reshape(n_groups, -1)
+    new_data[new_indptr[1:] - 1] = new
     return new_data, new_indptr
 
-# %% ../nbs/grouped_array.ipynb 4
+# %% ../nbs/grouped_array.ipynb 5
 def _append_several(
     data: np.ndarray,
     indptr: np.ndarray,
@@ -44,28 +81,236 @@ def _append_several(
         new_data = np.empty_like(data, shape=(n_rows, data.shape[1]))
     else:
         new_data = np.empty_like(data, shape=n_rows)
-    new_indptr = np.empty_like(indptr, shape=new_sizes.size + 1)
-    new_indptr[0] = 0
-    old_indptr_idx = 0
-    new_vals_idx = 0
-    for i, is_new in enumerate(new_groups):
-        new_size = new_sizes[i]
-        if is_new:
-            old_size = 0
-        else:
-            prev_slice = slice(indptr[old_indptr_idx], indptr[old_indptr_idx + 1])
-            old_indptr_idx += 1
-            old_size = prev_slice.stop - prev_slice.start
-            new_size += old_size
-            new_data[new_indptr[i] : new_indptr[i] + old_size] = data[prev_slice]
-        new_indptr[i + 1] = new_indptr[i] + new_size
-        new_data[new_indptr[i] + old_size : new_indptr[i + 1]] = new_values[
-            new_vals_idx : new_vals_idx + new_sizes[i]
-        ]
-        new_vals_idx += new_sizes[i]
+    is_old = ~np.asarray(new_groups, dtype=bool)
+    old_sizes = np.zeros(new_sizes.size, dtype=np.int64)
+    old_sizes[is_old] = np.diff(indptr)
+    new_indptr = _indptr_from_sizes(old_sizes + new_sizes)
+    starts = new_indptr[:-1]
+    # existing values go first in each group, followed by the new ones
+    _copy_segments(data, indptr[:-1], old_sizes[is_old], new_data, starts[is_old])
+    new_vals_starts = np.cumsum(new_sizes) - new_sizes
+    _copy_segments(new_values, new_vals_starts, new_sizes, new_data, starts + old_sizes)
     return new_data, new_indptr
 
-# %% ../nbs/grouped_array.ipynb 6
+# %% ../nbs/grouped_array.ipynb 8
+def _slice_bounds(sizes: np.ndarray, idx: slice) -> Tuple[np.ndarray, np.ndarray, int]:
+    """`slice.indices` for every group at once.
+
+    Returns the first position and number of elements that `idx` selects from each group, as well as the step.
+    """
+    step = 1 if idx.step is None else idx.step
+    if step == 0:
+        raise ValueError("slice step cannot be zero")
+    sizes = sizes.astype(np.int64, copy=False)
+    if step > 0:
+        lower, upper = np.zeros_like(sizes), sizes
+        default_start, default_stop = lower, upper
+    else:
+        lower, upper = np.full_like(sizes, -1), sizes - 1
+        default_start, default_stop = upper, lower
+
+    def bound(value: Optional[int], default: np.ndarray) -> np.ndarray:
+        if value is None:
+            return default
+        if value < 0:
+            return np.maximum(sizes + value, lower)
+        return np.minimum(value, upper)
+
+    start = bound(idx.start, default_start)
+    stop = bound(idx.stop, default_stop)
+    sign = 1 if step > 0 else -1
+    counts = np.maximum((stop - start + step - sign) // step, 0)
+    return start, counts, step
+
+# %% ../nbs/grouped_array.ipynb 9
+_REDUCTIONS = {
+    "sum": 0,
+    "mean": 1,
+    "std": 2,
+    "min": 3,
+    "max": 4,
+    "quantile": 5,
+    "count": 6,
+}
+
+
+@njit(nogil=True, cache=True)
+def _reduce_segment(x: np.ndarray, op: int, ddof: int, q: float) -> float:
+    if op == 5:
+        return np.nanquantile(x, q)
+    count = 0
+    total = 0.0
+    lo = np.inf
+    hi = -np.inf
+    for v in x:
+        if not np.isnan(v):
+            count += 1
+            total += v
+            lo = min(lo, v)
+            hi = max(hi, v)
+    if op == 6:
+        return count
+    if op == 0:
+        return total
+    if count == 0:
+        return np.nan
+    if op == 3:
+        return lo
+    if op == 4:
+        return hi
+    mean = total / count
+    if op == 1:
+        return mean
+    if count <= ddof:
+        return np.nan
+    sq_devs = 0.0
+    for v in x:
+        if not np.isnan(v):
+            sq_devs += (v - mean) ** 2
+    return np.sqrt(sq_devs / (count - ddof))
+
+
+@njit(nogil=True, cache=True, parallel=True)
+def _reduce_kernel(
+    data: np.ndarray, indptr: np.ndarray, op: int, ddof: int, q: float
+) -> np.ndarray:
+    n_groups = indptr.size - 1
+    out = np.empty((n_groups, data.shape[1]), dtype=np.float64)
+    for i in prange(n_groups):
+        for j in range(data.shape[1]):
+            out[i, j] = _reduce_segment(data[indptr[i] : indptr[i + 1], j], op, ddof, q)
+    return out
+
+
+def _reduce_numpy(
+    data: np.ndarray, indptr: np.ndarray, op: str, ddof: int, q: float
+) -> np.ndarray:
+    sizes = np.diff(indptr)
+    # reduceat can't represent empty segments, those are left as NaN
+    nonempty = sizes > 0
+    starts = indptr[:-1][nonempty]
+    out = np.full((sizes.size, data.shape[1]), np.nan)
+    if op in ("min", "max"):
+        ufunc = np.fmin if op == "min" else np.fmax
+        if starts.size:
+            out[nonempty] = ufunc.reduceat(data, starts, axis=0)
+        return out
+    is_nan = np.isnan(data)
+    counts = np.zeros_like(out)
+    sums = np.zeros_like(out)
+    if starts.size:
+        counts[nonempty] = np.add.reduceat(~is_nan, starts, axis=0)
+        sums[nonempty] = np.add.reduceat(np.where(is_nan, 0.0, data), starts, axis=0)
+    if op == "count":
+        return counts
+    if op == "sum":
+        return sums
+    if op == "quantile":
+        group_ids = np.repeat(np.arange(sizes.size), sizes)
+        for j in range(data.shape[1]):
+            # NaNs are sorted to the end of each group
+            col = data[np.lexsort((data[:, j], group_ids)), j]
+            has_values = counts[:, j] > 0
+            pos = indptr[:-1][has_values] + q * (counts[has_values, j] - 1)
+            lo = col[np.floor(pos).astype(np.intp)]
+            hi = col[np.ceil(pos).astype(np.intp)]
+            out[has_values, j] = lo + (hi - lo) * (pos - np.floor(pos))
+        return out
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        if op == "mean":
+            return means
+        sq_devs = np.zeros_like(out)
+        if starts.size:
+            devs = np.where(is_nan, 0.0, data - np.repeat(means, sizes, axis=0))
+            sq_devs[nonempty] = np.add.reduceat(devs**2, starts, axis=0)
+        return np.where(counts > ddof, np.sqrt(sq_devs / (counts - ddof)), np.nan)
+
+# %% ../nbs/grouped_array.ipynb 10
+@njit(nogil=True, cache=True, parallel=True)
+def _rolling_kernel(
+    data: np.ndarray,
+    indptr: np.ndarray,
+    window_size: int,
+    min_samples: int,
+    op: int,
+    out: np.ndarray,
+) -> None:
+    for i in prange(indptr.size - 1):
+        start = indptr[i]
+        end = indptr[i + 1]
+        for j in range(data.shape[1]):
+            # running count, mean and sum of squared deviations of the values in the window
+            # that aren't NaN, updated with Welford's method as values enter and leave it
+            count = 0
+            mean = 0.0
+            sq_devs = 0.0
+            for t in range(start, end):
+                if t - start >= window_size:
+                    old = data[t - window_size, j]
+                    if not np.isnan(old):
+                        count -= 1
+                        if count == 0:
+                            mean = 0.0
+                            sq_devs = 0.0
+                        else:
+                            delta = old - mean
+                            mean -= delta / count
+                            sq_devs -= delta * (old - mean)
+                v = data[t, j]
+                if not np.isnan(v):
+                    count += 1
+                    delta = v - mean
+                    mean += delta / count
+                    sq_devs += delta * (v - mean)
+                if count < min_samples:
+                    continue
+                if op == 1:  # mean
+                    out[t, j] = mean
+                elif op == 2:  # std
+                    if count > 1:
+                        out[t, j] = np.sqrt(max(sq_devs, 0.0) / (count - 1))
+                else:
+                    window = data[max(start, t - window_size + 1) : t + 1, j]
+                    out[t, j] = _reduce_segment(window, op, 1, 0.5)
+
+
+def _rolling_numpy(
+    data: np.ndarray, indptr: np.ndarray, window_size: int, min_samples: int, op: str
+) -> np.ndarray:
+    sizes = np.diff(indptr)
+    rows = np.arange(data.shape[0])
+    starts = np.repeat(indptr[:-1], sizes)
+    # first row of the window that ends at each row
+    window_starts = np.maximum(starts, rows - window_size + 1)
+
+    def window_sums(x: np.ndarray) -> np.ndarray:
+        cumsum = np.vstack([np.zeros((1, x.shape[1])), np.cumsum(x, axis=0)])
+        return cumsum[rows + 1] - cumsum[window_starts]
+
+    is_nan = np.isnan(data)
+    counts = window_sums(~is_nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if op in ("mean", "std"):
+            # values are centered on their group's mean to keep the sums of squares accurate
+            means = np.nan_to_num(_reduce_numpy(data, indptr, "mean", 0, 0.5))
+            centered = np.where(is_nan, 0.0, data - np.repeat(means, sizes, axis=0))
+            sums = window_sums(centered)
+            if op == "mean":
+                out = np.repeat(means, sizes, axis=0) + sums / counts
+            else:
+                sq_devs = np.maximum(window_sums(centered**2) - sums**2 / counts, 0.0)
+                out = np.where(counts > 1, np.sqrt(sq_devs / (counts - 1)), np.nan)
+        else:
+            ufunc = np.fmin if op == "min" else np.fmax
+            out = data.astype(np.float64)
+            for lag in range(1, min(window_size, sizes.max(initial=0))):
+                has_lag = rows - lag >= starts
+                out[has_lag] = ufunc(out[has_lag], data[rows[has_lag] - lag])
+    out[counts < min_samples] = np.nan
+    return out
+
+# %% ../nbs/grouped_array.ipynb 11
 class GroupedArray:
     def __init__(self, data: np.ndarray, indptr: np.ndarray):
         self.data = data
@@ -86,36 +331,39 @@ class GroupedArray:
     ) -> "GroupedArray":
         id_counts = counts_by_id(df, id_col)
         sizes = id_counts["counts"].to_numpy()
-        indptr = np.append(0, sizes.cumsum())
+        indptr = _indptr_from_sizes(sizes)
         data = value_cols_to_numpy(df, id_col, time_col, target_col)
         if data.dtype not in (np.float32, np.float64):
             data = data.astype(np.float32)
         return cls(data, indptr)
 
-    def _take_from_ranges(self, ranges: Sequence) -> Tuple[np.ndarray, np.ndarray]:
-        items = [self.data[r] for r in ranges]
-        sizes = np.array([item.shape[0] for item in items])
-        if self.data.ndim == 2:
-            data = np.vstack(items)
+    def _take_segments(
+        self, starts: np.ndarray, sizes: np.ndarray, step: int = 1
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = _indptr_from_sizes(sizes)
+        if step == 1:
+            shape = (int(indptr[-1]), *self.data.shape[1:])
+            data = np.empty_like(self.data, shape=shape)
+            _copy_segments(self.data, starts, sizes, data, indptr[:-1])
         else:
-            data = np.hstack(items)
-        indptr = np.append(0, sizes.cumsum())
+            offsets = np.arange(indptr[-1]) - np.repeat(indptr[:-1], sizes)
+            data = self.data[np.repeat(starts, sizes) + step * offsets]
         return data, indptr
 
     def take(self, idxs: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
         """Subset specific groups by their indices."""
-        ranges = [range(self.indptr[i], self.indptr[i + 1]) for i in idxs]
-        return self._take_from_ranges(ranges)
+        positions = np.asarray(idxs, dtype=np.intp).reshape(-1)
+        positions = np.where(positions < 0, positions + self.n_groups, positions)
+        starts = self.indptr[positions].astype(np.int64)
+        return self._take_segments(starts, self.indptr[positions + 1] - starts)
 
     def take_from_groups(self, idx: Union[int, slice]) -> Tuple[np.ndarray, np.ndarray]:
         """Select a subset from each group."""
         if isinstance(idx, int):
-            # this preserves the 2d structure of data when indexing with the range
-            idx = slice(idx, idx + 1)
-        ranges = [
-            range(self.indptr[i], self.indptr[i + 1])[idx] for i in range(self.n_groups)
-        ]
-        return self._take_from_ranges(ranges)
+            # this preserves the 2d structure of data when indexing with the slice
+            idx = slice(idx, idx + 1 or None)
+        starts, sizes, step = _slice_bounds(np.diff(self.indptr), idx)
+        return self._take_segments(self.indptr[:-1] + starts, sizes, step)
 
     def append(self, new: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Appends each element of `new` to each existing group. Returns a copy."""
@@ -130,5 +378,228 @@ class GroupedArray:
             self.data, self.indptr, new_sizes, new_values, new_groups
         )
 
+    def _reduce(self, op: str, ddof: int = 0, q: float = 0.5) -> np.ndarray:
+        data = self.data.reshape(self.data.shape[0], -1)
+        if NUMBA_INSTALLED:
+            out = _reduce_kernel(data, self.indptr, _REDUCTIONS[op], ddof, q)
+        else:
+            out = _reduce_numpy(data, self.indptr, op, ddof, q)
+        if self.data.ndim == 1:
+            out = out[:, 0]
+        return out
+
+    def sum(self) -> np.ndarray:
+        """Sum of each group, ignoring NaNs."""
+        return self._reduce("sum")
+
+    def mean(self) -> np.ndarray:
+        """Mean of each group, ignoring NaNs. NaN for groups without values."""
+        return self._reduce("mean")
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        """Standard deviation of each group, ignoring NaNs. Uses `ddof=1` by default, like pandas."""
+        return self._reduce("std", ddof=ddof)
+
+    def min(self) -> np.ndarray:
+        """Minimum of each group, ignoring NaNs. NaN for groups without values."""
+        return self._reduce("min")
+
+    def max(self) -> np.ndarray:
+        """Maximum of each group, ignoring NaNs. NaN for groups without values."""
+        return self._reduce("max")
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Quantile `q` of each group with linear interpolation, ignoring NaNs."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be between 0 and 1, got {q}.")
+        return self._reduce("quantile", q=q)
+
+    def count_nonnan(self) -> np.ndarray:
+        """Number of values that aren't NaN in each group."""
+        return self._reduce("count").astype(np.int64)
+
+    def _float_like(self) -> np.ndarray:
+        return np.full(
+            self.data.shape, np.nan, dtype=np.result_type(self.data.dtype, np.float32)
+        )
+
+    def shift(self, periods: int = 1) -> "GroupedArray":
+        """Shift the values of each group by `periods`, filling with NaN. Negative periods shift backwards."""
+        sizes = np.diff(self.indptr)
+        group_starts = np.repeat(self.indptr[:-1], sizes)
+        group_ends = np.repeat(self.indptr[1:], sizes)
+        src = np.arange(self.data.shape[0]) - periods
+        valid = (src >= group_starts) & (src < group_ends)
+        out = self._float_like()
+        out[valid] = self.data[src[valid]]
+        return GroupedArray(out, self.indptr)
+
+    def diff(self, periods: int = 1) -> "GroupedArray":
+        """Difference of each value with the one `periods` steps before in its group.
+
+        Use the season length as `periods` for seasonal differences."""
+        return GroupedArray(self.data - self.shift(periods).data, self.indptr)
+
+    def _rolling(
+        self, op: str, window_size: int, min_samples: Optional[int]
+    ) -> "GroupedArray":
+        if min_samples is None:
+            min_samples = window_size
+        if not 1 <= min_samples <= window_size:
+            raise ValueError(
+                f"min_samples must be between 1 and window_size ({window_size}), got {min_samples}."
+            )
+        out = self._float_like()
+        data = self.data.reshape(self.data.shape[0], -1)
+        if NUMBA_INSTALLED:
+            _rolling_kernel(
+                data,
+                self.indptr,
+                window_size,
+                min_samples,
+                _REDUCTIONS[op],
+                out.reshape(data.shape),
+            )
+        else:
+            out[:] = _rolling_numpy(
+                data, self.indptr, window_size, min_samples, op
+            ).reshape(out.shape)
+        return GroupedArray(out, self.indptr)
+
+    def rolling_mean(
+        self, window_size: int, min_samples: Optional[int] = None
+    ) -> "GroupedArray":
+        """Mean over the last `window_size` values of each group, ignoring NaNs.
+
+        Positions with less than `min_samples` values (default `window_size`) are NaN.
+        """
+        return self._rolling("mean", window_size, min_samples)
+
+    def rolling_std(
+        self, window_size: int, min_samples: Optional[int] = None
+    ) -> "GroupedArray":
+        """Standard deviation (`ddof=1`) over the last `window_size` values of each group, ignoring NaNs."""
+        return self._rolling("std", window_size, min_samples)
+
+    def rolling_min(
+        self, window_size: int, min_samples: Optional[int] = None
+    ) -> "GroupedArray":
+        """Minimum over the last `window_size` values of each group, ignoring NaNs."""
+        return self._rolling("min", window_size, min_samples)
+
+    def rolling_max(
+        self, window_size: int, min_samples: Optional[int] = None
+    ) -> "GroupedArray":
+        """Maximum over the last `window_size` values of each group, ignoring NaNs."""
+        return self._rolling("max", window_size, min_samples)
+
+    def expanding_mean(self) -> "GroupedArray":
+        """Mean of all the values seen so far in each group, ignoring NaNs."""
+        return self._rolling("mean", max(self.data.shape[0], 1), 1)
+
     def __repr__(self):
         return f"{self.__class__.__name__}(n_rows={self.data.shape[0]:,}, n_groups={self.n_groups:,})"
+
+# %% ../nbs/grouped_array.ipynb 12
+class GrowableGroupedArray:
+    """Groups of values with free space reserved at the end of each one.
+
+    Appends are written in place and the data is only moved when a group runs out of space,
+    in which case the capacity of every group is doubled. Appending `h` times then moves the data
+    O(log h) times and costs O(new values) amortized, instead of copying all the data on every call.
+    Use `compact` to get a contiguous `GroupedArray`.
+
+    Parameters
+    ----------
+    data : numpy ndarray
+        Values of all groups, one after the other.
+    indptr : numpy ndarray
+        1d array with the start and end of each group in `data`.
+    reserve : int (default=0)
+        Number of rows to reserve at the end of each group.
+    """
+
+    def __init__(self, data: np.ndarray, indptr: np.ndarray, reserve: int = 0):
+        self.sizes = np.diff(indptr).astype(np.int64)
+        self.n_groups = self.sizes.size
+        self._buffer = data
+        self._starts = indptr[:-1].astype(np.int64)
+        self._capacities = self.sizes.copy()
+        self.reserve(reserve)
+
+    def __len__(self):
+        return self.n_groups
+
+    def __getitem__(self, idx: int) -> np.ndarray:
+        if idx < 0:
+            idx = self.n_groups + idx
+        start = self._starts[idx]
+        return self._buffer[start : start + self.sizes[idx]]
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.sizes.sum())
+
+    def _relocate(self, capacities: np.ndarray) -> None:
+        starts = np.cumsum(capacities) - capacities
+        shape = (int(capacities.sum()), *self._buffer.shape[1:])
+        buffer = np.empty_like(self._buffer, shape=shape)
+        _copy_segments(self._buffer, self._starts, self.sizes, buffer, starts)
+        self._buffer = buffer
+        self._starts = starts
+        self._capacities = capacities
+
+    def _grow(self, required: np.ndarray) -> None:
+        if (required > self._capacities).any():
+            # every group grows at once, otherwise groups with different sizes
+            # run out of space at different steps and each one triggers a copy
+            self._relocate(np.maximum(2 * self._capacities, required))
+
+    def reserve(self, n: int) -> None:
+        """Make sure that every group has space for at least `n` more rows."""
+        required = self.sizes + n
+        if (required > self._capacities).any():
+            self._relocate(np.maximum(required, self._capacities))
+
+    def append(self, new: np.ndarray) -> None:
+        """Appends each element of `new` to each existing group in place."""
+        if new.shape[0] != self.n_groups:
+            raise ValueError(f"new must have {self.n_groups} rows.")
+        self._grow(self.sizes + 1)
+        if self._buffer.ndim == 2:
+            new = new.reshape(self.n_groups, -1)
+        self._buffer[self._starts + self.sizes] = new
+        self.sizes += 1
+
+    def append_several(
+        self, new_sizes: np.ndarray, new_values: np.ndarray, new_groups: np.ndarray
+    ) -> None:
+        """Appends `new_sizes[i]` values to the i-th group in place, `new_groups` marks the groups to insert."""
+        is_new = np.asarray(new_groups, dtype=bool)
+        if is_new.any():
+            # the new groups start empty and get their space when growing
+            expanded = np.zeros((3, is_new.size), dtype=np.int64)
+            expanded[:, ~is_new] = [self.sizes, self._starts, self._capacities]
+            self.sizes, self._starts, self._capacities = expanded
+            self.n_groups = is_new.size
+        self._grow(self.sizes + new_sizes)
+        new_vals_starts = np.cumsum(new_sizes) - new_sizes
+        _copy_segments(
+            new_values,
+            new_vals_starts,
+            new_sizes,
+            self._buffer,
+            self._starts + self.sizes,
+        )
+        self.sizes += new_sizes
+
+    def compact(self) -> GroupedArray:
+        """Contiguous copy of the groups, without the reserved space."""
+        indptr = _indptr_from_sizes(self.sizes)
+        shape = (int(indptr[-1]), *self._buffer.shape[1:])
+        data = np.empty_like(self._buffer, shape=shape)
+        _copy_segments(self._buffer, self._starts, self.sizes, data, indptr[:-1])
+        return GroupedArray(data, indptr)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(n_rows={self.n_rows:,}, n_groups={self.n_groups:,})"
@@ -11,7 +11,16 @@ import numpy as np
 import pandas as pd
 
 import utilsforecast.processing as ufp
-from .compat import DFType, DataFrame, pl_DataFrame, pl, pl_Expr
+from utilsforecast.compat import (
+    DFType,
+    pa,
+    pa_Table,
+    pc,
+    pl_DataFrame,
+    pl_LazyFrame,
+    pl,
+    pl_Expr,
+)
 
 # %% ../nbs/losses.ipynb 11
 def _base_docstring(*args, **kwargs) -> Callable:
@@ -19,7 +28,7 @@ def _base_docstring(*args, **kwargs) -> Callable:
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, actual values and predictions.
     models : list of str
         Columns that identify the models predictions.
@@ -27,10 +36,12 @@ def _base_docstring(*args, **kwargs) -> Callable:
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
     """
 
@@ -43,22 +54,131 @@ def _base_docstring(*args, **kwargs) -> Callable:
 
 # %% ../nbs/losses.ipynb 12
 def _pl_agg_expr(
-    df: pl_DataFrame,
+    df: Union[pl_DataFrame, pl_LazyFrame],
     models: Union[List[str], List[Tuple[str, str]]],
     id_col: str,
     gen_expr: Callable[[Union[str, Tuple[str, str]]], "pl.Expr"],
-) -> pl_DataFrame:
+) -> Union[pl_DataFrame, pl_LazyFrame]:
     exprs = [gen_expr(model) for model in models]
     df = df.select([id_col, *exprs])
     return ufp.group_by(df, id_col, maintain_order=True).mean()
 
 # %% ../nbs/losses.ipynb 13
+def _segment_nan_agg(
+    arr: np.ndarray,
+    indptr: np.ndarray,
+    sort_idxs: Optional[np.ndarray],
+    agg: str,
+) -> np.ndarray:
+    """Reduce the rows of `arr` over the series delimited by `indptr`, ignoring NaNs."""
+    if sort_idxs is not None:
+        arr = arr[sort_idxs]
+    is_nan = np.isnan(arr)
+    starts = indptr[:-1]
+    out = np.add.reduceat(np.where(is_nan, 0.0, arr), starts, axis=0)
+    if agg == "mean":
+        counts = np.add.reduceat(~is_nan, starts, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = out / counts
+    elif agg != "sum":
+        raise ValueError(f"agg must be either 'mean' or 'sum', got {agg!r}.")
+    return out
+
+
+def _pd_group_agg(
+    vals: pd.DataFrame,
+    df: pd.DataFrame,
+    id_col: str,
+    series_index: Optional[ufp.SeriesIndex],
+    agg: str = "mean",
+    maintain_order: bool = False,
+) -> pd.DataFrame:
+    """Aggregate `vals` by the ids in `df`, ignoring NaNs.
+
+    If `series_index` is provided the per-row values are sorted with it and
+    reduced over contiguous segments instead of hashing the ids again.
+    The ids are sorted unless `maintain_order=True`, which keeps them in order of appearance.
+    """
+    if series_index is None:
+        res = getattr(
+            vals.groupby(df[id_col], observed=True, sort=not maintain_order), agg
+        )()
+    else:
+        series_index.check_df(df)
+        out = _segment_nan_agg(
+            vals.to_numpy(dtype=np.float64),
+            series_index.indptr,
+            series_index.sort_idxs,
+            agg,
+        )
+        if all(dt == np.float32 for dt in vals.dtypes):
+            out = out.astype(np.float32)
+        res = pd.DataFrame(out, columns=vals.columns, index=pd.Index(series_index.uids))
+        if maintain_order:
+            first_rows = series_index.indptr[:-1]
+            if series_index.sort_idxs is not None:
+                # the rows are also sorted by time, so look for the earliest position
+                first_rows = np.minimum.reduceat(series_index.sort_idxs, first_rows)
+            res = res.iloc[np.argsort(first_rows)]
+    res.index.name = id_col
+    return res.reset_index()
+
+
+def _pa_float_values(df: pa_Table, col: str) -> np.ndarray:
+    """Values of a column as float64, with nulls as NaN."""
+    return ufp._column_to_numpy(df[col]).astype(np.float64, copy=False)
+
+
+def _pa_agg_values(
+    vals: np.ndarray,
+    columns: List[str],
+    df: pa_Table,
+    id_col: str,
+    series_index: Optional[ufp.SeriesIndex],
+    agg: str = "mean",
+) -> pa_Table:
+    """Aggregate the per-row `vals` by the ids in `df`, ignoring NaNs."""
+    sort_idxs: Optional[np.ndarray]
+    if series_index is None:
+        factorized = ufp.factorize_ids(df, id_col)
+        uids = factorized.uniques
+        indptr = np.append(0, factorized.counts.cumsum())
+        # rows with null ids have a code of -1, so they're the first ones after sorting
+        n_nulls = df.num_rows - indptr[-1]
+        sort_idxs = np.argsort(factorized.codes, kind="stable")[n_nulls:]
+    else:
+        series_index.check_df(df)
+        uids = series_index.uids
+        indptr = series_index.indptr
+        sort_idxs = series_index.sort_idxs
+    out = _segment_nan_agg(vals, indptr, sort_idxs, agg)
+    return pa.table({id_col: uids, **{col: out[:, j] for j, col in enumerate(columns)}})
+
+
+def _pa_group_agg(
+    df: pa_Table,
+    models: List[str],
+    id_col: str,
+    target_col: str,
+    series_index: Optional[ufp.SeriesIndex],
+    gen_values: Callable[[np.ndarray, np.ndarray], np.ndarray],
+) -> pa_Table:
+    """Mean of `gen_values(predictions, target)` by id, ignoring NaNs and nulls."""
+    target = _pa_float_values(df, target_col)
+    vals = np.empty((df.num_rows, len(models)))
+    for j, model in enumerate(models):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            vals[:, j] = gen_values(_pa_float_values(df, model), target)
+    return _pa_agg_values(vals, models, df, id_col, series_index)
+
+# %% ../nbs/losses.ipynb 14
 @_base_docstring
 def mae(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Mean Absolute Error (MAE)
 
@@ -68,14 +188,18 @@ def mae(
     value at a given time and averages these devations
     over the length of the series."""
     if isinstance(df, pd.DataFrame):
-        res = (
-            (df[models].sub(df[target_col], axis=0))
-            .abs()
-            .groupby(df[id_col], observed=True)
-            .mean()
+        res = _pd_group_agg(
+            df[models].sub(df[target_col], axis=0).abs(), df, id_col, series_index
+        )
+    elif isinstance(df, pa_Table):
+        res = _pa_group_agg(
+            df,
+            models,
+            id_col,
+            target_col,
+            series_index,
+            lambda y_hat, y: np.abs(y - y_hat),
         )
-        res.index.name = id_col
-        res = res.reset_index()
     else:
 
         def gen_expr(model):
@@ -84,13 +208,14 @@ def mae(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 19
+# %% ../nbs/losses.ipynb 20
 @_base_docstring
 def mse(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Mean Squared Error (MSE)
 
@@ -100,14 +225,18 @@ def mse(
     value at a given time, and averages these devations
     over the length of the series."""
     if isinstance(df, pd.DataFrame):
-        res = (
-            (df[models].sub(df[target_col], axis=0))
-            .pow(2)
-            .groupby(df[id_col], observed=True)
-            .mean()
+        res = _pd_group_agg(
+            df[models].sub(df[target_col], axis=0).pow(2), df, id_col, series_index
+        )
+    elif isinstance(df, pa_Table):
+        res = _pa_group_agg(
+            df,
+            models,
+            id_col,
+            target_col,
+            series_index,
+            lambda y_hat, y: (y - y_hat) ** 2,
         )
-        res.index.name = id_col
-        res = res.reset_index()
     else:
 
         def gen_expr(model):
@@ -116,13 +245,14 @@ def mse(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 24
+# %% ../nbs/losses.ipynb 25
 @_base_docstring
 def rmse(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Root Mean Squared Error (RMSE)
 
@@ -134,32 +264,36 @@ def rmse(
     as the original time series so its comparison with other
     series is possible only if they share a common scale.
     RMSE has a direct connection to the L2 norm."""
-    res = mse(df, models, id_col, target_col)
+    res = mse(df, models, id_col, target_col, series_index)
     if isinstance(res, pd.DataFrame):
         res[models] = res[models].pow(0.5)
+    elif isinstance(res, pa_Table):
+        for model in models:
+            res = ufp.assign_columns(res, model, pc.sqrt(res[model]))
     else:
         res = res.with_columns(*[pl.col(c).pow(0.5) for c in models])
     return res
 
-# %% ../nbs/losses.ipynb 27
+# %% ../nbs/losses.ipynb 28
 @_base_docstring
 def bias(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Forecast estimator bias.
 
     Defined as prediction - actual"""
     if isinstance(df, pd.DataFrame):
-        res = (
-            (df[models].sub(df[target_col], axis=0))
-            .groupby(df[id_col], observed=True)
-            .mean()
+        res = _pd_group_agg(
+            df[models].sub(df[target_col], axis=0), df, id_col, series_index
+        )
+    elif isinstance(df, pa_Table):
+        res = _pa_group_agg(
+            df, models, id_col, target_col, series_index, lambda y_hat, y: y_hat - y
         )
-        res.index.name = id_col
-        res = res.reset_index()
     else:
 
         def gen_expr(model):
@@ -168,7 +302,7 @@ def bias(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 33
+# %% ../nbs/losses.ipynb 34
 def _zero_to_nan(series: Union[pd.Series, "pl.Expr"]) -> Union[pd.Series, "pl.Expr"]:
     if isinstance(series, pd.Series):
         res = series.replace(0, np.nan)
@@ -176,13 +310,14 @@ def _zero_to_nan(series: Union[pd.Series, "pl.Expr"]) -> Union[pd.Series, "pl.Ex
         res = pl.when(series == 0).then(float("nan")).otherwise(series.abs())
     return res
 
-# %% ../nbs/losses.ipynb 34
+# %% ../nbs/losses.ipynb 35
 @_base_docstring
 def mape(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Mean Absolute Percentage Error (MAPE)
 
@@ -193,16 +328,20 @@ def mape(
     The closer to zero an observed value is, the higher penalty MAPE loss
     assigns to the corresponding error."""
     if isinstance(df, pd.DataFrame):
-        res = (
+        ratio = (
             df[models]
             .sub(df[target_col], axis=0)
             .abs()
             .div(_zero_to_nan(df[target_col].abs()), axis=0)
-            .groupby(df[id_col], observed=True)
-            .mean()
         )
-        res.index.name = id_col
-        res = res.reset_index()
+        res = _pd_group_agg(ratio, df, id_col, series_index)
+    elif isinstance(df, pa_Table):
+
+        def gen_values(y_hat, y):
+            abs_target = np.abs(y)
+            return np.abs(y - y_hat) / np.where(abs_target == 0, np.nan, abs_target)
+
+        res = _pa_group_agg(df, models, id_col, target_col, series_index, gen_values)
     else:
 
         def gen_expr(model):
@@ -214,13 +353,14 @@ def mape(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 38
+# %% ../nbs/losses.ipynb 39
 @_base_docstring
 def smape(
     df: DFType,
     models: List[str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Symmetric Mean Absolute Percentage Error (SMAPE)
 
@@ -236,9 +376,14 @@ def smape(
         delta_y = df[models].sub(df[target_col], axis=0).abs()
         scale = df[models].abs().add(df[target_col].abs(), axis=0)
         raw = delta_y.div(scale).fillna(0)
-        res = raw.groupby(df[id_col], observed=True).mean()
-        res.index.name = id_col
-        res = res.reset_index()
+        res = _pd_group_agg(raw, df, id_col, series_index)
+    elif isinstance(df, pa_Table):
+
+        def gen_values(y_hat, y):
+            raw = np.abs(y_hat - y) / (np.abs(y_hat) + np.abs(y))
+            return np.where(np.isnan(raw), 0.0, raw)
+
+        res = _pa_group_agg(df, models, id_col, target_col, series_index, gen_values)
     else:
 
         def gen_expr(model):
@@ -252,7 +397,7 @@ def smape(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 44
+# %% ../nbs/losses.ipynb 46
 def mase(
     df: DFType,
     models: List[str],
@@ -260,6 +405,7 @@ def mase(
     train_df: DFType,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Mean Absolute Scaled Error (MASE)
 
@@ -272,30 +418,32 @@ def mase(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, actuals and predictions.
     models : list of str
         Columns that identify the models predictions.
     seasonality : int
         Main frequency of the time series;
         Hourly 24, Daily 7, Weekly 52, Monthly 12, Quarterly 4, Yearly 1.
-    train_df : pandas or polars DataFrame
+    train_df : pandas or polars DataFrame or pyarrow Table
         Training dataframe with id and actual values. Must be sorted by time.
     id_col : str (default='unique_id')
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
 
     References
     ----------
     [1] https://robjhyndman.com/papers/mase.pdf
     """
-    mean_abs_err = mae(df, models, id_col, target_col)
+    mean_abs_err = mae(df, models, id_col, target_col, series_index)
     if isinstance(train_df, pd.DataFrame):
         mean_abs_err = mean_abs_err.set_index(id_col)
         # assume train_df is sorted
@@ -305,6 +453,32 @@ def mase(
         res = mean_abs_err.div(_zero_to_nan(scale), axis=0).fillna(0)
         res.index.name = id_col
         res = res.reset_index()
+    elif isinstance(train_df, pa_Table):
+        assert isinstance(mean_abs_err, pa_Table)
+        # assume train_df is sorted, the stable sort only groups the rows by id
+        codes = ufp.factorize_ids(train_df, id_col).codes
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        sorted_y = _pa_float_values(train_df, target_col)[order]
+        abs_diffs = np.full(train_df.num_rows, np.nan)
+        same_serie = sorted_codes[seasonality:] == sorted_codes[:-seasonality]
+        abs_diffs[order[seasonality:][same_serie]] = np.abs(
+            sorted_y[seasonality:] - sorted_y[:-seasonality]
+        )[same_serie]
+        scale = _pa_agg_values(abs_diffs[:, None], ["scale"], train_df, id_col, None)
+        # position of each evaluated id in the train ids
+        pos = pc.index_in(
+            mean_abs_err[id_col], value_set=scale[id_col].combine_chunks()
+        )
+        found = pos.is_valid().to_numpy(zero_copy_only=False)
+        scale_by_id = np.full(mean_abs_err.num_rows, np.nan)
+        scale_by_id[found] = scale["scale"].to_numpy()[pos.drop_null().to_numpy()]
+        scale_by_id[scale_by_id == 0] = np.nan
+        columns = {}
+        for model in models:
+            ratio = _pa_float_values(mean_abs_err, model) / scale_by_id
+            columns[model] = np.where(np.isnan(ratio), 0.0, ratio)
+        res = pa.table({id_col: mean_abs_err[id_col], **columns})
     else:
         # assume train_df is sorted
         lagged = pl.col(target_col).shift(seasonality).over(id_col)
@@ -320,13 +494,14 @@ def mase(
         res = _pl_agg_expr(full_df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 49
+# %% ../nbs/losses.ipynb 51
 def rmae(
     df: DFType,
     models: List[str],
     baseline: str,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Relative Mean Absolute Error (RMAE)
 
@@ -336,7 +511,7 @@ def rmae(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : list of str
         Columns that identify the models predictions.
@@ -346,15 +521,33 @@ def rmae(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
     """
-    numerator = mae(df, models, id_col, target_col)
-    denominator = mae(df, [baseline], id_col, target_col)
-    if ufp.is_nan(denominator[baseline]).any():
+    numerator = mae(df, models, id_col, target_col, series_index)
+    denominator = mae(df, [baseline], id_col, target_col, series_index)
+    if isinstance(numerator, pa_Table):
+        assert isinstance(denominator, pa_Table)
+        # both come from the same grouping, so the ids are aligned
+        base = _pa_float_values(denominator, baseline)
+        if np.isnan(base).any():
+            raise ValueError(f"baseline model ({baseline}) contains NaNs.")
+        base = np.where(base == 0, np.nan, base)
+        columns = {}
+        for model in models:
+            ratio = _pa_float_values(numerator, model) / base
+            columns[model] = np.where(np.isnan(ratio), 0.0, ratio)
+        return pa.table({id_col: numerator[id_col], **columns})
+    # the baseline of a LazyFrame can only be checked after collecting it
+    if (
+        not isinstance(denominator, pl_LazyFrame)
+        and ufp.is_nan(denominator[baseline]).any()
+    ):
         raise ValueError(f"baseline model ({baseline}) contains NaNs.")
     denominator = ufp.rename(denominator, {baseline: f"{baseline}_denominator"})
     res = ufp.join(numerator, denominator, on=id_col)
@@ -374,13 +567,14 @@ def rmae(
         res = res.select([id_col, *exprs])
     return res
 
-# %% ../nbs/losses.ipynb 55
+# %% ../nbs/losses.ipynb 57
 def quantile_loss(
     df: DFType,
     models: Dict[str, str],
     q: float = 0.5,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Quantile Loss (QL)
 
@@ -391,7 +585,7 @@ def quantile_loss(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : dict from str to str
         Mapping from model name to the model predictions for the specified quantile.
@@ -401,27 +595,29 @@ def quantile_loss(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
     """
     if isinstance(df, pd.DataFrame):
-        res: Optional[pd.DataFrame] = None
+        losses = {}
         for model_name, pred_col in models.items():
             delta_y = df[target_col].sub(df[pred_col], axis=0)
-            model_res = (
-                np.maximum(q * delta_y, (q - 1) * delta_y)
-                .groupby(df[id_col], observed=True)
-                .mean()
-                .rename(model_name)
-                .reset_index()
-            )
-            if res is None:
-                res = model_res
-            else:
-                res[model_name] = model_res[model_name]
+            losses[model_name] = np.maximum(q * delta_y, (q - 1) * delta_y)
+        res = _pd_group_agg(
+            pd.DataFrame(losses, index=df.index), df, id_col, series_index
+        )
+    elif isinstance(df, pa_Table):
+        target = _pa_float_values(df, target_col)
+        out = np.empty((df.num_rows, len(models)))
+        for j, pred_col in enumerate(models.values()):
+            delta_y = target - _pa_float_values(df, pred_col)
+            out[:, j] = np.maximum(q * delta_y, (q - 1) * delta_y)
+        res = _pa_agg_values(out, list(models.keys()), df, id_col, series_index)
     else:
 
         def gen_expr(model):
@@ -436,13 +632,14 @@ def quantile_loss(
         res = _pl_agg_expr(df, list(models.items()), id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 61
+# %% ../nbs/losses.ipynb 63
 def mqloss(
     df: DFType,
     models: Dict[str, List[str]],
     quantiles: np.ndarray,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Multi-Quantile loss (MQL)
 
@@ -459,7 +656,7 @@ def mqloss(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : dict from str to list of str
         Mapping from model name to the model predictions for each quantile.
@@ -469,45 +666,75 @@ def mqloss(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
+        The ids are in the order in which they appear in `df`.
 
     References
     ----------
     [1] https://www.jstor.org/stable/2629907
     """
-    res: Optional[DataFrame] = None
+    if isinstance(df, (pl_DataFrame, pl_LazyFrame)):
+
+        def gen_expr(model):
+            losses = []
+            for q, q_preds in zip(quantiles, models[model]):
+                error = pl.col(target_col) - pl.col(q_preds)
+                losses.append(
+                    pl.max_horizontal([float(q) * error, float(q - 1) * error])
+                )
+            # adding the expressions propagates nulls, like the numpy mean
+            return (sum(losses[1:], losses[0]) / len(losses)).alias(model)
+
+        return _pl_agg_expr(df, list(models.keys()), id_col, gen_expr)
     error = np.empty((df.shape[0], quantiles.size))
+    losses = {}
     for model, predictions in models.items():
         for j, q_preds in enumerate(predictions):
-            error[:, j] = (df[target_col] - df[q_preds]).to_numpy()
-        loss = np.maximum(error * quantiles, error * (quantiles - 1)).mean(axis=1)
-        model_res = type(df)({id_col: df[id_col], model: loss})
-        model_res = ufp.group_by_agg(
-            model_res, by=id_col, aggs={model: "mean"}, maintain_order=True
+            if isinstance(df, pa_Table):
+                error[:, j] = _pa_float_values(df, target_col) - _pa_float_values(
+                    df, q_preds
+                )
+            else:
+                error[:, j] = (df[target_col] - df[q_preds]).to_numpy()
+        losses[model] = np.maximum(error * quantiles, error * (quantiles - 1)).mean(
+            axis=1
         )
-        if res is None:
-            res = model_res
-        else:
-            res = ufp.assign_columns(res, model, model_res[model])
-    return res
-
-# %% ../nbs/losses.ipynb 67
+    if isinstance(df, pa_Table):
+        return _pa_agg_values(
+            np.column_stack(list(losses.values())),
+            list(losses.keys()),
+            df,
+            id_col,
+            series_index,
+        )
+    return _pd_group_agg(
+        pd.DataFrame(losses, index=df.index),
+        df,
+        id_col,
+        series_index,
+        maintain_order=True,
+    )
+
+# %% ../nbs/losses.ipynb 69
 def coverage(
     df: DFType,
     models: List[str],
     level: int,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Coverage of y with y_hat_lo and y_hat_hi.
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : list of str
         Columns that identify the models predictions.
@@ -517,10 +744,12 @@ def coverage(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
 
     References
@@ -533,13 +762,20 @@ def coverage(
             out[:, j] = df[target_col].between(
                 df[f"{model}-lo-{level}"], df[f"{model}-hi-{level}"]
             )
-        res = (
-            pd.DataFrame(out, columns=models, index=df.index)
-            .groupby(df[id_col], observed=True)
-            .mean()
+        res = _pd_group_agg(
+            pd.DataFrame(out, columns=models, index=df.index),
+            df,
+            id_col,
+            series_index,
         )
-        res.index.name = id_col
-        res = res.reset_index()
+    elif isinstance(df, pa_Table):
+        target = _pa_float_values(df, target_col)
+        out = np.empty((df.num_rows, len(models)))
+        for j, model in enumerate(models):
+            lo = _pa_float_values(df, f"{model}-lo-{level}")
+            hi = _pa_float_values(df, f"{model}-hi-{level}")
+            out[:, j] = (lo <= target) & (target <= hi)
+        res = _pa_agg_values(out, models, df, id_col, series_index)
     else:
 
         def gen_expr(model):
@@ -554,19 +790,20 @@ def coverage(
         res = _pl_agg_expr(df, models, id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 71
+# %% ../nbs/losses.ipynb 73
 def calibration(
     df: DFType,
     models: Dict[str, str],
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """
     Fraction of y that is lower than the model's predictions.
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : dict from str to str
         Mapping from model name to the model predictions.
@@ -574,10 +811,12 @@ def calibration(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
 
     References
@@ -588,13 +827,18 @@ def calibration(
         out = np.empty((df.shape[0], len(models)))
         for j, q_preds in enumerate(models.values()):
             out[:, j] = df[target_col].le(df[q_preds])
-        res = (
-            pd.DataFrame(out, columns=models.keys(), index=df.index)
-            .groupby(df[id_col], observed=True)
-            .mean()
+        res = _pd_group_agg(
+            pd.DataFrame(out, columns=models.keys(), index=df.index),
+            df,
+            id_col,
+            series_index,
         )
-        res.index.name = id_col
-        res = res.reset_index()
+    elif isinstance(df, pa_Table):
+        target = _pa_float_values(df, target_col)
+        out = np.empty((df.num_rows, len(models)))
+        for j, q_preds in enumerate(models.values()):
+            out[:, j] = target <= _pa_float_values(df, q_preds)
+        res = _pa_agg_values(out, list(models.keys()), df, id_col, series_index)
     else:
 
         def gen_expr(model):
@@ -604,13 +848,14 @@ def calibration(
         res = _pl_agg_expr(df, list(models.items()), id_col, gen_expr)
     return res
 
-# %% ../nbs/losses.ipynb 75
+# %% ../nbs/losses.ipynb 77
 def scaled_crps(
     df: DFType,
     models: Dict[str, List[str]],
     quantiles: np.ndarray,
     id_col: str = "unique_id",
     target_col: str = "y",
+    series_index: Optional[ufp.SeriesIndex] = None,
 ) -> DFType:
     """Scaled Continues Ranked Probability Score
 
@@ -621,7 +866,7 @@ def scaled_crps(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input dataframe with id, times, actuals and predictions.
     models : dict from str to list of str
         Mapping from model name to the model predictions for each quantile.
@@ -631,10 +876,12 @@ def scaled_crps(
         Column that identifies each serie.
     target_col : str (default='y')
         Column that contains the target.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. Only used by the pandas and pyarrow implementations.
 
     Returns
     -------
-    pandas or polars Dataframe
+    pandas or polars Dataframe or pyarrow Table
         dataframe with one row per id and one column per model.
 
     References
@@ -643,16 +890,40 @@ def scaled_crps(
     """
     eps: np.float64 = np.finfo(np.float64).eps
     quantiles = np.asarray(quantiles)
-    loss = mqloss(df, models, quantiles, id_col, target_col)
-    sizes = ufp.counts_by_id(df, id_col)
+    loss = mqloss(df, models, quantiles, id_col, target_col, series_index)
     if isinstance(loss, pd.DataFrame):
-        loss = loss.set_index(id_col)
-        sizes = sizes.set_index(id_col)
         assert isinstance(df, pd.DataFrame)
-        norm = df[target_col].abs().groupby(df[id_col], observed=True).sum()
-        res = 2 * loss.mul(sizes["counts"], axis=0).div(norm + eps, axis=0)
+        loss = loss.set_index(id_col)
+        if series_index is None:
+            sizes = ufp.counts_by_id(df, id_col).set_index(id_col)["counts"]
+        else:
+            sizes = pd.Series(series_index.sizes, index=pd.Index(series_index.uids))
+        norm = _pd_group_agg(
+            df[[target_col]].abs(), df, id_col, series_index, agg="sum"
+        ).set_index(id_col)[target_col]
+        res = 2 * loss.mul(sizes, axis=0).div(norm + eps, axis=0)
         res.index.name = id_col
         res = res.reset_index()
+    elif isinstance(loss, pa_Table):
+        assert isinstance(df, pa_Table)
+        if series_index is None:
+            sizes = ufp.factorize_ids(df, id_col).counts
+        else:
+            sizes = series_index.sizes
+        abs_target = np.abs(_pa_float_values(df, target_col))
+        norm = _pa_agg_values(
+            abs_target[:, None], ["norm"], df, id_col, series_index, agg="sum"
+        )
+        norm_vals = norm["norm"].to_numpy()
+        res = pa.table(
+            {
+                id_col: loss[id_col],
+                **{
+                    model: 2 * _pa_float_values(loss, model) * sizes / (norm_vals + eps)
+                    for model in models
+                },
+            }
+        )
     else:
 
         def gen_expr(model):
@@ -661,9 +932,12 @@ def scaled_crps(
             ).alias(model)
 
         grouped_df = ufp.group_by(df, id_col)
-        norm = grouped_df.agg(pl.col(target_col).abs().sum().alias("norm"))
+        norm = grouped_df.agg(
+            pl.col(target_col).abs().sum().alias("norm"),
+            pl.len().alias("counts"),
+        )
         res = _pl_agg_expr(
-            loss.join(sizes, on=id_col).join(norm, on=id_col),
+            loss.join(norm, on=id_col),
             list(models.keys()),
             id_col,
             gen_expr,
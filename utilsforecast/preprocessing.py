@@ -6,15 +6,31 @@ __all__ = ['id_time_grid', 'fill_gaps']
 # %% ../nbs/preprocessing.ipynb 2
 import warnings
 from datetime import date, datetime
-from functools import partial
-from typing import Union
+from typing import Any, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
-from .compat import DFType, pl, pl_DataFrame, pl_Series
-from .processing import group_by, repeat
-from .validation import _is_int_dtype, validate_format
+from utilsforecast.compat import (
+    DFType,
+    pa,
+    pa_Table,
+    pc,
+    pl,
+    pl_DataFrame,
+    pl_LazyFrame,
+)
+from utilsforecast.processing import (
+    FactorizedIds,
+    _backend_dispatch,
+    _is_dt_dtype,
+    _mark_sorted,
+    _times_to_numpy,
+    factorize_ids,
+    join,
+    join_indices,
+)
+from .validation import _pl_lazy_schema, validate_format
 
 # %% ../nbs/preprocessing.ipynb 4
 def _determine_bound(bound, freq, times_by_id, agg) -> np.ndarray:
@@ -40,93 +56,28 @@ def _determine_bound(bound, freq, times_by_id, agg) -> np.ndarray:
     return out
 
 # %% ../nbs/preprocessing.ipynb 5
-def _determine_bound_pl(
+def _pl_bound_expr(
     bound: Union[str, int, date, datetime],
-    times_by_id: pl_DataFrame,
     agg: str,
-) -> pl_Series:
+) -> pl.Expr:
     if bound == "per_serie":
-        out = times_by_id[agg]
-    else:
-        if bound == "global":
-            val = getattr(times_by_id[agg], agg)()
-        else:
-            val = bound
-        out = repeat(pl_Series([val]), times_by_id.shape[0])
-    return out
+        return pl.col(agg)
+    if bound == "global":
+        return getattr(pl.col(agg), agg)()
+    return pl.lit(bound)
 
-# %% ../nbs/preprocessing.ipynb 6
-def id_time_grid(
-    df: DFType,
-    freq: Union[str, int],
-    start: Union[str, int, date, datetime] = "per_serie",
-    end: Union[str, int, date, datetime] = "global",
-    id_col: str = "unique_id",
-    time_col: str = "ds",
-) -> DFType:
-    """Generate all expected combiations of ids and times.
 
-    Parameters
-    ----------
-    df : pandas or polars DataFrame
-        Input data
-    freq : str or int
-        Series' frequency
-    start : str, int, date or datetime.
-        Initial timestamp for the series.
-            * 'per_serie' uses each serie's first timestamp
-            * 'global' uses the first timestamp seen in the data
-            * Can also be a specific timestamp or integer, e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
-    end : str, int, date or datetime.
-        Initial timestamp for the series.
-            * 'per_serie' uses each serie's last timestamp
-            * 'global' uses the last timestamp seen in the data
-            * Can also be a specific timestamp or integer, e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
-    id_col : str (default='unique_id')
-        Column that identifies each serie.
-    time_col : str (default='ds')
-        Column that identifies each timestamp.
+def _grid_from_bounds(
+    times_by_id: pd.DataFrame,
+    freq: Union[str, int],
+    start: Union[str, int, date, datetime],
+    end: Union[str, int, date, datetime],
+    first_time: Any,
+) -> Tuple[np.ndarray, Union[np.ndarray, pd.Index]]:
+    """Position in `times_by_id` of the serie of each row of the grid and its time.
 
-    Returns
-    -------
-    pandas or polars DataFrame
-        Dataframe with expected ids and times.
+    `times_by_id` has the first ('min') and last ('max') time of each serie, without timezone.
     """
-    if isinstance(df, pl_DataFrame):
-        times_by_id = (
-            group_by(df, id_col)
-            .agg(
-                pl.col(time_col).min().alias("min"),
-                pl.col(time_col).max().alias("max"),
-            )
-            .sort(id_col)
-        )
-        starts = _determine_bound_pl(start, times_by_id, "min")
-        ends = _determine_bound_pl(end, times_by_id, "max")
-        grid = pl_DataFrame({id_col: times_by_id[id_col]})
-        if _is_int_dtype(starts):
-            grid = grid.with_columns(
-                pl.int_ranges(starts, ends + freq, step=freq, eager=True).alias(
-                    time_col
-                )
-            )
-        else:
-            if starts.dtype == pl.Date:
-                ranges_fn = pl.date_ranges
-            else:
-                ranges_fn = partial(
-                    pl.datetime_ranges,
-                    time_unit=df.schema[time_col].time_unit,
-                )
-            grid = grid.with_columns(
-                ranges_fn(
-                    starts,
-                    ends,
-                    interval=freq,
-                    eager=True,
-                ).alias(time_col)
-            )
-        return grid.explode(time_col)
     if isinstance(freq, str):
         offset = pd.tseries.frequencies.to_offset(freq)
         n = offset.n
@@ -154,38 +105,177 @@ def id_time_grid(
             # such as MS = 'Month Start' -> 'M', YS = 'Year Start' -> 'Y'
             freq = freq[0]
         delta: Union[np.timedelta64, int] = np.timedelta64(n, freq)
-        if df[time_col].dt.tz is not None:
-            df = df.copy(deep=False)
-            df[time_col] = df[time_col].dt.tz_convert("UTC").dt.tz_localize(None)
     else:
         delta = freq
-    times_by_id = df.groupby(id_col, observed=True)[time_col].agg(["min", "max"])
     starts = _determine_bound(start, freq, times_by_id, "min")
     ends = _determine_bound(end, freq, times_by_id, "max") + delta
     sizes = ((ends - starts) / delta).astype(np.int64)
     times = np.hstack(
         [np.arange(start, end, delta) for start, end in zip(starts, ends)]
     )
-    uids = np.repeat(times_by_id.index, sizes)
+    positions = np.repeat(np.arange(times_by_id.shape[0]), sizes)
     if isinstance(freq, str):
         if isinstance(offset.base, pd.offsets.BusinessDay):
             # data was generated daily, we need to keep only business days
             bdays = np.is_busday(times)
-            uids = uids[bdays]
+            positions = positions[bdays]
             times = times[bdays]
         times = pd.Index(times.astype("datetime64[ns]", copy=False))
-        first_time = np.datetime64(df.iloc[0][time_col])
+        first_time = np.datetime64(first_time)
         was_truncated = first_time != first_time.astype(f"datetime64[{freq}]")
         if was_truncated:
             times += offset.base
+    return positions, times
+
+
+def _pa_grid(
+    df: pa_Table,
+    freq: Union[str, int],
+    start: Union[str, int, date, datetime],
+    end: Union[str, int, date, datetime],
+    id_col: str,
+    time_col: str,
+) -> Tuple[FactorizedIds, np.ndarray, np.ndarray]:
+    """Factorized ids of `df`, code of the id of each row of the grid and its time as an integer.
+
+    Datetimes are represented as nanoseconds since epoch in UTC."""
+    factorized = factorize_ids(df, id_col)
+    times = _times_to_numpy(df[time_col])
+    has_id = factorized.codes >= 0
+    # one row per serie, so the bounds are computed with pandas
+    times_by_id = (
+        pd.Series(times[has_id]).groupby(factorized.codes[has_id]).agg(["min", "max"])
+    )
+    is_datetime = _is_dt_dtype(df[time_col])
+    if is_datetime:
+        times_by_id = times_by_id.astype("datetime64[ns]")
+    first_time = times[:1].view("datetime64[ns]")[0] if is_datetime else None
+    positions, grid_times = _grid_from_bounds(times_by_id, freq, start, end, first_time)
+    grid_times = np.asarray(grid_times)
+    if is_datetime:
+        grid_times = grid_times.astype("datetime64[ns]", copy=False).view(np.int64)
+    return factorized, positions, grid_times
+
+
+def _pa_times_from_int(times: np.ndarray, dtype: "pa.DataType") -> "pa.Array":
+    """Inverse of the integer representation of the times in `_pa_grid`."""
+    if pa.types.is_timestamp(dtype) or pa.types.is_date(dtype):
+        tz = getattr(dtype, "tz", None)
+        return (
+            pa.array(times.view("datetime64[ns]"))
+            .cast(pa.timestamp("ns", tz))
+            .cast(dtype)
+        )
+    return pa.array(times).cast(dtype)
+
+
+def _warn_if_values_lost(n_before: int, n_after: int) -> None:
+    if n_after < n_before:
+        warnings.warn(
+            "Some values were lost during filling, "
+            "please make sure that all your times meet the specified frequency.\n"
+            "For example if you have 'W-TUE' as your frequency, "
+            "make sure that all your times are actually Tuesdays."
+        )
+
+# %% ../nbs/preprocessing.ipynb 6
+@_backend_dispatch
+def id_time_grid(
+    df: DFType,
+    freq: Union[str, int],
+    start: Union[str, int, date, datetime] = "per_serie",
+    end: Union[str, int, date, datetime] = "global",
+    id_col: str = "unique_id",
+    time_col: str = "ds",
+) -> DFType:
+    """Generate all expected combiations of ids and times.
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
+        Input data
+    freq : str or int
+        Series' frequency
+    start : str, int, date or datetime.
+        Initial timestamp for the series.
+            * 'per_serie' uses each serie's first timestamp
+            * 'global' uses the first timestamp seen in the data
+            * Can also be a specific timestamp or integer, e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
+    end : str, int, date or datetime.
+        Initial timestamp for the series.
+            * 'per_serie' uses each serie's last timestamp
+            * 'global' uses the last timestamp seen in the data
+            * Can also be a specific timestamp or integer, e.g. '2000-01-01', 2000 or datetime(2000, 1, 1)
+    id_col : str (default='unique_id')
+        Column that identifies each serie.
+    time_col : str (default='ds')
+        Column that identifies each timestamp.
+
+    Returns
+    -------
+    pandas or polars DataFrame, polars LazyFrame or pyarrow Table
+        Dataframe with expected ids and times.
+    """
+    if isinstance(df, (pl_DataFrame, pl_LazyFrame)):
+        time_dtype = _pl_lazy_schema(df.lazy())[time_col]
+        start_expr = _pl_bound_expr(start, "min")
+        end_expr = _pl_bound_expr(end, "max")
+        if time_dtype.is_integer():
+            ranges = pl.int_ranges(start_expr, end_expr + freq, step=freq)
+        elif time_dtype == pl.Date:
+            ranges = pl.date_ranges(start_expr, end_expr, interval=freq)
+        else:
+            ranges = pl.datetime_ranges(
+                start_expr, end_expr, interval=freq, time_unit=time_dtype.time_unit
+            )
+        grid = (
+            df.lazy()
+            .group_by(id_col)
+            .agg(
+                pl.col(time_col).min().alias("min"),
+                pl.col(time_col).max().alias("max"),
+            )
+            .sort(id_col)
+            .select(pl.col(id_col), ranges.alias(time_col))
+            .explode(time_col)
+        )
+        if isinstance(df, pl_LazyFrame):
+            return _mark_sorted(grid, id_col)
+        return _mark_sorted(grid.collect(), id_col)
+    if isinstance(freq, str) and df[time_col].dt.tz is not None:
+        df = df.copy(deep=False)
+        df[time_col] = df[time_col].dt.tz_convert("UTC").dt.tz_localize(None)
+    times_by_id = df.groupby(id_col, observed=True)[time_col].agg(["min", "max"])
+    positions, times = _grid_from_bounds(
+        times_by_id, freq, start, end, df[time_col].iloc[0]
+    )
     return pd.DataFrame(
         {
-            id_col: uids,
+            id_col: times_by_id.index.take(positions),
             time_col: times,
         }
     )
 
+
+@id_time_grid.register(pa_Table)
+def _id_time_grid_arrow(
+    df: pa_Table,
+    freq: Union[str, int],
+    start: Union[str, int, date, datetime] = "per_serie",
+    end: Union[str, int, date, datetime] = "global",
+    id_col: str = "unique_id",
+    time_col: str = "ds",
+) -> pa_Table:
+    factorized, positions, times = _pa_grid(df, freq, start, end, id_col, time_col)
+    return pa.table(
+        {
+            id_col: pc.take(factorized.uniques, positions).cast(df[id_col].type),
+            time_col: _pa_times_from_int(times, df[time_col].type),
+        }
+    )
+
 # %% ../nbs/preprocessing.ipynb 7
+@_backend_dispatch
 def fill_gaps(
     df: DFType,
     freq: Union[str, int],
@@ -198,7 +288,7 @@ def fill_gaps(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Input data
     freq : str or int
         Series' frequency
@@ -219,7 +309,7 @@ def fill_gaps(
 
     Returns
     -------
-    filled_df : pandas or polars DataFrame
+    filled_df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         Dataframe with gaps filled.
     """
     validate_format(df, id_col=id_col, time_col=time_col, target_col=None)
@@ -231,8 +321,11 @@ def fill_gaps(
         id_col=id_col,
         time_col=time_col,
     )
+    if isinstance(df, pl_LazyFrame):
+        return join(grid, df, on=[id_col, time_col], how="left")
     if isinstance(df, pl_DataFrame):
-        return grid.join(df, on=[id_col, time_col], how="left")
+        res = join(grid, df, on=[id_col, time_col], how="left", sorted_keys=True)
+        return _mark_sorted(res, id_col)
     idx = pd.MultiIndex.from_frame(grid)
     if isinstance(freq, str):
         tz = df[time_col].dt.tz
@@ -246,11 +339,44 @@ def fill_gaps(
     extra_cols = df.columns.drop([id_col, time_col]).tolist()
     if extra_cols:
         check_col = extra_cols[0]
-        if res[check_col].count() < df[check_col].count():
-            warnings.warn(
-                "Some values were lost during filling, "
-                "please make sure that all your times meet the specified frequency.\n"
-                "For example if you have 'W-TUE' as your frequency, "
-                "make sure that all your times are actually Tuesdays."
-            )
+        _warn_if_values_lost(df[check_col].count(), res[check_col].count())
+    return res
+
+
+@fill_gaps.register(pa_Table)
+def _fill_gaps_arrow(
+    df: pa_Table,
+    freq: Union[str, int],
+    start: Union[str, int, date, datetime] = "per_serie",
+    end: Union[str, int, date, datetime] = "global",
+    id_col: str = "unique_id",
+    time_col: str = "ds",
+) -> pa_Table:
+    validate_format(df, id_col=id_col, time_col=time_col, target_col=None)
+    factorized, positions, times = _pa_grid(df, freq, start, end, id_col, time_col)
+    # match the grid with the rows of df by the code of their id and their time
+    grid_keys = pd.DataFrame({"id": positions, "time": times}, dtype=np.int64)
+    df_keys = pd.DataFrame(
+        {"id": factorized.codes, "time": _times_to_numpy(df[time_col])}, dtype=np.int64
+    )
+    idxs = join_indices(grid_keys, df_keys, ["id", "time"], how="left")
+    assert idxs is not None  # integer keys without nulls
+    grid_idxs, df_idxs = idxs
+    res = pa.table(
+        {
+            id_col: pc.take(factorized.uniques, positions[grid_idxs]).cast(
+                df[id_col].type
+            ),
+            time_col: _pa_times_from_int(times[grid_idxs], df[time_col].type),
+        }
+    )
+    extra_cols = [c for c in df.column_names if c not in (id_col, time_col)]
+    if not extra_cols:
+        return res
+    extra = df.select(extra_cols).take(pa.array(df_idxs, mask=df_idxs < 0))
+    for col in extra_cols:
+        res = res.append_column(col, extra[col])
+    check_col = extra_cols[0]
+    n_values = df.num_rows - df[check_col].null_count
+    _warn_if_values_lost(n_values, res.num_rows - res[check_col].null_count)
     return res
@@ -1,27 +1,59 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/processing.ipynb.
 
 # %% auto 0
-__all__ = ['to_numpy', 'counts_by_id', 'maybe_compute_sort_indices', 'assign_columns', 'drop_columns', 'take_rows',
-           'filter_with_mask', 'is_nan', 'is_none', 'is_nan_or_none', 'match_if_categorical', 'vertical_concat',
-           'horizontal_concat', 'copy_if_pandas', 'join', 'drop_index_if_pandas', 'rename', 'sort', 'offset_times',
+__all__ = ['to_numpy', 'FactorizedIds', 'factorize_ids', 'counts_by_id', 'maybe_compute_sort_indices', 'assign_columns',
+           'drop_columns', 'take_rows', 'filter_with_mask', 'is_nan', 'is_none', 'is_nan_or_none',
+           'match_if_categorical', 'vertical_concat', 'horizontal_concat', 'copy_if_pandas', 'EncodedIds', 'encode_ids',
+           'decode_ids', 'join_indices', 'join', 'drop_index_if_pandas', 'rename', 'sort', 'offset_times',
            'offset_dates', 'time_ranges', 'repeat', 'cv_times', 'group_by', 'group_by_agg', 'is_in', 'between',
            'fill_null', 'cast', 'value_cols_to_numpy', 'make_future_dataframe', 'anti_join', 'ensure_sorted',
-           'ProcessedDF', 'process_df', 'DataFrameProcessor', 'backtest_splits', 'add_insample_levels']
+           'SeriesIndex', 'ProcessedDF', 'process_df', 'DataFrameProcessor', 'BacktestSplitIndices',
+           'backtest_split_indices', 'backtest_splits', 'add_insample_levels']
 
 # %% ../nbs/processing.ipynb 2
+import functools
+import inspect
 import re
 import reprlib
 import warnings
-from typing import Any, Dict, Generator, List, NamedTuple, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import pandas as pd
 from pandas.tseries.offsets import BaseOffset
 
-from .compat import DataFrame, Series, pl, pl_DataFrame, pl_Series
+from utilsforecast.compat import (
+    NUMBA_INSTALLED,
+    DataFrame,
+    Series,
+    njit,
+    pa,
+    pa_ChunkedArray,
+    pa_Table,
+    pc,
+    pl,
+    pl_DataFrame,
+    pl_Expr,
+    pl_LazyFrame,
+    pl_Series,
+    prange,
+)
 from utilsforecast.validation import (
     _is_dt_dtype,
     _is_int_dtype,
+    _pl_lazy_schema,
     ensure_shallow_copy,
     validate_format,
 )
@@ -32,8 +64,81 @@ def _polars_categorical_to_numerical(serie: pl_Series) -> pl_Series:
         serie = serie.to_physical()
     return serie
 
+
+def _column_names(df: Union[DataFrame, pl_LazyFrame, pa_Table]) -> List[str]:
+    """Names of the columns, without collecting lazy frames."""
+    if isinstance(df, pl_LazyFrame):
+        return list(_pl_lazy_schema(df))
+    if isinstance(df, pa_Table):
+        return df.column_names
+    return list(df.columns)
+
+
+def _column_to_numpy(s: Series) -> np.ndarray:
+    """Values of a column, without copying when they're already numeric."""
+    if isinstance(s, pd.Series):
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            s = s.cat.codes
+        # numpy backed columns are views and arrow buffers without nulls are read directly
+        return s.to_numpy()
+    if isinstance(s, pa_ChunkedArray):
+        if pa.types.is_dictionary(s.type):
+            s = pa.chunked_array(
+                [chunk.indices for chunk in s.unify_dictionaries().chunks],
+                type=s.type.index_type,
+            )
+        return s.to_numpy()
+    return _polars_categorical_to_numerical(s).to_numpy()
+
+
+def _stack_columns(
+    df: DataFrame,
+    columns: List[str],
+    dtype: Optional[np.dtype],
+    order: Optional[Literal["C", "F"]],
+) -> np.ndarray:
+    """Write the columns into a new 2d array, which is the only copy."""
+    cols = [_column_to_numpy(df[c]) for c in columns]
+    if dtype is not None:
+        out_dtype = np.dtype(dtype)
+    else:
+        out_dtype = np.result_type(*cols) if cols else np.dtype(np.float64)
+    out = np.empty((df.shape[0], len(cols)), dtype=out_dtype, order=order or "C")
+    if out.flags.f_contiguous:
+        for j, col in enumerate(cols):
+            out[:, j] = col
+        return out
+    # fill blocks of rows that fit in cache, writing whole columns into C order is much slower
+    block_size = max(1, (1 << 20) // max(out.strides[0], 1))
+    for start in range(0, out.shape[0], block_size):
+        out_block = out[start : start + block_size]
+        for j, col in enumerate(cols):
+            out_block[:, j] = col[start : start + block_size]
+    return out
+
 # %% ../nbs/processing.ipynb 6
-def to_numpy(df: DataFrame) -> np.ndarray:
+def to_numpy(
+    df: DataFrame,
+    dtype: Optional[np.dtype] = None,
+    order: Optional[Literal["C", "F"]] = None,
+) -> np.ndarray:
+    """Values of the dataframe as a 2d array, with categoricals replaced by their codes.
+
+    If `dtype` or `order` ('C' or 'F') are provided the output is built in a single copy,
+    or returned without one when the data already has that type and layout."""
+    if isinstance(df, pa_Table):
+        return _stack_columns(df, df.column_names, dtype, order)
+    if dtype is not None or order is not None:
+        if isinstance(df, pd.DataFrame):
+            is_single_block = df.dtypes.nunique() == 1 and isinstance(
+                df.dtypes.iloc[0], np.dtype
+            )
+        else:
+            is_single_block = False
+        if is_single_block:
+            # view of the block, which is stored as fortran order
+            return np.asarray(df.to_numpy(), dtype=dtype, order=order)  # type: ignore[arg-type]
+        return _stack_columns(df, df.columns, dtype, order)
     if isinstance(df, pd.DataFrame):
         cat_cols = [
             c
@@ -54,26 +159,201 @@ def to_numpy(df: DataFrame) -> np.ndarray:
         df = df.select(expr).to_numpy(order="c")
     return df
 
-# %% ../nbs/processing.ipynb 7
+# %% ../nbs/processing.ipynb 9
+class FactorizedIds(NamedTuple):
+    codes: np.ndarray
+    uniques: Series
+    counts: np.ndarray
+
+
+def factorize_ids(df: DataFrame, id_col: str) -> FactorizedIds:
+    """Encode the ids as dense integers in a single pass
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame or pyarrow Table
+        Input dataframe with ids.
+    id_col : str
+        Column that identifies each serie.
+
+    Returns
+    -------
+    FactorizedIds
+        Code of each row, sorted unique ids and number of rows of each id.
+        The codes follow the order of the unique ids, so they can be used to sort the data.
+    """
+    ids = df[id_col]
+    if isinstance(ids, pd.Series):
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            # categoricals are sorted by their codes, keep only the observed ones
+            cat_codes = ids.cat.codes.to_numpy()
+            cat_counts = np.bincount(
+                cat_codes[cat_codes >= 0], minlength=len(ids.cat.categories)
+            )
+            observed = np.flatnonzero(cat_counts)
+            remap = np.full(cat_counts.size, -1, dtype=np.intp)
+            remap[observed] = np.arange(observed.size)
+            codes = remap[cat_codes]
+            uniques = pd.Series(
+                pd.Categorical.from_codes(observed, dtype=ids.dtype), name=id_col
+            )
+            counts = cat_counts[observed]
+        else:
+            codes, unique_vals = pd.factorize(ids, sort=True)
+            uniques = pd.Series(unique_vals, name=id_col)
+            counts = np.bincount(codes[codes >= 0], minlength=len(unique_vals))
+    elif isinstance(ids, pa_ChunkedArray):
+        if pa.types.is_dictionary(ids.type):
+            ids = ids.cast(ids.type.value_type)
+        unique_vals = pc.unique(ids.drop_null())
+        unique_vals = unique_vals.take(pc.array_sort_indices(unique_vals))
+        uniques = pa.chunked_array([unique_vals])
+        # nulls get -1, like in pandas
+        codes = pc.index_in(ids, value_set=unique_vals).fill_null(-1).to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(unique_vals))
+    else:
+        uniques = ids.drop_nulls().unique().sort()
+        # nulls get -1, like in pandas
+        codes = (ids.rank("dense").fill_null(0).cast(pl.Int64) - 1).to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    return FactorizedIds(codes=codes, uniques=uniques, counts=counts)
+
+# %% ../nbs/processing.ipynb 10
 def counts_by_id(df: DataFrame, id_col: str) -> DataFrame:
+    factorized = factorize_ids(df, id_col)
     if isinstance(df, pd.DataFrame):
-        id_counts = df[id_col].value_counts(sort=False, dropna=True)
-        ids = id_counts.index
-        if isinstance(ids.dtype, pd.CategoricalDtype):
-            # there's no observed argument in value_counts
-            # so this can return unseen categories
-            id_counts = id_counts[id_counts > 0]
-            ids = id_counts.index.codes
-        sort_idxs = ids.argsort()
-        id_counts = id_counts.iloc[sort_idxs].reset_index()
+        id_counts = pd.DataFrame(
+            {id_col: factorized.uniques, "counts": factorized.counts}
+        )
+    elif isinstance(df, pa_Table):
+        id_counts = pa.table({id_col: factorized.uniques, "counts": factorized.counts})
     else:
-        id_counts = df[id_col].value_counts().sort(id_col)
-    id_counts.columns = [id_col, "counts"]
+        id_counts = pl_DataFrame(
+            {id_col: factorized.uniques, "counts": factorized.counts.astype(np.uint32)}
+        )
     return id_counts
 
-# %% ../nbs/processing.ipynb 8
+# %% ../nbs/processing.ipynb 13
+def _index_dtype(n: int) -> np.dtype:
+    """Integer type for positions up to `n`, int32 when they fit."""
+    if n <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    return np.dtype(np.int64)
+
+
+def _indptr_from_sizes(sizes: np.ndarray) -> np.ndarray:
+    """Boundaries of consecutive groups with the given sizes."""
+    indptr = np.empty(sizes.size + 1, dtype=np.int64)
+    indptr[0] = 0
+    np.cumsum(sizes, dtype=np.int64, out=indptr[1:])
+    return indptr.astype(_index_dtype(indptr[-1]), copy=False)
+
+# %% ../nbs/processing.ipynb 15
+@njit(nogil=True, cache=True, parallel=True)
+def _is_sorted_by_id_time(ids: np.ndarray, times: np.ndarray, n_chunks: int) -> bool:
+    n = ids.size
+    chunk_size = (n - 1 + n_chunks - 1) // n_chunks
+    chunk_is_sorted = np.ones(n_chunks, dtype=np.bool_)
+    for c in prange(n_chunks):
+        start = c * chunk_size
+        end = min(start + chunk_size, n - 1)
+        for i in range(start, end):
+            if ids[i] > ids[i + 1] or (
+                ids[i] == ids[i + 1] and times[i] >= times[i + 1]
+            ):
+                chunk_is_sorted[c] = False
+                break
+    return bool(chunk_is_sorted.all())
+
+
+@njit(nogil=True, cache=True, parallel=True)
+def _counting_argsort(
+    ids: np.ndarray, times: np.ndarray, min_id: int, n_codes: int, n_chunks: int
+) -> np.ndarray:
+    n = ids.size
+    chunk_size = (n + n_chunks - 1) // n_chunks
+    # count the ids in each chunk
+    counts = np.zeros((n_chunks, n_codes), dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk_size, min((c + 1) * chunk_size, n)):
+            counts[c, ids[i] - min_id] += 1
+    # starting position of each (chunk, id) in the output
+    indptr = np.empty(n_codes + 1, dtype=np.int64)
+    indptr[0] = 0
+    for code in range(n_codes):
+        pos = indptr[code]
+        for c in range(n_chunks):
+            size = counts[c, code]
+            counts[c, code] = pos
+            pos += size
+        indptr[code + 1] = pos
+    # stable scatter of the row numbers
+    out = np.empty(n, dtype=np.int64)
+    for c in prange(n_chunks):
+        for i in range(c * chunk_size, min((c + 1) * chunk_size, n)):
+            code = ids[i] - min_id
+            out[counts[c, code]] = i
+            counts[c, code] += 1
+    # sort each serie by time
+    for code in prange(n_codes):
+        start = indptr[code]
+        end = indptr[code + 1]
+        needs_sort = False
+        for j in range(start, end - 1):
+            if times[out[j]] > times[out[j + 1]]:
+                needs_sort = True
+                break
+        if needs_sort:
+            rows = out[start:end].copy()
+            order = np.argsort(times[rows], kind="mergesort")
+            out[start:end] = rows[order]
+    return out
+
+
+def _n_chunks(n: int) -> int:
+    # enough chunks to keep every thread busy without making them too small
+    return max(1, min(n // 2**14, 1024))
+
+
+def _as_int_array(x: np.ndarray) -> Optional[np.ndarray]:
+    """View `x` as an integer array that the numba kernels can work with."""
+    if x.dtype.kind in "mM":
+        return x.view(np.int64)
+    if x.dtype.kind == "i" or (x.dtype.kind == "u" and x.dtype.itemsize < 8):
+        return x
+    return None
+
+# %% ../nbs/processing.ipynb 16
+def _mark_sorted(df: DataFrame, id_col: str) -> DataFrame:
+    """Flag the id column of a polars frame sorted by id and time as sorted.
+
+    polars keeps or drops the flag as the frame is transformed, so later checks can rely on it.
+    """
+    if isinstance(df, (pl_DataFrame, pl_LazyFrame)):
+        id_dtype = _pl_lazy_schema(df.lazy())[id_col]
+        if not isinstance(id_dtype, (pl.Categorical, pl.Enum)):
+            # categoricals can be ordered by their physical or lexical representation
+            df = df.with_columns(pl.col(id_col).set_sorted())
+    return df
+
+
+def _is_marked_sorted(df: DataFrame, id_col: str, time_col: str) -> bool:
+    """Whether the polars sorted flags show that `df` is sorted by id and time.
+
+    The flags can only describe single columns, so when only the id column is flagged
+    the times are still checked within each serie."""
+    if not isinstance(df, pl_DataFrame) or not df[id_col].flags["SORTED_ASC"]:
+        return False
+    if df[time_col].flags["SORTED_ASC"]:
+        return True
+    times = pl.col(time_col)
+    ids = pl.col(id_col)
+    times_are_sorted = (times > times.shift()) | (ids != ids.shift())
+    return bool(df.select(times_are_sorted.all()).item())
+
+# %% ../nbs/processing.ipynb 17
 def maybe_compute_sort_indices(
-    df: DataFrame, id_col: str, time_col: str
+    df: DataFrame, id_col: str, time_col: str, id_codes: Optional[np.ndarray] = None
 ) -> Optional[np.ndarray]:
     """Compute indices that would sort the dataframe
 
@@ -81,21 +361,51 @@ def maybe_compute_sort_indices(
     ----------
     df : pandas or polars DataFrame
         Input dataframe with id, times and target values.
+    id_codes : numpy ndarray, optional (default=None)
+        Codes of the ids, as returned by `factorize_ids`.
+        If provided, these are used instead of the ids themselves.
 
     Returns
     -------
     numpy array or None
         Array with indices to sort the dataframe or None if it's already sorted.
     """
+    if _is_marked_sorted(df, id_col, time_col):
+        return None
     ids = df[id_col]
     times = df[time_col]
-    if isinstance(df, pd.DataFrame):
+    if id_codes is not None:
+        ids = id_codes
+    elif isinstance(df, pd.DataFrame):
         if isinstance(ids.dtype, pd.CategoricalDtype):
             # we sort categoricals by their codes, this is also done in counts_by_id
             ids = ids.cat.codes
         # pandas series alignment makes this slow, cast to numpy
         ids = ids.to_numpy()
+    elif isinstance(df, pa_Table):
+        ids = factorize_ids(df, id_col).codes
+    elif (
+        NUMBA_INSTALLED
+        and ids.dtype.is_integer()
+        and (times.dtype.is_integer() or times.dtype in (pl.Date, pl.Datetime))
+    ):
+        ids = ids.to_numpy()
+    if isinstance(ids, np.ndarray):
         times = times.to_numpy()
+    int_ids = _as_int_array(ids) if isinstance(ids, np.ndarray) else None
+    int_times = _as_int_array(times) if isinstance(times, np.ndarray) else None
+    if NUMBA_INSTALLED and int_ids is not None and int_times is not None:
+        n = int_ids.size
+        if n < 2 or _is_sorted_by_id_time(int_ids, int_times, _n_chunks(n)):
+            return None
+        min_id = int(int_ids.min())
+        n_codes = int(int_ids.max()) - min_id + 1
+        if n_codes <= n:
+            # dense ids, e.g. categorical codes.
+            # keep the per chunk counts smaller than the data
+            n_chunks = min(_n_chunks(n), max(1, n // n_codes))
+            return _counting_argsort(int_ids, int_times, min_id, n_codes, n_chunks)
+        return np.lexsort((int_times, int_ids))
     ids_are_sorted = (ids[:-1] <= ids[1:]).all()
     if ids_are_sorted:
         times_are_sorted = (
@@ -104,97 +414,281 @@ def maybe_compute_sort_indices(
         ).all()
         if times_are_sorted:
             return None
-    if isinstance(df, pd.DataFrame):
-        if pd.api.types.is_object_dtype(df.dtypes[id_col]):
-            # MultiIndex.argsort is faster than lexsort for strings
-            sort_idxs = pd.MultiIndex.from_frame(df[[id_col, time_col]]).argsort()
-        else:
-            sort_idxs = np.lexsort((times, ids))
+    if (
+        id_codes is None
+        and isinstance(df, pd.DataFrame)
+        and pd.api.types.is_object_dtype(df.dtypes[id_col])
+    ):
+        # MultiIndex.argsort is faster than lexsort for strings
+        sort_idxs = pd.MultiIndex.from_frame(df[[id_col, time_col]]).argsort()
+    elif isinstance(ids, np.ndarray):
+        sort_idxs = np.lexsort((times, ids))
     else:
         sort_idxs = (
             df.select(pl.arg_sort_by([id_col, time_col])).to_series(0).to_numpy()
         )
     return sort_idxs
 
-# %% ../nbs/processing.ipynb 9
+# %% ../nbs/processing.ipynb 18
+_T = TypeVar("_T")
+
+
+def _backend_dispatch(
+    func: Callable[..., _T],
+) -> "functools._SingleDispatchCallable[_T]":
+    """`functools.singledispatch` that also dispatches when the first argument is passed by keyword."""
+    dispatcher = functools.singledispatch(func)
+    first_arg = next(iter(inspect.signature(func).parameters))
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        obj = args[0] if args else kwargs[first_arg]
+        return dispatcher.dispatch(obj.__class__)(*args, **kwargs)
+
+    for attr in ("register", "dispatch", "registry", "_clear_cache"):
+        setattr(wrapper, attr, getattr(dispatcher, attr))
+    return wrapper  # type: ignore[return-value]
+
+
+def _unsupported_type(name: str, obj: Any) -> TypeError:
+    """Error for objects without an implementation registered with `name.register`."""
+    return TypeError(
+        f"`{name}` doesn't support objects of type '{type(obj).__name__}'. "
+        f"Implementations can be added with `{name}.register`."
+    )
+
+# %% ../nbs/processing.ipynb 19
+@_backend_dispatch
 def assign_columns(
     df: DataFrame,
-    names: Union[str, List[str]],
-    values: Union[np.ndarray, pd.Series, pl_Series, List[float]],
+    names: Union[str, List[str]],  # noqa: ARG001
+    values: Union[np.ndarray, pd.Series, pl_Series, List[float]],  # noqa: ARG001
 ) -> DataFrame:
-    if isinstance(values, list) and (
-        len(values) != df.shape[0] or not isinstance(names, str)
-    ):
+    raise _unsupported_type("assign_columns", df)
+
+
+def _check_list_assignment(
+    df: DataFrame, names: Union[str, List[str]], values: Any
+) -> None:
+    if not isinstance(values, list):
+        return
+    # the number of rows of a LazyFrame is only known after collecting it
+    wrong_size = not isinstance(df, pl_LazyFrame) and len(values) != df.shape[0]
+    if wrong_size or not isinstance(names, str):
         raise ValueError("Only single column assignment is supported for lists.")
-    if isinstance(df, pd.DataFrame):
-        df[names] = values
-    else:
-        is_scalar = isinstance(values, str) or not hasattr(values, "__len__")
-        if is_scalar:
-            assert isinstance(names, str)
-            vals: Union[pl_DataFrame, pl_Series, pl.Expr] = pl.lit(values).alias(names)
-        elif isinstance(values, pl_Series):
-            assert isinstance(names, str)
-            vals = values.alias(names)
-        else:
-            if isinstance(values, np.ndarray):
-                if isinstance(names, str):
-                    names = [names]
-                vals = pl.from_numpy(values, schema=names, orient="row")
-            elif isinstance(values, list):
-                assert isinstance(names, str)
-                vals = pl_Series(name=names, values=values)
-        df = df.with_columns(vals)
+
+
+@assign_columns.register(pd.DataFrame)
+def _assign_columns_pandas(
+    df: pd.DataFrame,
+    names: Union[str, List[str]],
+    values: Union[np.ndarray, pd.Series, pl_Series, List[float]],
+) -> pd.DataFrame:
+    _check_list_assignment(df, names, values)
+    df[names] = values
     return df
 
-# %% ../nbs/processing.ipynb 12
-def drop_columns(df: DataFrame, columns: Union[str, List[str]]) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
-        df = df.drop(columns=columns)
+
+@assign_columns.register(pl_DataFrame)
+@assign_columns.register(pl_LazyFrame)
+def _assign_columns_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame],
+    names: Union[str, List[str]],
+    values: Union[np.ndarray, pd.Series, pl_Series, List[float]],
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    _check_list_assignment(df, names, values)
+    is_scalar = isinstance(values, str) or not hasattr(values, "__len__")
+    if is_scalar:
+        assert isinstance(names, str)
+        vals: Union[List[pl_Series], pl_Series, pl.Expr] = pl.lit(values).alias(names)
+    elif isinstance(values, pl_Series):
+        assert isinstance(names, str)
+        vals = values.alias(names)
     else:
-        df = df.drop(columns)
-    return df
+        if isinstance(values, np.ndarray):
+            if isinstance(names, str):
+                names = [names]
+            vals = pl.from_numpy(values, schema=names, orient="row").get_columns()
+        elif isinstance(values, list):
+            assert isinstance(names, str)
+            vals = pl_Series(name=names, values=values)
+    return df.with_columns(vals)
 
-# %% ../nbs/processing.ipynb 13
-def take_rows(df: Union[DataFrame, Series, np.ndarray], idxs: np.ndarray) -> DataFrame:
-    if isinstance(df, (pd.DataFrame, pd.Series)):
-        df = df.iloc[idxs]
+
+@assign_columns.register(pa_Table)
+def _assign_columns_arrow(
+    df: pa_Table,
+    names: Union[str, List[str]],
+    values: Union[np.ndarray, pd.Series, pa_ChunkedArray, List[float]],
+) -> pa_Table:
+    _check_list_assignment(df, names, values)
+    if isinstance(names, str):
+        columns = {names: values}
     else:
-        df = df[idxs]
+        # 2d array with one column per name
+        columns = dict(zip(names, np.asarray(values).T))
+    for name, vals in columns.items():
+        if isinstance(vals, str) or not hasattr(vals, "__len__"):
+            vals = pa.repeat(vals, df.num_rows)
+        elif not isinstance(vals, (pa.Array, pa_ChunkedArray)):
+            vals = pa.array(vals)
+        if name in df.column_names:
+            df = df.set_column(df.column_names.index(name), name, vals)
+        else:
+            df = df.append_column(name, vals)
     return df
 
-# %% ../nbs/processing.ipynb 15
+# %% ../nbs/processing.ipynb 22
+@_backend_dispatch
+def drop_columns(
+    df: DataFrame, columns: Union[str, List[str]]  # noqa: ARG001
+) -> DataFrame:
+    raise _unsupported_type("drop_columns", df)
+
+
+@drop_columns.register(pd.DataFrame)
+def _drop_columns_pandas(
+    df: pd.DataFrame, columns: Union[str, List[str]]
+) -> pd.DataFrame:
+    return df.drop(columns=columns)
+
+
+@drop_columns.register(pl_DataFrame)
+@drop_columns.register(pl_LazyFrame)
+def _drop_columns_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame], columns: Union[str, List[str]]
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    return df.drop(columns)
+
+
+@drop_columns.register(pa_Table)
+def _drop_columns_arrow(df: pa_Table, columns: Union[str, List[str]]) -> pa_Table:
+    return df.drop_columns(columns)
+
+# %% ../nbs/processing.ipynb 24
+@_backend_dispatch
+def take_rows(
+    df: Union[DataFrame, Series, np.ndarray], idxs: np.ndarray  # noqa: ARG001
+) -> DataFrame:
+    raise _unsupported_type("take_rows", df)
+
+
+@take_rows.register(pd.DataFrame)
+@take_rows.register(pd.Series)
+def _take_rows_pandas(
+    df: Union[pd.DataFrame, pd.Series], idxs: np.ndarray
+) -> Union[pd.DataFrame, pd.Series]:
+    return df.iloc[idxs]
+
+
+@take_rows.register(pa_Table)
+@take_rows.register(pa_ChunkedArray)
+def _take_rows_arrow(
+    df: Union[pa_Table, pa_ChunkedArray], idxs: np.ndarray
+) -> Union[pa_Table, pa_ChunkedArray]:
+    return df.take(idxs)
+
+
+@take_rows.register(pl_DataFrame)
+@take_rows.register(pl_Series)
+@take_rows.register(pd.Index)
+@take_rows.register(np.ndarray)
+def _take_rows_indexable(
+    df: Union[pl_DataFrame, pl_Series, pd.Index, np.ndarray], idxs: np.ndarray
+) -> Union[pl_DataFrame, pl_Series, pd.Index, np.ndarray]:
+    return df[idxs]
+
+# %% ../nbs/processing.ipynb 27
+@_backend_dispatch
 def filter_with_mask(
     df: Union[Series, DataFrame, pd.Index, np.ndarray],
-    mask: Union[np.ndarray, pd.Series, pl_Series],
+    mask: Union[np.ndarray, pd.Series, pl_Series],  # noqa: ARG001
 ) -> DataFrame:
-    if isinstance(df, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
-        out = df[mask]
-    else:
-        out = df.filter(mask)  # type: ignore
-    return out
+    raise _unsupported_type("filter_with_mask", df)
 
-# %% ../nbs/processing.ipynb 16
-def is_nan(s: Series) -> Series:
-    if isinstance(s, pd.Series):
-        out = s.isna()
-    else:
-        out = s.is_nan()
-    return out
 
-# %% ../nbs/processing.ipynb 18
-def is_none(s: Series) -> Series:
-    if isinstance(s, pd.Series):
-        out = is_nan(s)
-    else:
-        out = s.is_null()
-    return out
+@filter_with_mask.register(pd.DataFrame)
+@filter_with_mask.register(pd.Series)
+@filter_with_mask.register(pd.Index)
+@filter_with_mask.register(np.ndarray)
+def _filter_with_mask_indexable(
+    df: Union[pd.DataFrame, pd.Series, pd.Index, np.ndarray],
+    mask: Union[np.ndarray, pd.Series, pl_Series],
+) -> Union[pd.DataFrame, pd.Series, pd.Index, np.ndarray]:
+    return df[mask]
+
+
+@filter_with_mask.register(pl_DataFrame)
+@filter_with_mask.register(pl_LazyFrame)
+@filter_with_mask.register(pl_Series)
+def _filter_with_mask_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame, pl_Series],
+    mask: Union[np.ndarray, pd.Series, pl_Series, pl_Expr],
+) -> Union[pl_DataFrame, pl_LazyFrame, pl_Series]:
+    return df.filter(mask)  # type: ignore[arg-type]
+
 
-# %% ../nbs/processing.ipynb 20
+@filter_with_mask.register(pa_Table)
+@filter_with_mask.register(pa_ChunkedArray)
+def _filter_with_mask_arrow(
+    df: Union[pa_Table, pa_ChunkedArray],
+    mask: Union[np.ndarray, pd.Series, pa_ChunkedArray],
+) -> Union[pa_Table, pa_ChunkedArray]:
+    if isinstance(mask, pd.Series):
+        mask = mask.to_numpy()
+    return df.filter(mask)
+
+# %% ../nbs/processing.ipynb 28
+@_backend_dispatch
+def is_nan(s: Series) -> Series:  # noqa: ARG001
+    raise _unsupported_type("is_nan", s)
+
+
+@is_nan.register(pd.Series)
+def _is_nan_pandas(s: pd.Series) -> pd.Series:
+    return s.isna()
+
+
+@is_nan.register(pl_Series)
+def _is_nan_polars(s: pl_Series) -> pl_Series:
+    return s.is_nan()
+
+
+@is_nan.register(pa_ChunkedArray)
+def _is_nan_arrow(s: pa_ChunkedArray) -> pa_ChunkedArray:
+    return pc.is_nan(s)
+
+# %% ../nbs/processing.ipynb 30
+@_backend_dispatch
+def is_none(s: Series) -> Series:  # noqa: ARG001
+    raise _unsupported_type("is_none", s)
+
+
+@is_none.register(pd.Series)
+def _is_none_pandas(s: pd.Series) -> pd.Series:
+    return is_nan(s)
+
+
+@is_none.register(pl_Series)
+def _is_none_polars(s: pl_Series) -> pl_Series:
+    return s.is_null()
+
+
+@is_none.register(pa_ChunkedArray)
+def _is_none_arrow(s: pa_ChunkedArray) -> pa_ChunkedArray:
+    return pc.is_null(s)
+
+# %% ../nbs/processing.ipynb 32
+@_backend_dispatch
 def is_nan_or_none(s: Series) -> Series:
     return is_nan(s) | is_none(s)
 
-# %% ../nbs/processing.ipynb 22
+
+@is_nan_or_none.register(pa_ChunkedArray)
+def _is_nan_or_none_arrow(s: pa_ChunkedArray) -> pa_ChunkedArray:
+    return pc.is_null(s, nan_is_null=True)
+
+# %% ../nbs/processing.ipynb 34
 def match_if_categorical(
     s1: Union[Series, pd.Index], s2: Series
 ) -> Tuple[Series, Series]:
@@ -226,7 +720,100 @@ def match_if_categorical(
             s2 = s2.cast(pl.Utf8).cast(pl.Categorical)
     return s1, s2
 
-# %% ../nbs/processing.ipynb 23
+# %% ../nbs/processing.ipynb 35
+def _union_pd_categoricals(columns: List[pd.Series]) -> List[pd.Series]:
+    """Cast the columns to a categorical with the categories of all of them.
+
+    The categories of the first column are kept first and the missing ones are appended sorted.
+    """
+    categories = columns[0].cat.categories
+    others = [
+        (
+            s.cat.categories
+            if isinstance(s.dtype, pd.CategoricalDtype)
+            else pd.Index(s.unique())
+        )
+        for s in columns[1:]
+    ]
+    missing = (
+        pd.Index(np.hstack([cats.to_numpy() for cats in others]))
+        .unique()
+        .difference(categories)
+    )
+    if missing.empty:
+        dtype = columns[0].dtype
+    else:
+        dtype = pd.CategoricalDtype(
+            categories=categories.append(missing.astype(categories.dtype)),
+            ordered=columns[0].dtype.ordered,
+        )
+    out = [
+        (
+            columns[0].cat.set_categories(dtype.categories)
+            if not missing.empty
+            else columns[0]
+        )
+    ]
+    for s, cats in zip(columns[1:], others):
+        if s.dtype == dtype:
+            out.append(s)
+        elif isinstance(s.dtype, pd.CategoricalDtype):
+            # remap the codes instead of the values
+            mapping = dtype.categories.get_indexer(cats)
+            codes = s.cat.codes.to_numpy()
+            new_codes = np.where(codes < 0, -1, mapping[codes])
+            out.append(
+                pd.Series(
+                    pd.Categorical.from_codes(new_codes, dtype=dtype),
+                    index=s.index,
+                    name=s.name,
+                )
+            )
+        else:
+            out.append(s.astype(dtype))
+    return out
+
+
+def _union_pl_categoricals(columns: List[pl_Series]) -> List[pl_Series]:
+    """Cast the columns to categoricals that share their categories.
+
+    The categories of the first column are kept first and the missing ones are appended in the order they're found.
+    Categorical columns are remapped through their physical codes, so only their categories are compared as strings.
+    """
+    categories = columns[0].cat.get_categories()
+    others = [
+        (
+            s.cat.get_categories()
+            if s.dtype == pl.Categorical
+            else s.drop_nulls().unique().sort().cast(pl.Utf8)
+        )
+        for s in columns[1:]
+    ]
+    missing = pl.concat(others).unique(maintain_order=True)
+    missing = missing.filter(~missing.is_in(categories))
+    merged = pl.concat([categories, missing])
+    enum = pl.Enum(merged)
+    out = []
+    with pl.StringCache():
+        # populate cache, keep the merged order
+        merged.cast(pl.Categorical)
+        for s in columns:
+            if s.dtype == pl.Categorical:
+                uniques = s.drop_nulls().unique()
+                physical = uniques.to_physical().to_numpy()
+                mapping = np.zeros(
+                    physical.max() + 1 if physical.size else 0, dtype=np.uint32
+                )
+                mapping[physical] = (
+                    uniques.cast(pl.Utf8).cast(enum).to_physical().to_numpy()
+                )
+                s = pl_Series(s.name, mapping).gather(s.to_physical()).cast(enum)
+            else:
+                s = s.cast(pl.Utf8).cast(enum)
+            out.append(s.cast(pl.Categorical))
+    return out
+
+# %% ../nbs/processing.ipynb 36
 def vertical_concat(
     dfs: List[Union[DataFrame, Series]], match_categories: bool = True
 ) -> Union[DataFrame, Series]:
@@ -234,7 +821,8 @@ def vertical_concat(
         raise ValueError("Can't concatenate empty list.")
     if isinstance(dfs[0], pd.Series):
         out = pd.concat(dfs).reset_index(drop=True)
-    elif isinstance(dfs[0], pl_Series):
+    elif isinstance(dfs[0], (pl_Series, pl_LazyFrame)):
+        # the categories of lazy frames can't be matched without collecting them
         out = pl.concat(dfs)
     elif isinstance(dfs[0], pd.DataFrame):
         cat_cols = [
@@ -242,20 +830,12 @@ def vertical_concat(
             for c, dtype in dfs[0].dtypes.items()
             if isinstance(dtype, pd.CategoricalDtype)
         ]
-        if match_categories and cat_cols:
-            if len(dfs) > 2:
-                raise NotImplementedError(
-                    "Categorical replacement for more than two dataframes"
-                )
-            assert len(dfs) == 2
-            df1, df2 = dfs
-            df1 = df1.copy(deep=False)
-            df2 = df2.copy(deep=False)
+        if match_categories and cat_cols and len(dfs) > 1:
+            dfs = [df.copy(deep=False) for df in dfs]
             for col in cat_cols:
-                s1, s2 = match_if_categorical(df1[col], df2[col])
-                df1[col] = s1
-                df2[col] = s2
-            dfs = [df1, df2]
+                matched = _union_pd_categoricals([df[col] for df in dfs])
+                for df, s in zip(dfs, matched):
+                    df[col] = s
         out = pd.concat(dfs).reset_index(drop=True)
     else:
         all_cols = dfs[0].columns
@@ -264,34 +844,30 @@ def vertical_concat(
             for i, dtype in enumerate(dfs[0].dtypes)
             if dtype == pl.Categorical
         ]
-        if match_categories and cat_cols:
-            if len(dfs) > 2:
-                raise NotImplementedError(
-                    "Categorical replacement for more than two dataframes"
-                )
-            assert len(dfs) == 2
-            df1, df2 = dfs
-            for col in cat_cols:
-                s1, s2 = match_if_categorical(df1[col], df2[col])
-                df1 = df1.with_columns(s1)
-                df2 = df2.with_columns(s2)
-            dfs = [df1, df2]
+        if match_categories and cat_cols and len(dfs) > 1:
+            matched = {
+                col: _union_pl_categoricals([df[col] for df in dfs]) for col in cat_cols
+            }
+            dfs = [
+                df.with_columns([matched[col][i] for col in cat_cols])
+                for i, df in enumerate(dfs)
+            ]
         out = pl.concat(dfs)
     return out
 
-# %% ../nbs/processing.ipynb 27
+# %% ../nbs/processing.ipynb 44
 def horizontal_concat(dfs: List[DataFrame]) -> DataFrame:
     if not dfs:
         raise ValueError("Can't concatenate empty list.")
     if isinstance(dfs[0], pd.DataFrame):
         out = pd.concat(dfs, axis=1)
-    elif isinstance(dfs[0], pl_DataFrame):
+    elif isinstance(dfs[0], (pl_DataFrame, pl_LazyFrame)):
         out = pl.concat(dfs, how="horizontal")
     else:
         raise ValueError(f"Got list of unexpected types: {type(dfs[0])}.")
     return out
 
-# %% ../nbs/processing.ipynb 29
+# %% ../nbs/processing.ipynb 46
 def copy_if_pandas(df: DataFrame, deep: bool = False) -> DataFrame:
     if isinstance(df, pd.DataFrame):
         df = df.copy(deep=deep)
@@ -299,52 +875,408 @@ def copy_if_pandas(df: DataFrame, deep: bool = False) -> DataFrame:
             df = ensure_shallow_copy(df)
     return df
 
-# %% ../nbs/processing.ipynb 30
+# %% ../nbs/processing.ipynb 47
+class EncodedIds(NamedTuple):
+    df: DataFrame
+    uniques: Series
+
+
+def encode_ids(df: DataFrame, id_col: str = "unique_id") -> EncodedIds:
+    """Replace the ids with dense int32 codes
+
+    The codes follow the order of the sorted ids, so sorting, grouping and joining
+    by them gives the same results as with the original ids while using less memory.
+    The original ids can be restored with `decode_ids`.
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
+        Input dataframe with ids.
+    id_col : str (default='unique_id')
+        Column that identifies each serie.
+
+    Returns
+    -------
+    EncodedIds
+        Dataframe with the codes in `id_col` and the sorted unique ids, which map each code to its id.
+    """
+    null_ids_error = ValueError(f"The `{id_col}` column contains nulls.")
+    if isinstance(df, pl_LazyFrame):
+        # only the unique ids are collected, a null id shows up as one of them
+        uniques = df.select(pl.col(id_col).unique().sort()).collect()[id_col]
+        if uniques.null_count():
+            raise null_ids_error
+        codes = (pl.col(id_col).rank("dense") - 1).cast(pl.Int32)
+        return EncodedIds(df=df.with_columns(codes), uniques=uniques)
+    if np.asarray(is_none(df[id_col])).any():
+        raise null_ids_error
+    factorized = factorize_ids(df, id_col)
+    df = copy_if_pandas(df, deep=False)
+    df = assign_columns(df, id_col, factorized.codes.astype(np.int32))
+    return EncodedIds(df=df, uniques=factorized.uniques)
+
+
+def decode_ids(df: DataFrame, uniques: Series, id_col: str = "unique_id") -> DataFrame:
+    """Restore the ids that were encoded with `encode_ids`
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
+        Dataframe with codes in `id_col`.
+    uniques : pandas or polars Series or pyarrow ChunkedArray
+        Sorted unique ids returned by `encode_ids`.
+    id_col : str (default='unique_id')
+        Column that identifies each serie.
+
+    Returns
+    -------
+    pandas or polars DataFrame, polars LazyFrame or pyarrow Table
+        Dataframe with the original ids in `id_col`.
+    """
+    if isinstance(df, (pl_DataFrame, pl_LazyFrame)):
+        return df.with_columns(pl.lit(uniques).gather(pl.col(id_col)).alias(id_col))
+    codes = _column_to_numpy(df[id_col])
+    if isinstance(uniques, pd.Series):
+        ids = uniques.array.take(codes)
+    else:
+        ids = pc.take(uniques, codes)
+    df = copy_if_pandas(df, deep=False)
+    return assign_columns(df, id_col, ids)
+
+# %% ../nbs/processing.ipynb 51
+def _run_values(s: Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Values and lengths of the runs of equal consecutive values."""
+    if len(s) == 0:
+        return s.to_numpy(), np.array([], dtype=np.int64)
+    if isinstance(s, pd.Series):
+        values = s.to_numpy()
+        is_start = np.append(True, values[1:] != values[:-1])
+    else:
+        # consecutive nulls belong to the same run
+        is_null = s.is_null().to_numpy()
+        differs = (s[1:] != s[:-1]).fill_null(False).to_numpy()
+        is_start = np.append(True, differs | (is_null[1:] != is_null[:-1]))
+        values = s.to_numpy()
+    starts = np.flatnonzero(is_start)
+    return values[starts], np.diff(np.append(starts, values.size))
+
+
+def _join_key_codes(s1: Series, s2: Series) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Integer codes of a key column in both frames, equal for equal values.
+
+    Integers and timestamps are used as they are, other types are encoded by order of appearance.
+    Returns `None` if the types are different or there are nulls."""
+    if s1.dtype != s2.dtype:
+        return None
+    out = []
+    if _is_int_dtype(s1) or _is_dt_dtype(s1):
+        for s in (s1, s2):
+            if isinstance(s, pd.Series):
+                if s.hasnans:
+                    return None
+                if _is_dt_dtype(s):
+                    values = s.to_numpy(dtype="datetime64[ns]").view(np.int64)
+                else:
+                    values = s.to_numpy()
+            else:
+                if s.null_count():
+                    return None
+                values = s.to_physical().to_numpy()
+            out.append(values.astype(np.int64, copy=False))
+        return out[0], out[1]
+    if isinstance(s1.dtype, pd.CategoricalDtype):
+        # same categories
+        for s in (s1, s2):
+            assert isinstance(s, pd.Series)
+            codes = s.cat.codes.to_numpy()
+            if (codes < 0).any():
+                return None
+            out.append(codes.astype(np.int64))
+        return out[0], out[1]
+    if isinstance(s1, pl_Series) and s1.dtype == pl.Categorical:
+        s1 = s1.cast(pl.Utf8)
+        s2 = s2.cast(pl.Utf8)
+    # the runs are few when the frames are sorted
+    (values1, sizes1), (values2, sizes2) = _run_values(s1), _run_values(s2)
+    run_values = np.concatenate([values1, values2])
+    if pd.isna(run_values).any():
+        return None
+    run_codes, _ = pd.factorize(run_values)
+    codes1 = np.repeat(run_codes[: values1.size].astype(np.int64), sizes1)
+    codes2 = np.repeat(run_codes[values1.size :].astype(np.int64), sizes2)
+    return codes1, codes2
+
+
+@njit(nogil=True, cache=True)
+def _compare_keys(k1: np.ndarray, i: int, k2: np.ndarray, j: int) -> int:
+    for c in range(k1.shape[0]):
+        if k1[c, i] < k2[c, j]:
+            return -1
+        if k1[c, i] > k2[c, j]:
+            return 1
+    return 0
+
+
+@njit(nogil=True, cache=True)
+def _keys_are_sorted(keys: np.ndarray) -> bool:
+    for i in range(1, keys.shape[1]):
+        if _compare_keys(keys, i - 1, keys, i) > 0:
+            return False
+    return True
+
+
+@njit(nogil=True, cache=True)
+def _merge_sorted_keys(
+    k1: np.ndarray, k2: np.ndarray, keep_unmatched: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    n1 = k1.shape[1]
+    n2 = k2.shape[1]
+    # first pass counts the output rows, second one fills them
+    starts = np.empty(n1, dtype=np.int64)
+    stops = np.empty(n1, dtype=np.int64)
+    total = 0
+    j = 0
+    for i in range(n1):
+        while j < n2 and _compare_keys(k2, j, k1, i) < 0:
+            j += 1
+        stop = j
+        while stop < n2 and _compare_keys(k2, stop, k1, i) == 0:
+            stop += 1
+        starts[i] = j
+        stops[i] = stop
+        if stop > j:
+            total += stop - j
+        elif keep_unmatched:
+            total += 1
+    left_idxs = np.empty(total, dtype=np.int64)
+    right_idxs = np.empty(total, dtype=np.int64)
+    k = 0
+    for i in range(n1):
+        if stops[i] > starts[i]:
+            for j in range(starts[i], stops[i]):
+                left_idxs[k] = i
+                right_idxs[k] = j
+                k += 1
+        elif keep_unmatched:
+            left_idxs[k] = i
+            right_idxs[k] = -1
+            k += 1
+    return left_idxs, right_idxs
+
+
+def _hash_join_indices(
+    k1: np.ndarray, k2: np.ndarray, how: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    cols = list(range(k1.shape[0]))
+    left = pd.DataFrame(k1.T, columns=cols).assign(_left=np.arange(k1.shape[1]))
+    right = pd.DataFrame(k2.T, columns=cols).assign(_right=np.arange(k2.shape[1]))
+    merged = left.merge(right, on=cols, how=how)
+    right_idxs = merged["_right"].fillna(-1).to_numpy().astype(np.int64)
+    return merged["_left"].to_numpy().astype(np.int64), right_idxs
+
+# %% ../nbs/processing.ipynb 52
+def join_indices(
+    df1: DataFrame,
+    df2: DataFrame,
+    on: Union[str, List[str]],
+    how: str = "inner",
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Row positions of the matches between two dataframes
+
+    When both frames are sorted by the keys they're merged linearly,
+    otherwise the keys are hashed.
+
+    Parameters
+    ----------
+    df1 : pandas or polars DataFrame
+        Left dataframe.
+    df2 : pandas or polars DataFrame
+        Right dataframe.
+    on : str or list of str
+        Key columns.
+    how : str (default='inner')
+        'inner' or 'left'.
+
+    Returns
+    -------
+    tuple of numpy arrays or None
+        Positions in `df1` and in `df2` of each row of the joined frame, following the order of `df1`.
+        With `how='left'` the unmatched rows have -1 as their position in `df2`.
+        `None` if the keys have nulls or different types in each frame.
+    """
+    if how not in ("inner", "left"):
+        raise ValueError(f"`how` must be 'inner' or 'left', got '{how}'.")
+    if isinstance(on, str):
+        on = [on]
+    # one row per key column
+    k1 = np.empty((len(on), df1.shape[0]), dtype=np.int64)
+    k2 = np.empty((len(on), df2.shape[0]), dtype=np.int64)
+    for j, col in enumerate(on):
+        codes = _join_key_codes(df1[col], df2[col])
+        if codes is None:
+            return None
+        k1[j], k2[j] = codes
+    if NUMBA_INSTALLED and _keys_are_sorted(k1) and _keys_are_sorted(k2):
+        return _merge_sorted_keys(k1, k2, how == "left")
+    return _hash_join_indices(k1, k2, how)
+
+
+def _pd_values(s: pd.Series) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    if isinstance(s.dtype, np.dtype):
+        return s.to_numpy()
+    return s.array
+
+
+def _join_from_indices(
+    df1: DataFrame, df2: DataFrame, on: Union[str, List[str]], how: str
+) -> Optional[DataFrame]:
+    keys = [on] if isinstance(on, str) else on
+    right_cols = [c for c in df2.columns if c not in keys]
+    if any(c in df1.columns for c in right_cols):
+        # overlapping columns get suffixes, leave them to the regular join
+        return None
+    idxs = join_indices(df1, df2, keys, how)
+    if idxs is None:
+        return None
+    left_idxs, right_idxs = idxs
+    if left_idxs.size == df1.shape[0] and np.array_equal(
+        left_idxs, np.arange(df1.shape[0])
+    ):
+        left = df1
+    else:
+        left = take_rows(df1, left_idxs)
+    if isinstance(left, pd.DataFrame):
+        out = ensure_shallow_copy(left.copy(deep=False))
+        out.index = pd.RangeIndex(out.shape[0])
+        for c in right_cols:
+            out[c] = pd.api.extensions.take(
+                _pd_values(df2[c]), right_idxs, allow_fill=True
+            )
+        return out
+    gather_idxs = pl_Series(right_idxs)
+    if how == "left":
+        gather_idxs = pl.select(pl.when(gather_idxs >= 0).then(gather_idxs)).to_series()
+    return pl.concat(
+        [left, df2.select(pl.col(right_cols).gather(gather_idxs))], how="horizontal"
+    )
+
+# %% ../nbs/processing.ipynb 53
 def join(
     df1: Union[DataFrame, Series],
     df2: Union[DataFrame, Series],
     on: Union[str, List[str]],
     how: str = "inner",
+    sorted_keys: bool = False,
 ) -> DataFrame:
+    """Join two dataframes
+
+    With `sorted_keys=True` and `how` either 'inner' or 'left' the matching rows are found
+    with `join_indices` and only the columns of `df2` are gathered, which is fastest when both
+    frames are sorted by the keys."""
     if isinstance(df1, (pd.Series, pl_Series)):
         df1 = df1.to_frame()
     if isinstance(df2, (pd.Series, pl_Series)):
         df2 = df2.to_frame()
+    # the positions of the matches can only be found on collected frames
+    if sorted_keys and how in ("inner", "left") and not isinstance(df1, pl_LazyFrame):
+        out = _join_from_indices(df1, df2, on, how)
+        if out is not None:
+            return out
     if isinstance(df1, pd.DataFrame):
         out = df1.merge(df2, on=on, how=how)
     else:
         out = df1.join(df2, on=on, how=how)  # type: ignore
     return out
 
-# %% ../nbs/processing.ipynb 31
-def drop_index_if_pandas(df: DataFrame) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
+# %% ../nbs/processing.ipynb 56
+def drop_index_if_pandas(df: Union[DataFrame, Series]) -> Union[DataFrame, Series]:
+    if isinstance(df, (pd.DataFrame, pd.Series)):
         df = df.reset_index(drop=True)
     return df
 
-# %% ../nbs/processing.ipynb 32
-def rename(df: DataFrame, mapping: Dict[str, str]) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
-        df = df.rename(columns=mapping, copy=False)
-    else:
-        df = df.rename(mapping)
-    return df
+# %% ../nbs/processing.ipynb 57
+@_backend_dispatch
+def rename(df: DataFrame, mapping: Dict[str, str]) -> DataFrame:  # noqa: ARG001
+    raise _unsupported_type("rename", df)
+
+
+@rename.register(pd.DataFrame)
+def _rename_pandas(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+    return df.rename(columns=mapping, copy=False)
+
+
+@rename.register(pl_DataFrame)
+@rename.register(pl_LazyFrame)
+def _rename_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame], mapping: Dict[str, str]
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    return df.rename(mapping)
+
+
+@rename.register(pa_Table)
+def _rename_arrow(df: pa_Table, mapping: Dict[str, str]) -> pa_Table:
+    return df.rename_columns([mapping.get(c, c) for c in df.column_names])
+
+# %% ../nbs/processing.ipynb 58
+@_backend_dispatch
+def sort(
+    df: DataFrame, by: Optional[Union[str, List[str]]] = None  # noqa: ARG001
+) -> DataFrame:
+    raise _unsupported_type("sort", df)
+
+
+@sort.register(pd.DataFrame)
+def _sort_pandas_frame(
+    df: pd.DataFrame, by: Optional[Union[str, List[str]]] = None
+) -> pd.DataFrame:
+    return df.sort_values(by).reset_index(drop=True)
+
+
+@sort.register(pd.Series)
+@sort.register(pd.Index)
+def _sort_pandas_1d(
+    df: Union[pd.Series, pd.Index],
+    by: Optional[Union[str, List[str]]] = None,  # noqa: ARG001
+) -> Union[pd.Series, pd.Index]:
+    out = df.sort_values()
+    if isinstance(out, pd.Series):
+        out = out.reset_index(drop=True)
+    return out
+
+
+@sort.register(pl_DataFrame)
+@sort.register(pl_LazyFrame)
+def _sort_polars_frame(
+    df: Union[pl_DataFrame, pl_LazyFrame], by: Optional[Union[str, List[str]]] = None
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    return df.sort(by)
+
+
+@sort.register(pl_Series)
+def _sort_polars_series(
+    df: pl_Series,
+    by: Optional[Union[str, List[str]]] = None,  # noqa: ARG001
+) -> pl_Series:
+    return df.sort()
+
+
+@sort.register(pa_Table)
+def _sort_arrow_table(
+    df: pa_Table, by: Optional[Union[str, List[str]]] = None
+) -> pa_Table:
+    if isinstance(by, str):
+        by = [by]
+    return df.sort_by([(col, "ascending") for col in by or []])
 
-# %% ../nbs/processing.ipynb 33
-def sort(df: DataFrame, by: Optional[Union[str, List[str]]] = None) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
-        out = df.sort_values(by).reset_index(drop=True)
-    elif isinstance(df, (pd.Series, pd.Index)):
-        out = df.sort_values()
-        if isinstance(out, pd.Series):
-            out = out.reset_index(drop=True)
-    elif isinstance(df, pl_DataFrame):
-        out = df.sort(by)
-    else:
-        out = df.sort()
-    return out
 
-# %% ../nbs/processing.ipynb 36
+@sort.register(pa_ChunkedArray)
+def _sort_arrow_array(
+    df: pa_ChunkedArray,
+    by: Optional[Union[str, List[str]]] = None,  # noqa: ARG001
+) -> pa_ChunkedArray:
+    return df.take(pc.array_sort_indices(df))
+
+# %% ../nbs/processing.ipynb 61
 def _multiply_pl_freq(freq: str, n: Union[int, Series]) -> str:
     freq_n, freq_offset = re.findall(r"(\d+)(\w+)", freq)[0]
     freq_n = int(freq_n)
@@ -361,7 +1293,7 @@ def _multiply_pl_freq(freq: str, n: Union[int, Series]) -> str:
         out = (n * freq_n).cast(pl.Utf8) + freq_offset
     return out
 
-# %% ../nbs/processing.ipynb 38
+# %% ../nbs/processing.ipynb 63
 def _ensure_month_ends(
     times: pl_Series, orig_times: pl_Series, freq: Union[str, int, BaseOffset]
 ) -> pl_Series:
@@ -373,7 +1305,192 @@ def _ensure_month_ends(
         times = times.dt.month_end()
     return times
 
-# %% ../nbs/processing.ipynb 39
+# %% ../nbs/processing.ipynb 64
+def _units_per_day(dtype: np.dtype) -> int:
+    unit, count = np.datetime_data(dtype)
+    return int(np.timedelta64(1, "D") // np.timedelta64(count, unit))
+
+
+def _map_int_values(values: np.ndarray, fn) -> np.ndarray:
+    """Apply `fn` to `values` through a lookup table when they span a short range."""
+    if values.size == 0:
+        return fn(values)
+    lo = values.min()
+    span = values.max() - lo + 1
+    if span >= values.size:
+        return fn(values)
+    return fn(np.arange(lo, lo + span))[values - lo]
+
+
+def _day_months(days: np.ndarray) -> np.ndarray:
+    """Months since epoch of each day, given as days since epoch."""
+    return _map_int_values(
+        days,
+        lambda x: x.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64),
+    )
+
+
+def _month_starts(months: np.ndarray) -> np.ndarray:
+    """Days since epoch of the first day of each month, given as months since epoch."""
+    return _map_int_values(
+        months,
+        lambda x: x.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64),
+    )
+
+
+def _shift_months(
+    days: np.ndarray,
+    k: np.ndarray,
+    months_per_step: int,
+    anchor: int,
+    day_opt: str,
+) -> np.ndarray:
+    """Move `days` (since epoch) by `k` anchored months, quarters or years.
+
+    With `day_opt` equal to 'start' or 'end' this follows pandas' rules for
+    onOffset dates (roll to the anchor first). With 'clamp' the day of the
+    month is kept, limited to the last day of the new month."""
+    months = _day_months(days)
+    month_starts = _month_starts(months)
+    day = days - month_starts + 1
+    if day_opt == "clamp":
+        new_months = months + months_per_step * k
+        new_starts = _month_starts(new_months)
+        days_in_month = _month_starts(new_months + 1) - new_starts
+        return new_starts + np.minimum(day, days_in_month) - 1
+    if day_opt == "start":
+        compare_day: Union[int, np.ndarray] = 1
+    else:
+        compare_day = _month_starts(months + 1) - month_starts
+    months_since = (months % 12 + 1 - anchor) % months_per_step
+    roll_forward = (k <= 0) & ((months_since != 0) | (day > compare_day))
+    roll_back = (k > 0) & (months_since == 0) & (day < compare_day)
+    k = k + roll_forward - roll_back
+    new_months = months + months_per_step * k - months_since
+    if day_opt == "start":
+        return _month_starts(new_months)
+    return _month_starts(new_months + 1) - 1
+
+
+def _shift_weeks(days: np.ndarray, k: np.ndarray, weekday: Optional[int]) -> np.ndarray:
+    if weekday is None:
+        return days + 7 * k
+    # 1970-01-01 was a thursday
+    roll = (weekday - (days + 3)) % 7
+    k = k - ((roll != 0) & (k > 0))
+    return days + roll + 7 * k
+
+
+def _shift_bdays(days: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """Business days, with the same rules as pandas' BusinessDay."""
+    weekday = (days + 3) % 7
+    weeks = k // 5
+    on_weekend = weekday > 4
+    nadj = k + ((k <= 0) & on_weekend) - 5 * weeks
+    shift = np.where(
+        on_weekend,
+        np.where(nadj == 0, 4 - weekday, 7 - weekday + nadj - 1),
+        np.where(weekday + nadj <= 4, nadj, nadj + 2),
+    )
+    return days + 7 * weeks + shift
+
+
+def _offset_dt64(
+    times: np.ndarray, freq: BaseOffset, n: Union[int, np.ndarray]
+) -> Optional[np.ndarray]:
+    """Vectorized `times + n * freq` for datetime64 arrays.
+
+    Returns `None` if the offset isn't supported."""
+    n = np.asarray(n)
+    if freq.normalize or n.dtype.kind not in "iu" or np.isnat(times).any():
+        return None
+    units_per_day = _units_per_day(times.dtype)
+    if units_per_day < 1:
+        return None
+    values = times.view(np.int64)
+    k = n.astype(np.int64) * freq.n
+    freq_type = type(freq)
+    if isinstance(freq, pd.offsets.Tick):
+        unit_nanos = np.timedelta64(1, "D") // np.timedelta64(1, "ns") // units_per_day
+        # nanos already accounts for freq.n
+        step, remainder = divmod(freq.nanos, unit_nanos)
+        if remainder:
+            return None
+        return (values + n.astype(np.int64) * step).view(times.dtype)
+    days, time_of_day = np.divmod(values, units_per_day)
+    if freq_type is pd.offsets.Week:
+        new_days = _shift_weeks(days, k, freq.weekday)
+    elif freq_type is pd.offsets.BusinessDay and not freq.offset:
+        new_days = _shift_bdays(days, k)
+    elif freq_type is pd.offsets.MonthBegin:
+        new_days = _shift_months(days, k, 1, 1, "start")
+    elif freq_type is pd.offsets.MonthEnd:
+        new_days = _shift_months(days, k, 1, 1, "end")
+    elif freq_type is pd.offsets.QuarterBegin:
+        new_days = _shift_months(days, k, 3, freq.startingMonth, "start")
+    elif freq_type is pd.offsets.QuarterEnd:
+        new_days = _shift_months(days, k, 3, freq.startingMonth, "end")
+    elif freq_type is pd.offsets.YearBegin:
+        new_days = _shift_months(days, k, 12, freq.month, "start")
+    elif freq_type is pd.offsets.YearEnd:
+        new_days = _shift_months(days, k, 12, freq.month, "end")
+    else:
+        return None
+    return (new_days * units_per_day + time_of_day).view(times.dtype)
+
+
+_PL_DURATION_UNITS = {
+    "ns": np.timedelta64(1, "ns"),
+    "us": np.timedelta64(1, "us"),
+    "ms": np.timedelta64(1, "ms"),
+    "s": np.timedelta64(1, "s"),
+    "m": np.timedelta64(1, "m"),
+    "h": np.timedelta64(1, "h"),
+    "d": np.timedelta64(1, "D"),
+    "w": np.timedelta64(7, "D"),
+}
+_PL_CALENDAR_UNITS = {"mo": 1, "q": 3, "y": 12}
+
+
+def _offset_pl_times(
+    times: pl_Series, freq: str, n: Union[np.ndarray, pl_Series]
+) -> Optional[pl_Series]:
+    """Offset polars dates or datetimes by a different multiple of `freq` per row.
+
+    Returns `None` if the frequency or the data type isn't supported."""
+    match = re.fullmatch(r"(\d+)([a-z]+)", freq)
+    n = np.asarray(n)
+    if match is None or n.dtype.kind not in "iu" or times.null_count() > 0:
+        return None
+    if times.dtype == pl.Date:
+        units_per_day = 1
+        unit = np.timedelta64(1, "D")
+    elif isinstance(times.dtype, pl.Datetime) and times.dtype.time_zone is None:
+        unit = np.timedelta64(1, times.dtype.time_unit)
+        units_per_day = int(np.timedelta64(1, "D") // unit)
+    else:
+        return None
+    freq_n, freq_unit = int(match.group(1)), match.group(2)
+    k = n.astype(np.int64) * freq_n
+    values = times.to_physical().to_numpy().astype(np.int64)
+    if freq_unit in _PL_DURATION_UNITS:
+        step, remainder = divmod(_PL_DURATION_UNITS[freq_unit], unit)
+        if remainder:
+            return None
+        new_values = values + k * int(step)
+    elif freq_unit in _PL_CALENDAR_UNITS:
+        days, time_of_day = np.divmod(values, units_per_day)
+        new_days = _shift_months(days, k, _PL_CALENDAR_UNITS[freq_unit], 1, "clamp")
+        new_values = new_days * units_per_day + time_of_day
+    else:
+        return None
+    return (
+        pl_Series(times.name, new_values)
+        .cast(times.to_physical().dtype)
+        .cast(times.dtype)
+    )
+
+# %% ../nbs/processing.ipynb 65
 def offset_times(
     times: Union[Series, pd.Index],
     freq: Union[int, str, BaseOffset],
@@ -389,12 +1506,29 @@ def offset_times(
                 f"Cannot offset times with data type: '{times.dtype}' "
                 f"using a frequency of type: '{type(freq)}'."
             )
-        out = times + n * freq
+        shifted = None
+        # pandas already vectorizes the anchored offsets when n is a scalar
+        use_engine = np.ndim(n) > 0 or isinstance(
+            freq, (pd.offsets.Tick, pd.offsets.BusinessDay)
+        )
+        if dts and use_engine and isinstance(times.dtype, np.dtype):
+            # tz-naive numpy datetimes
+            shifted = _offset_dt64(times.to_numpy(), freq, n)
+        if shifted is None:
+            out = times + n * freq
+        elif isinstance(times, pd.Series):
+            out = pd.Series(shifted, index=times.index, name=times.name)
+        else:
+            out = pd.Index(shifted, name=times.name)
     elif isinstance(times, pl_Series) and isinstance(freq, int):
         out = times + n * freq
     elif isinstance(times, pl_Series) and isinstance(freq, str):
-        total_offset = _multiply_pl_freq(freq, n)
-        out = times.dt.offset_by(total_offset)
+        out = None
+        if not isinstance(n, int):
+            out = _offset_pl_times(times, freq, n)
+        if out is None:
+            total_offset = _multiply_pl_freq(freq, n)
+            out = times.dt.offset_by(total_offset)
         out = _ensure_month_ends(out, times, freq)
     else:
         raise ValueError(
@@ -403,7 +1537,7 @@ def offset_times(
         )
     return out
 
-# %% ../nbs/processing.ipynb 42
+# %% ../nbs/processing.ipynb 70
 def offset_dates(
     dates: Union[Series, pd.Index],
     freq: Union[int, str, BaseOffset],
@@ -414,7 +1548,40 @@ def offset_dates(
     )
     return offset_times(dates, freq, n)
 
-# %% ../nbs/processing.ipynb 43
+# %% ../nbs/processing.ipynb 71
+def _datetime_ranges(
+    starts: pd.Index, freq: BaseOffset, periods: int
+) -> pd.DatetimeIndex:
+    """`periods` timestamps for each start, laid out by serie."""
+    # pyarrow timestamps don't work with offsets yet
+    dt_starts = pd.DatetimeIndex(starts)
+    tz = dt_starts.tz
+    is_tick = isinstance(freq, pd.offsets.Tick)
+    if tz is None:
+        local_starts = dt_starts
+    elif is_tick:
+        # ticks are absolute durations
+        local_starts = dt_starts.tz_convert("UTC").tz_localize(None)
+    else:
+        # calendar offsets are applied on the wall time
+        local_starts = dt_starts.tz_localize(None)
+    # series usually share their start, so we build the grid once per distinct start
+    uniques, inverse = np.unique(local_starts.to_numpy(), return_inverse=True)
+    grid = _offset_dt64(
+        np.repeat(uniques, periods), freq, np.tile(np.arange(periods), uniques.size)
+    )
+    if grid is None:
+        unique_starts = pd.DatetimeIndex(uniques)
+        grid = np.stack(
+            [(unique_starts + i * freq).to_numpy() for i in range(periods)], axis=1
+        )
+    grid = grid.reshape(uniques.size, periods)
+    out = pd.DatetimeIndex(grid[inverse].ravel())
+    if tz is not None:
+        out = out.tz_localize("UTC").tz_convert(tz) if is_tick else out.tz_localize(tz)
+    return out
+
+# %% ../nbs/processing.ipynb 72
 def time_ranges(
     starts: Union[Series, pd.Index],
     freq: Union[int, str, BaseOffset],
@@ -425,22 +1592,14 @@ def time_ranges(
     if isinstance(starts, pd.Index):
         if _is_int_dtype(starts):
             starts_np = starts.to_numpy(copy=False)  # may be pyarrow
-            out = np.hstack(
-                [
-                    np.arange(
-                        start, start + freq * periods, freq, dtype=starts_np.dtype
-                    )
-                    for start in starts_np
-                ]
+            steps = np.arange(0, freq * periods, freq)
+            out = (
+                (starts_np[:, None] + steps).ravel().astype(starts_np.dtype, copy=False)
             )
         elif _is_dt_dtype(starts):
             if isinstance(freq, str):
                 freq = pd.tseries.frequencies.to_offset(freq)
-            out = []
-            for i in range(periods):
-                out.append([starts + i * freq])
-            # pyarrow timestamps don't seem to work with offsets yet, keeping np.vstack
-            out = np.vstack(out).ravel(order="F")
+            out = _datetime_ranges(starts, freq, periods)
         else:
             raise ValueError(
                 f"`starts` must be integers or timestamps, got '{starts.dtype}'."
@@ -465,7 +1624,7 @@ def time_ranges(
         out = out.alias(starts.name)
     return out
 
-# %% ../nbs/processing.ipynb 46
+# %% ../nbs/processing.ipynb 77
 def repeat(
     s: Union[Series, pd.Index, np.ndarray], n: Union[int, np.ndarray, Series]
 ) -> Union[Series, pd.Index, np.ndarray]:
@@ -484,7 +1643,7 @@ def repeat(
             out = out.reset_index(drop=True)
     return out
 
-# %% ../nbs/processing.ipynb 49
+# %% ../nbs/processing.ipynb 80
 def cv_times(
     times: np.ndarray,
     uids: Union[Series, pd.Index],
@@ -494,7 +1653,11 @@ def cv_times(
     step_size: int,
     id_col: str = "unique_id",
     time_col: str = "ds",
+    return_codes: bool = False,
 ) -> DataFrame:
+    """Times and cutoffs of every cross validation window.
+
+    If `return_codes=True` the id column holds the position of each serie in `uids`."""
     if test_size < h:
         raise ValueError("`test_size` should be greater or equal to `h`.")
     n, resid = divmod(test_size - h, step_size)
@@ -506,100 +1669,207 @@ def cv_times(
     else:
         df_constructor = pd.DataFrame
     sizes = np.diff(indptr)
-    out_times = []
-    out_cutoffs = []
-    out_ids = []
-    for i in range(n_windows):
-        offset = test_size - i * step_size + 1
-        use_series = sizes >= offset
-        cutoff_idxs = indptr[1:][use_series] - offset
-        valid_idxs = np.repeat(cutoff_idxs + 1, h) + np.tile(
-            np.arange(h), cutoff_idxs.size
-        )
-        out_times.append(times[valid_idxs])
-        out_cutoffs.append(np.repeat(times[cutoff_idxs], h))
-        if isinstance(uids, pl_Series):
-            use_series = pl_Series(use_series)
-        out_ids.append(repeat(filter_with_mask(uids, use_series), h))
+    # all (window, serie) pairs at once, ordered by window and then by serie
+    offsets = test_size - step_size * np.arange(n_windows) + 1
+    window_idxs, serie_idxs = np.nonzero(sizes >= offsets[:, None])
+    cutoff_idxs = indptr[1:][serie_idxs] - offsets[window_idxs]
+    valid_idxs = (cutoff_idxs[:, None] + np.arange(1, h + 1)).ravel()
+    serie_idxs = np.repeat(serie_idxs, h)
+    if return_codes:
+        out_ids = serie_idxs
+    else:
+        out_ids = drop_index_if_pandas(take_rows(uids, serie_idxs))
     return df_constructor(
         {
-            id_col: vertical_concat(out_ids),
-            time_col: np.hstack(out_times),
-            "cutoff": np.hstack(out_cutoffs),
+            id_col: out_ids,
+            time_col: times[valid_idxs],
+            "cutoff": np.repeat(times[cutoff_idxs], h),
         }
     )
 
-# %% ../nbs/processing.ipynb 51
-def group_by(df: Union[Series, DataFrame], by, maintain_order=False):
-    if isinstance(df, (pd.Series, pd.DataFrame)):
-        out = df.groupby(by, observed=True, sort=not maintain_order)
-    else:
-        if isinstance(df, pl_Series):
-            df = df.to_frame()
-        try:
-            out = df.group_by(by, maintain_order=maintain_order)
-        except AttributeError:
-            out = df.groupby(by, maintain_order=maintain_order)
-    return out
+# %% ../nbs/processing.ipynb 85
+@_backend_dispatch
+def group_by(df: Union[Series, DataFrame], by, maintain_order=False):  # noqa: ARG001
+    raise _unsupported_type("group_by", df)
 
-# %% ../nbs/processing.ipynb 52
-def group_by_agg(df: DataFrame, by, aggs, maintain_order=False) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
-        out = group_by(df, by, maintain_order).agg(aggs).reset_index()
-    else:
-        out = group_by(df, by, maintain_order).agg(
-            *[getattr(pl.col(c), agg)() for c, agg in aggs.items()]
-        )
-    return out
 
-# %% ../nbs/processing.ipynb 55
-def is_in(s: Series, collection) -> Series:
-    if isinstance(s, pl_Series):
-        out = s.is_in(collection)
-    else:
-        out = s.isin(collection)
-    return out
+@group_by.register(pd.DataFrame)
+@group_by.register(pd.Series)
+def _group_by_pandas(df: Union[pd.DataFrame, pd.Series], by, maintain_order=False):
+    return df.groupby(by, observed=True, sort=not maintain_order)
 
-# %% ../nbs/processing.ipynb 58
-def between(s: Series, lower: Series, upper: Series) -> Series:
-    if isinstance(s, pd.Series):
-        out = s.between(lower, upper)
-    else:
-        out = s.is_between(lower, upper)
+
+@group_by.register(pl_DataFrame)
+@group_by.register(pl_LazyFrame)
+@group_by.register(pl_Series)
+def _group_by_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame, pl_Series], by, maintain_order=False
+):
+    if isinstance(df, pl_Series):
+        df = df.to_frame()
+    try:
+        out = df.group_by(by, maintain_order=maintain_order)
+    except AttributeError:
+        out = df.groupby(by, maintain_order=maintain_order)
     return out
 
-# %% ../nbs/processing.ipynb 61
-def fill_null(df: DataFrame, mapping: Dict[str, Any]) -> DataFrame:
-    if isinstance(df, pd.DataFrame):
-        out = df.fillna(mapping)
-    else:
-        out = df.with_columns(*[pl.col(col).fill_null(v) for col, v in mapping.items()])
+# %% ../nbs/processing.ipynb 86
+@_backend_dispatch
+def group_by_agg(
+    df: DataFrame, by, aggs, maintain_order=False  # noqa: ARG001
+) -> DataFrame:
+    raise _unsupported_type("group_by_agg", df)
+
+
+@group_by_agg.register(pd.DataFrame)
+def _group_by_agg_pandas(
+    df: pd.DataFrame, by, aggs, maintain_order=False
+) -> pd.DataFrame:
+    return group_by(df, by, maintain_order).agg(aggs).reset_index()
+
+
+@group_by_agg.register(pl_DataFrame)
+@group_by_agg.register(pl_LazyFrame)
+def _group_by_agg_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame], by, aggs, maintain_order=False
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    return group_by(df, by, maintain_order).agg(
+        *[getattr(pl.col(c), agg)() for c, agg in aggs.items()]
+    )
+
+
+@group_by_agg.register(pa_Table)
+def _group_by_agg_arrow(df: pa_Table, by, aggs, maintain_order=False) -> pa_Table:
+    if isinstance(by, str):
+        by = [by]
+    # a single thread keeps the groups in order of appearance
+    out = df.group_by(by, use_threads=not maintain_order).aggregate(list(aggs.items()))
+    names = {f"{c}_{agg}": c for c, agg in aggs.items()}
+    out = out.rename_columns([names.get(c, c) for c in out.column_names])
+    out = out.select([*by, *aggs])
+    if not maintain_order:
+        out = sort(out, by)
     return out
 
-# %% ../nbs/processing.ipynb 64
-def cast(s: Series, dtype: type) -> Series:
-    if isinstance(s, pd.Series):
-        s = s.astype(dtype)
-    else:
-        s = s.cast(dtype)
-    return s
+# %% ../nbs/processing.ipynb 89
+@_backend_dispatch
+def is_in(s: Series, collection) -> Series:  # noqa: ARG001
+    raise _unsupported_type("is_in", s)
+
+
+@is_in.register(pd.Series)
+@is_in.register(pd.Index)
+def _is_in_pandas(
+    s: Union[pd.Series, pd.Index], collection
+) -> Union[pd.Series, np.ndarray]:
+    return s.isin(collection)
+
+
+@is_in.register(pl_Series)
+def _is_in_polars(s: pl_Series, collection) -> pl_Series:
+    return s.is_in(collection)
 
-# %% ../nbs/processing.ipynb 67
+
+@is_in.register(pa_ChunkedArray)
+def _is_in_arrow(s: pa_ChunkedArray, collection) -> pa_ChunkedArray:
+    if isinstance(collection, pa_ChunkedArray):
+        collection = collection.combine_chunks()
+    return pc.is_in(s, value_set=pa.array(collection))
+
+# %% ../nbs/processing.ipynb 92
+@_backend_dispatch
+def between(s: Series, lower: Series, upper: Series) -> Series:  # noqa: ARG001
+    raise _unsupported_type("between", s)
+
+
+@between.register(pd.Series)
+def _between_pandas(s: pd.Series, lower: Series, upper: Series) -> pd.Series:
+    return s.between(lower, upper)
+
+
+@between.register(pl_Series)
+def _between_polars(s: pl_Series, lower: Series, upper: Series) -> pl_Series:
+    return s.is_between(lower, upper)
+
+
+@between.register(pa_ChunkedArray)
+def _between_arrow(s: pa_ChunkedArray, lower: Series, upper: Series) -> pa_ChunkedArray:
+    return pc.and_(pc.greater_equal(s, lower), pc.less_equal(s, upper))
+
+# %% ../nbs/processing.ipynb 95
+@_backend_dispatch
+def fill_null(df: DataFrame, mapping: Dict[str, Any]) -> DataFrame:  # noqa: ARG001
+    raise _unsupported_type("fill_null", df)
+
+
+@fill_null.register(pd.DataFrame)
+def _fill_null_pandas(df: pd.DataFrame, mapping: Dict[str, Any]) -> pd.DataFrame:
+    return df.fillna(mapping)
+
+
+@fill_null.register(pl_DataFrame)
+@fill_null.register(pl_LazyFrame)
+def _fill_null_polars(
+    df: Union[pl_DataFrame, pl_LazyFrame], mapping: Dict[str, Any]
+) -> Union[pl_DataFrame, pl_LazyFrame]:
+    return df.with_columns(*[pl.col(col).fill_null(v) for col, v in mapping.items()])
+
+
+@fill_null.register(pa_Table)
+def _fill_null_arrow(df: pa_Table, mapping: Dict[str, Any]) -> pa_Table:
+    for col, v in mapping.items():
+        df = df.set_column(df.column_names.index(col), col, pc.fill_null(df[col], v))
+    return df
+
+# %% ../nbs/processing.ipynb 98
+@_backend_dispatch
+def cast(s: Series, dtype: type) -> Series:  # noqa: ARG001
+    raise _unsupported_type("cast", s)
+
+
+@cast.register(pd.Series)
+def _cast_pandas(s: pd.Series, dtype: type) -> pd.Series:
+    return s.astype(dtype)
+
+
+@cast.register(pl_Series)
+def _cast_polars(s: pl_Series, dtype: type) -> pl_Series:
+    return s.cast(dtype)
+
+
+@cast.register(pa_ChunkedArray)
+def _cast_arrow(s: pa_ChunkedArray, dtype: type) -> pa_ChunkedArray:
+    if not isinstance(dtype, pa.DataType):
+        dtype = pa.from_numpy_dtype(np.dtype(dtype))
+    return s.cast(dtype)
+
+# %% ../nbs/processing.ipynb 101
 def value_cols_to_numpy(
-    df: DataFrame, id_col: str, time_col: str, target_col: Optional[str]
+    df: DataFrame,
+    id_col: str,
+    time_col: str,
+    target_col: Optional[str],
+    dtype: Optional[np.dtype] = None,
+    order: Optional[Literal["C", "F"]] = None,
 ) -> np.ndarray:
     exclude_cols = [id_col, time_col]
     if target_col is not None:
         exclude_cols.append(target_col)
-    value_cols = [col for col in df.columns if col not in exclude_cols]
+    value_cols = [col for col in _column_names(df) if col not in exclude_cols]
     if target_col is not None:
         value_cols = [target_col, *value_cols]
-    data = to_numpy(df[value_cols])
+    if dtype is not None:
+        # selecting the columns from a pandas frame would make a copy
+        return _stack_columns(df, value_cols, dtype, order)
+    if isinstance(df, pa_Table):
+        data = to_numpy(df.select(value_cols), order=order)
+    else:
+        data = to_numpy(df[value_cols], order=order)
     if data.dtype not in (np.float32, np.float64):
         data = data.astype(np.float32)
     return data
 
-# %% ../nbs/processing.ipynb 68
+# %% ../nbs/processing.ipynb 103
 def make_future_dataframe(
     uids: Series,
     last_times: Union[Series, pd.Index],
@@ -620,13 +1890,37 @@ def make_future_dataframe(
         }
     )
 
-# %% ../nbs/processing.ipynb 71
+# %% ../nbs/processing.ipynb 106
+def _pd_key_codes(
+    df1: pd.DataFrame, df2: pd.DataFrame, on: List[str]
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Encode the keys of both frames as dense integers that are equal for equal keys."""
+    n1 = df1.shape[0]
+    codes = np.zeros(n1 + df2.shape[0], dtype=np.int64)
+    n_codes = 1
+    for col in on:
+        values = pd.concat([df1[col], df2[col]], ignore_index=True)
+        col_codes, col_uniques = pd.factorize(values)
+        # missing values get their own code, pd.factorize can only do this since pandas 1.5
+        n_col_codes = len(col_uniques) + 1
+        col_codes = np.where(col_codes < 0, len(col_uniques), col_codes)
+        # re-encode after each column so that the codes stay dense
+        codes, key_uniques = pd.factorize(codes * n_col_codes + col_codes)
+        n_codes = len(key_uniques)
+    return codes[:n1], codes[n1:], n_codes
+
+# %% ../nbs/processing.ipynb 107
 def anti_join(df1: DataFrame, df2: DataFrame, on: Union[str, List[str]]) -> DataFrame:
     if isinstance(df1, pd.DataFrame) and isinstance(df2, pd.DataFrame):
-        out = df1.merge(df2, on=on, how="left", indicator=True)
-        out = out[out["_merge"] == "left_only"].drop(columns="_merge")
-        out = out.reset_index(drop=True)
-    elif isinstance(df1, pl_DataFrame) and isinstance(df2, pl_DataFrame):
+        if isinstance(on, str):
+            on = [on]
+        codes1, codes2, n_codes = _pd_key_codes(df1, df2, on)
+        in_df2 = np.zeros(n_codes, dtype=bool)
+        in_df2[codes2] = True
+        out = df1[~in_df2[codes1]].reset_index(drop=True)
+    elif (isinstance(df1, pl_DataFrame) and isinstance(df2, pl_DataFrame)) or (
+        isinstance(df1, pl_LazyFrame) and isinstance(df2, pl_LazyFrame)
+    ):
         out = join(df1, df2, on=on, how="anti")
     else:
         raise ValueError(
@@ -635,14 +1929,149 @@ def anti_join(df1: DataFrame, df2: DataFrame, on: Union[str, List[str]]) -> Data
         )
     return out
 
-# %% ../nbs/processing.ipynb 74
+# %% ../nbs/processing.ipynb 111
 def ensure_sorted(df: DataFrame, id_col: str, time_col: str) -> DataFrame:
+    if isinstance(df, pl_LazyFrame):
+        return sort(df, by=[id_col, time_col])
     sort_idxs = maybe_compute_sort_indices(df=df, id_col=id_col, time_col=time_col)
     if sort_idxs is not None:
         df = take_rows(df=df, idxs=sort_idxs)
-    return df
+    return _mark_sorted(df, id_col)
+
+# %% ../nbs/processing.ipynb 112
+class SeriesIndex:
+    """Grouping of a dataframe by serie that can be computed once and reused.
+
+    Parameters
+    ----------
+    uids : pandas or polars Series
+        Sorted unique ids.
+    indptr : numpy ndarray
+        1d array with indices to the start and end of each serie in the sorted data.
+    sort_idxs : numpy ndarray, optional
+        Indices that would sort the original data. `None` if it's already sorted.
+    first_times : pandas or polars Series
+        First time of each serie.
+    last_times : pandas or polars Series
+        Last time of each serie.
+    id_codes : numpy ndarray, optional (default=None)
+        Position of the id of each row of the original data in `uids`.
+    id_col : str, optional (default=None)
+        Column that identifies each serie. Used to validate the dataframes passed to `check_df`.
+    """
+
+    def __init__(
+        self,
+        uids: Series,
+        indptr: np.ndarray,
+        sort_idxs: Optional[np.ndarray],
+        first_times: Series,
+        last_times: Series,
+        id_codes: Optional[np.ndarray] = None,
+        id_col: Optional[str] = None,
+    ):
+        self.uids = uids
+        self.indptr = indptr
+        self.sort_idxs = sort_idxs
+        self.first_times = first_times
+        self.last_times = last_times
+        self.id_codes = id_codes
+        self.id_col = id_col
+        self._uid2pos: Optional[Dict[Any, int]] = None
+
+    @classmethod
+    def from_df(
+        cls,
+        df: DataFrame,
+        id_col: str = "unique_id",
+        time_col: str = "ds",
+        assume_sorted: bool = False,
+    ) -> "SeriesIndex":
+        """Group `df` by serie. Set `assume_sorted=True` to skip checking if it's sorted by id and time,
+        e.g. for the output of `ensure_sorted`. The results are wrong if it isn't."""
+        if isinstance(df, pl_LazyFrame):
+            raise ValueError(
+                "Grouping the series requires the data, please `collect` the LazyFrame first."
+            )
+        factorized = factorize_ids(df, id_col)
+        uids = factorized.uniques
+        indptr = _indptr_from_sizes(factorized.counts)
+        first_idxs = indptr[:-1]
+        last_idxs = indptr[1:] - 1
+        if assume_sorted:
+            sort_idxs = None
+        else:
+            sort_idxs = maybe_compute_sort_indices(
+                df, id_col, time_col, factorized.codes
+            )
+        if sort_idxs is not None:
+            first_idxs = sort_idxs[first_idxs]
+            last_idxs = sort_idxs[last_idxs]
+        times = df[time_col]
+        first_times = drop_index_if_pandas(take_rows(times, first_idxs))
+        last_times = drop_index_if_pandas(take_rows(times, last_idxs))
+        return cls(
+            uids, indptr, sort_idxs, first_times, last_times, factorized.codes, id_col
+        )
+
+    @property
+    def n_series(self) -> int:
+        return self.indptr.size - 1
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.indptr[-1])
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def __len__(self) -> int:
+        return self.n_series
+
+    def get_range(self, uid: Any) -> slice:
+        """Rows of the sorted data that belong to `uid`."""
+        if self._uid2pos is None:
+            if isinstance(self.uids, pa_ChunkedArray):
+                uids = self.uids.to_pylist()
+            else:
+                uids = self.uids.to_list()
+            self._uid2pos = {uid: i for i, uid in enumerate(uids)}
+        pos = self._uid2pos[uid]
+        return slice(int(self.indptr[pos]), int(self.indptr[pos + 1]))
+
+    def check_df(self, df: DataFrame) -> None:
+        """Make sure that `df` has the number of rows that this index was built with
+        and, if the index knows the id column, that each serie starts with its id."""
+        if df.shape[0] != self.n_rows:
+            raise ValueError(
+                f"The series index was built for {self.n_rows:,} rows "
+                f"but the dataframe has {df.shape[0]:,}."
+            )
+        if self.id_col is None:
+            return
+        first_idxs = self.indptr[:-1]
+        if self.sort_idxs is not None:
+            first_idxs = self.sort_idxs[first_idxs]
+        first_ids = take_rows(df[self.id_col], first_idxs)
+        if not np.array_equal(first_ids.to_numpy(), self.uids.to_numpy()):
+            raise ValueError(
+                f"The `{self.id_col}` column of the dataframe doesn't match "
+                "the ids that the series index was built with."
+            )
 
-# %% ../nbs/processing.ipynb 75
+    def sort(
+        self, df: Union[DataFrame, Series, np.ndarray]
+    ) -> Union[DataFrame, Series, np.ndarray]:
+        """Sort `df` by id and time using the stored indices."""
+        if self.sort_idxs is None:
+            return df
+        return take_rows(df, self.sort_idxs)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(n_series={self.n_series:,}, n_rows={self.n_rows:,})"
+
+# %% ../nbs/processing.ipynb 118
 class ProcessedDF(NamedTuple):
     uids: Series
     last_times: np.ndarray
@@ -656,13 +2085,16 @@ def process_df(
     id_col: str,
     time_col: str,
     target_col: Optional[str],
+    series_index: Optional[SeriesIndex] = None,
 ) -> ProcessedDF:
     """Extract components from dataframe
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame or pyarrow Table
         Input dataframe with id, times and target values.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. If `None`, it's computed from the data.
 
     Returns
     -------
@@ -681,27 +2113,22 @@ def process_df(
     # validations
     validate_format(df, id_col, time_col, target_col)
 
-    # ids
-    id_counts = counts_by_id(df, id_col)
-    uids = id_counts[id_col]
-
-    # indices
-    sizes = id_counts["counts"].to_numpy()
-    indptr = np.append(0, sizes.cumsum()).astype(np.int32)
-    last_idxs = indptr[1:] - 1
+    # ids, indices and sorting
+    if series_index is None:
+        series_index = SeriesIndex.from_df(df, id_col, time_col)
+    else:
+        series_index.check_df(df)
 
     # data
     data = value_cols_to_numpy(df, id_col, time_col, target_col)
+    if series_index.sort_idxs is not None:
+        data = data[series_index.sort_idxs]
+    times = series_index.last_times.to_numpy()
+    return ProcessedDF(
+        series_index.uids, times, data, series_index.indptr, series_index.sort_idxs
+    )
 
-    # check if we need to sort
-    sort_idxs = maybe_compute_sort_indices(df, id_col, time_col)
-    if sort_idxs is not None:
-        data = data[sort_idxs]
-        last_idxs = sort_idxs[last_idxs]
-    times = df[time_col].to_numpy()[last_idxs]
-    return ProcessedDF(uids, times, data, indptr, sort_idxs)
-
-# %% ../nbs/processing.ipynb 77
+# %% ../nbs/processing.ipynb 120
 class DataFrameProcessor:
     def __init__(
         self,
@@ -712,78 +2139,300 @@ class DataFrameProcessor:
         self.id_col = id_col
         self.time_col = time_col
         self.target_col = target_col
+        self.state: Optional[ProcessedDF] = None
 
     def process(
-        self, df: DataFrame
+        self,
+        df: DataFrame,
+        series_index: Optional[SeriesIndex] = None,
     ) -> Tuple[Series, np.ndarray, np.ndarray, np.ndarray, Optional[np.ndarray]]:
-        return process_df(df, self.id_col, self.time_col, self.target_col)
+        self.state = process_df(
+            df, self.id_col, self.time_col, self.target_col, series_index
+        )
+        return self.state
+
+    def update(self, df: DataFrame) -> ProcessedDF:
+        """Add new observations to the processed data
+
+        The stored values are copied together with the new ones into a new array,
+        so each update takes time proportional to the whole history.
+
+        Parameters
+        ----------
+        df : pandas or polars DataFrame or pyarrow Table
+            New rows, with the same columns as the processed data.
+            The rows of each serie must come after its last stored time. Unseen series are added.
+
+        Returns
+        -------
+        ProcessedDF
+            Processed data with the new rows. Its `sort_idxs` refer to the rows of `df`.
+        """
+        from utilsforecast.grouped_array import _append_several
+
+        if self.state is None:
+            raise ValueError("Must call `process` before `update`.")
+        prev = self.state
+        series_index = SeriesIndex.from_df(df, self.id_col, self.time_col)
+        batch = process_df(
+            df, self.id_col, self.time_col, self.target_col, series_index
+        )
+        if batch.data.shape[1] != prev.data.shape[1]:
+            raise ValueError(
+                f"Expected {prev.data.shape[1]} value columns, got {batch.data.shape[1]}."
+            )
+
+        # position of the stored and new series in the merged ids
+        n_prev = len(prev.uids)
+        if isinstance(prev.uids, pa_ChunkedArray):
+            all_ids = pa.concat_tables(
+                [pa.table({self.id_col: uids}) for uids in (prev.uids, batch.uids)]
+            )
+        else:
+            all_ids = vertical_concat(
+                [prev.uids.to_frame(self.id_col), batch.uids.to_frame(self.id_col)]
+            )
+        factorized = factorize_ids(all_ids, self.id_col)
+        prev_pos = factorized.codes[:n_prev]
+        batch_pos = factorized.codes[n_prev:]
+        n_series = len(factorized.uniques)
+        is_new = np.full(n_series, True)
+        is_new[prev_pos] = False
+
+        last_times = np.empty(n_series, dtype=prev.last_times.dtype)
+        last_times[prev_pos] = prev.last_times
+        seen = ~is_new[batch_pos]
+        overlaps = (
+            series_index.first_times.to_numpy()[seen] <= last_times[batch_pos[seen]]
+        )
+        if overlaps.any():
+            bad_ids = take_rows(batch.uids, np.flatnonzero(seen)[overlaps])
+            raise ValueError(
+                f"The following series have rows that are not after their last stored time: {list(bad_ids)}"
+            )
+        last_times[batch_pos] = batch.last_times
+
+        # new values in the order of the merged ids
+        sizes = np.diff(batch.indptr)
+        # both sets of ids are sorted, so the new values already follow the merged ids
+        values = batch.data
+        new_sizes = np.zeros(n_series, dtype=batch.indptr.dtype)
+        new_sizes[batch_pos] = sizes
+        data, indptr = _append_several(
+            prev.data, prev.indptr, new_sizes, values, is_new
+        )
+        self.state = ProcessedDF(
+            factorized.uniques, last_times, data, indptr, batch.sort_idxs
+        )
+        return self.state
+
+# %% ../nbs/processing.ipynb 129
+def _times_to_numpy(times: Union[Series, pd.Index]) -> np.ndarray:
+    """Numeric representation of the times that preserves their order."""
+    if isinstance(times, (pd.Series, pd.Index)):
+        if _is_dt_dtype(times):
+            return times.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        return times.to_numpy()
+    if isinstance(times, pa_ChunkedArray):
+        if _is_dt_dtype(times):
+            tz = getattr(times.type, "tz", None)
+            return times.cast(pa.timestamp("ns", tz)).to_numpy().view(np.int64)
+        return times.to_numpy()
+    return times.to_physical().to_numpy()
 
-# %% ../nbs/processing.ipynb 82
-def _single_split(
+
+def _pa_times_to_pandas(times: pa_ChunkedArray) -> pd.Series:
+    """Per serie times of an arrow table as a pandas Series, to compute the offsets."""
+    if pa.types.is_date(times.type):
+        times = times.cast(pa.timestamp("ns"))
+    return times.to_pandas()
+
+
+@njit(nogil=True, cache=True)
+def _segment_searchsorted_kernel(
+    values: np.ndarray, indptr: np.ndarray, targets: np.ndarray
+) -> np.ndarray:
+    n_series = indptr.size - 1
+    out = np.empty(n_series, dtype=np.int64)
+    for i in range(n_series):
+        start = indptr[i]
+        end = indptr[i + 1]
+        out[i] = start + np.searchsorted(values[start:end], targets[i], side="right")
+    return out
+
+
+def _segment_searchsorted(
+    values: np.ndarray, indptr: np.ndarray, targets: np.ndarray
+) -> np.ndarray:
+    """Position of the first value greater than the target in each sorted segment."""
+    if NUMBA_INSTALLED:
+        return _segment_searchsorted_kernel(values, indptr, targets)
+    sizes = np.diff(indptr)
+    n_le = np.add.reduceat(
+        values <= np.repeat(targets, sizes), indptr[:-1], dtype=np.int64
+    )
+    return indptr[:-1] + n_le
+
+
+def _ranges_to_positions(starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    """Concatenate the ranges [starts[i], stops[i])"""
+    sizes = (stops - starts).astype(np.int64, copy=False)
+    offsets = np.repeat(sizes.cumsum() - sizes - starts, sizes)
+    return np.arange(sizes.sum()) - offsets
+
+
+def _backtest_windows(
     df: DataFrame,
-    i_window: int,
     n_windows: int,
     h: int,
     id_col: str,
     time_col: str,
     freq: Union[int, str, pd.offsets.BaseOffset],
-    max_dates: Series,
-    step_size: Optional[int] = None,
-    input_size: Optional[int] = None,
-) -> Tuple[DataFrame, Series, Series]:
+    step_size: Optional[int],
+    input_size: Optional[int],
+    series_index: SeriesIndex,
+) -> Generator[Tuple[DataFrame, np.ndarray, np.ndarray, np.ndarray], None, None]:
+    """Cutoffs and positions of the train and validation rows of each serie for every window.
+
+    The positions are relative to the data sorted by id and time and are given
+    as the start of the train set, the end of the train set (which is the start
+    of the validation set) and the end of the validation set for each serie."""
     if step_size is None:
         step_size = h
     test_size = h + step_size * (n_windows - 1)
-    offset = test_size - i_window * step_size
-    train_ends = offset_times(max_dates, freq, -offset)
-    valid_ends = offset_times(train_ends, freq, h)
-    train_mask = df[time_col].le(train_ends)
-    valid_mask = df[time_col].gt(train_ends) & df[time_col].le(valid_ends)
-    if input_size is not None:
-        train_starts = offset_times(train_ends, freq, -input_size)
-        train_mask &= df[time_col].gt(train_starts)
-    if isinstance(train_mask, pd.Series):
-        train_sizes = train_mask.groupby(df[id_col], observed=True, sort=False).sum()
-        train_sizes = train_sizes.reset_index()
-    else:
-        tmp_df = pl.DataFrame({id_col: df[id_col], time_col: train_mask})
-        train_sizes = group_by_agg(
-            tmp_df, id_col, {time_col: "sum"}, maintain_order=True
-        )
-    zeros_mask = train_sizes[time_col].eq(0)
-    if zeros_mask.all():
-        raise ValueError(
-            "All series are too short for the cross validation settings, "
-            f"at least {offset + 1} samples are required.\n"
-            "Please reduce `n_windows` or `h`."
-        )
-    elif zeros_mask.any():
-        ids = filter_with_mask(train_sizes[id_col], zeros_mask)
-        warnings.warn(
-            "The following series are too short for the window "
-            f"and will be dropped: {reprlib.repr(list(ids))}"
-        )
-        dropped_ids = is_in(df[id_col], ids)
-        valid_mask &= ~dropped_ids
-    if isinstance(train_ends, pd.Series):
-        cutoffs: DataFrame = (
-            train_ends.set_axis(df[id_col])
-            .groupby(id_col, observed=True)
-            .head(1)
-            .rename("cutoff")
-            .reset_index()
-        )
+    indptr = series_index.indptr
+    starts = indptr[:-1]
+    times = _times_to_numpy(series_index.sort(df[time_col]))
+    last_times = series_index.last_times
+    if isinstance(last_times, pa_ChunkedArray):
+        last_times = _pa_times_to_pandas(last_times)
+    for i_window in range(n_windows):
+        offset = test_size - i_window * step_size
+        train_ends = offset_times(last_times, freq, -offset)
+        valid_ends = offset_times(train_ends, freq, h)
+        train_stops = _segment_searchsorted(times, indptr, _times_to_numpy(train_ends))
+        valid_stops = _segment_searchsorted(times, indptr, _times_to_numpy(valid_ends))
+        if input_size is None:
+            train_starts = starts
+        else:
+            train_starts = _segment_searchsorted(
+                times,
+                indptr,
+                _times_to_numpy(offset_times(train_ends, freq, -input_size)),
+            )
+        zeros_mask = train_stops == train_starts
+        if zeros_mask.all():
+            raise ValueError(
+                "All series are too short for the cross validation settings, "
+                f"at least {offset + 1} samples are required.\n"
+                "Please reduce `n_windows` or `h`."
+            )
+        elif zeros_mask.any():
+            ids = take_rows(series_index.uids, np.flatnonzero(zeros_mask))
+            warnings.warn(
+                "The following series are too short for the window "
+                f"and will be dropped: {reprlib.repr(list(ids))}"
+            )
+            valid_stops = np.where(zeros_mask, train_stops, valid_stops)
+        if isinstance(df, pd.DataFrame):
+            cutoffs: DataFrame = pd.DataFrame(
+                {id_col: series_index.uids, "cutoff": train_ends}
+            )
+        elif isinstance(df, pa_Table):
+            cutoff = pa.array(train_ends).cast(df.schema.field(time_col).type)
+            cutoffs = pa.table({id_col: series_index.uids, "cutoff": cutoff})
+        else:
+            cutoffs = pl_DataFrame({id_col: series_index.uids, "cutoff": train_ends})
+        yield cutoffs, train_starts, train_stops, valid_stops
+
+# %% ../nbs/processing.ipynb 130
+class BacktestSplitIndices(NamedTuple):
+    """Rows that belong to each serie in a backtest window.
+
+    The positions are relative to the dataframe sorted by id and time,
+    e.g. the output of `SeriesIndex.sort` or `ensure_sorted`."""
+
+    cutoffs: DataFrame
+    train_starts: np.ndarray
+    train_ends: np.ndarray
+    valid_ends: np.ndarray
+
+    @property
+    def train_sizes(self) -> np.ndarray:
+        return self.train_ends - self.train_starts
+
+    @property
+    def valid_sizes(self) -> np.ndarray:
+        return self.valid_ends - self.train_ends
+
+    def train_idxs(self) -> np.ndarray:
+        """Positions of the train rows."""
+        return _ranges_to_positions(self.train_starts, self.train_ends)
+
+    def valid_idxs(self) -> np.ndarray:
+        """Positions of the validation rows."""
+        return _ranges_to_positions(self.train_ends, self.valid_ends)
+
+
+def backtest_split_indices(
+    df: DataFrame,
+    n_windows: int,
+    h: int,
+    id_col: str,
+    time_col: str,
+    freq: Union[int, str, pd.offsets.BaseOffset],
+    step_size: Optional[int] = None,
+    input_size: Optional[int] = None,
+    series_index: Optional[SeriesIndex] = None,
+) -> Generator[BacktestSplitIndices, None, None]:
+    """Generate the backtest windows as row positions instead of dataframes
+
+    Parameters
+    ----------
+    df : pandas or polars DataFrame or pyarrow Table
+        Input dataframe with id and times.
+    n_windows : int
+        Number of windows.
+    h : int
+        Forecast horizon.
+    id_col : str
+        Column that identifies each serie.
+    time_col : str
+        Column that identifies each timestep, its values can be timestamps or integers.
+    freq : str, int or pandas offset
+        Frequency of the data.
+    step_size : int, optional (default=None)
+        Step size between each window. If `None` it's equal to `h`.
+    input_size : int, optional (default=None)
+        Maximum number of training samples per serie in each window.
+    series_index : SeriesIndex, optional (default=None)
+        Precomputed grouping of `df`. If `None`, it's computed from the data.
+
+    Yields
+    ------
+    BacktestSplitIndices
+        Cutoffs and per serie boundaries of the train and validation sets
+        relative to `df` sorted by id and time.
+    """
+    if series_index is None:
+        series_index = SeriesIndex.from_df(df, id_col, time_col)
     else:
-        cutoffs = train_ends.to_frame().with_columns(df[id_col])
-        cutoffs = (
-            group_by(cutoffs, id_col)
-            .agg(pl.col(time_col).head(1))
-            .explode(pl.col(time_col))
-            .rename({time_col: "cutoff"})
-        )
-    return cutoffs, train_mask, valid_mask
+        series_index.check_df(df)
+    windows = _backtest_windows(
+        df,
+        n_windows=n_windows,
+        h=h,
+        id_col=id_col,
+        time_col=time_col,
+        freq=freq,
+        step_size=step_size,
+        input_size=input_size,
+        series_index=series_index,
+    )
+    for cutoffs, train_starts, train_ends, valid_ends in windows:
+        yield BacktestSplitIndices(cutoffs, train_starts, train_ends, valid_ends)
 
-# %% ../nbs/processing.ipynb 83
+# %% ../nbs/processing.ipynb 131
 def backtest_splits(
     df: DataFrame,
     n_windows: int,
@@ -793,29 +2442,44 @@ def backtest_splits(
     freq: Union[int, str, pd.offsets.BaseOffset],
     step_size: Optional[int] = None,
     input_size: Optional[int] = None,
+    series_index: Optional[SeriesIndex] = None,
 ) -> Generator[Tuple[DataFrame, DataFrame, DataFrame], None, None]:
-    if isinstance(df, pd.DataFrame):
-        max_dates = df.groupby(id_col, observed=True)[time_col].transform("max")
+    if series_index is None:
+        series_index = SeriesIndex.from_df(df, id_col, time_col)
+    splits = backtest_split_indices(
+        df,
+        n_windows=n_windows,
+        h=h,
+        id_col=id_col,
+        time_col=time_col,
+        freq=freq,
+        step_size=step_size,
+        input_size=input_size,
+        series_index=series_index,
+    )
+    if series_index.sort_idxs is None:
+        appearance = None
     else:
-        max_dates = df.select(pl.col(time_col).max().over(id_col))[time_col]
-    for i in range(n_windows):
-        cutoffs, train_mask, valid_mask = _single_split(
-            df,
-            i_window=i,
-            n_windows=n_windows,
-            h=h,
-            id_col=id_col,
-            time_col=time_col,
-            freq=freq,
-            max_dates=max_dates,
-            step_size=step_size,
-            input_size=input_size,
+        # order of the series in df
+        first_rows = np.minimum.reduceat(
+            series_index.sort_idxs, series_index.indptr[:-1]
         )
-        train = filter_with_mask(df, train_mask)
-        valid = filter_with_mask(df, valid_mask)
+        appearance = np.argsort(first_rows)
+    for split in splits:
+        train_idxs = split.train_idxs()
+        valid_idxs = split.valid_idxs()
+        if series_index.sort_idxs is not None:
+            # keep the rows in their original order
+            train_idxs = np.sort(series_index.sort_idxs[train_idxs])
+            valid_idxs = np.sort(series_index.sort_idxs[valid_idxs])
+        train = take_rows(df, train_idxs)
+        valid = take_rows(df, valid_idxs)
+        cutoffs = split.cutoffs
+        if appearance is not None:
+            cutoffs = drop_index_if_pandas(take_rows(cutoffs, appearance))
         yield cutoffs, train, valid
 
-# %% ../nbs/processing.ipynb 87
+# %% ../nbs/processing.ipynb 142
 def add_insample_levels(
     df: DataFrame,
     models: List[str],
@@ -823,28 +2487,42 @@ def add_insample_levels(
     id_col: str = "unique_id",
     target_col: str = "y",
 ) -> DataFrame:
-    import operator
-
     from scipy.stats import norm
 
-    df = copy_if_pandas(df, deep=False)
-    cuts = norm.ppf(0.5 + np.asarray(level) / 200).reshape(1, -1)
+    cuts = norm.ppf(0.5 + np.asarray(level) / 200)
+    cols = [
+        f"{model}-{side}-{lvl}"
+        for model in models
+        for side in ("lo", "hi")
+        for lvl in level
+    ]
     if isinstance(df, pd.DataFrame):
         errors = df[models].sub(df[target_col], axis=0)
-        stds = errors.groupby(df[id_col], observed=True).transform("std")
-    else:
-        exprs = (pl.col(m).sub(pl.col(target_col)).std().over(id_col) for m in models)
-        stds = df.select(exprs)
-    stds = to_numpy(stds)
-    preds = to_numpy(df[models])
-    vals = np.empty_like(preds, shape=(preds.shape[0], len(models) * 2 * len(level)))
-    cols = []
-    k = 0
-    for i, model in enumerate(models):
-        widths = cuts * stds[:, [i]]
-        for side, op in {"lo": operator.sub, "hi": operator.add}.items():
-            for j, lvl in enumerate(level):
-                cols.append(f"{model}-{side}-{lvl}")
-                vals[:, k] = op(preds[:, i], widths[:, j])
-                k += 1
-    return assign_columns(df, cols, vals)
+        stds = to_numpy(errors.groupby(df[id_col], observed=True).transform("std")).T
+        preds = to_numpy(df[models]).T
+        # (models, sides, levels, rows), which is the layout pandas uses to store columns
+        vals = np.empty_like(preds, shape=(len(models), 2, len(level), preds.shape[1]))
+        np.multiply(stds[:, None, :], cuts[:, None], out=vals[:, 1])
+        np.subtract(preds[:, None, :], vals[:, 1], out=vals[:, 0])
+        vals[:, 1] += preds[:, None, :]
+        vals = vals.reshape(len(cols), -1).T
+        if df.columns.intersection(cols).empty:
+            levels_df = pd.DataFrame(vals, columns=cols, index=df.index, copy=False)
+            return pd.concat([df, levels_df], axis=1, copy=False)
+        return assign_columns(copy_if_pandas(df, deep=False), cols, vals)
+    # the stds are stored first so that each one is computed once
+    std_cols = [f"__{model}_std" for model in models]
+    exprs: List[pl_Expr] = []
+    for model, std_col in zip(models, std_cols):
+        for op in ("sub", "add"):
+            exprs.extend(
+                getattr(pl.col(model), op)(pl.col(std_col) * cut) for cut in cuts
+            )
+    return (
+        df.with_columns(
+            pl.col(model).sub(pl.col(target_col)).std().over(id_col).alias(std_col)
+            for model, std_col in zip(models, std_cols)
+        )
+        .with_columns(expr.alias(col) for expr, col in zip(exprs, cols))
+        .drop(std_cols)
+    )
@@ -5,16 +5,29 @@ __all__ = ['ensure_shallow_copy', 'ensure_time_dtype', 'validate_format', 'valid
 
 # %% ../nbs/validation.ipynb 2
 import re
-from typing import Optional, Union
+from typing import Any, Dict, Optional, Union
 
 import pandas as pd
 
-from .compat import DFType, DataFrame, Series, pl_DataFrame, pl_Series, pl
+from utilsforecast.compat import (
+    DFType,
+    DataFrame,
+    Series,
+    pa,
+    pa_ChunkedArray,
+    pa_Table,
+    pl,
+    pl_DataFrame,
+    pl_LazyFrame,
+    pl_Series,
+)
 
 # %% ../nbs/validation.ipynb 5
-def _is_int_dtype(s: Union[pd.Index, Series]) -> bool:
+def _is_int_dtype(s: Union[pd.Index, Series, pa_ChunkedArray]) -> bool:
     if isinstance(s, (pd.Index, pd.Series)):
         out = pd.api.types.is_integer_dtype(s.dtype)
+    elif isinstance(s, pa_ChunkedArray):
+        out = pa.types.is_integer(s.type)
     else:
         try:
             out = s.dtype.is_integer()
@@ -23,9 +36,11 @@ def _is_int_dtype(s: Union[pd.Index, Series]) -> bool:
     return out
 
 
-def _is_dt_dtype(s: Union[pd.Index, Series]) -> bool:
+def _is_dt_dtype(s: Union[pd.Index, Series, pa_ChunkedArray]) -> bool:
     if isinstance(s, (pd.Index, pd.Series)):
         out = pd.api.types.is_datetime64_any_dtype(s.dtype)
+    elif isinstance(s, pa_ChunkedArray):
+        out = pa.types.is_timestamp(s.type) or pa.types.is_date(s.type)
     else:
         out = s.dtype in (pl.Date, pl.Datetime)
     return out
@@ -34,6 +49,14 @@ def _is_dt_dtype(s: Union[pd.Index, Series]) -> bool:
 def _is_dt_or_int(s: Series) -> bool:
     return _is_dt_dtype(s) or _is_int_dtype(s)
 
+
+def _pl_lazy_schema(df: pl_LazyFrame) -> Dict[str, Any]:
+    """Schema of a LazyFrame, resolved without collecting it."""
+    try:
+        return df.collect_schema()
+    except AttributeError:
+        return df.schema
+
 # %% ../nbs/validation.ipynb 10
 def ensure_shallow_copy(df: pd.DataFrame) -> pd.DataFrame:
     from packaging.version import Version
@@ -82,7 +105,7 @@ def validate_format(
 
     Parameters
     ----------
-    df : pandas or polars DataFrame
+    df : pandas or polars DataFrame, polars LazyFrame or pyarrow Table
         DataFrame with time series in long format.
     id_col : str (default='unique_id')
         Column that identifies each serie.
@@ -95,22 +118,27 @@ def validate_format(
     -------
     None
     """
-    if not isinstance(df, (pd.DataFrame, pl_DataFrame)):
+    if isinstance(df, pl_LazyFrame):
+        # the checks only need the schema, so they're run on an empty frame
+        df = pl_DataFrame(schema=_pl_lazy_schema(df))
+    if not isinstance(df, (pd.DataFrame, pl_DataFrame, pa_Table)):
         raise ValueError(
-            f"`df` must be either pandas or polars dataframe, got {type(df)}"
+            f"`df` must be either pandas or polars dataframe or a pyarrow table, got {type(df)}"
         )
 
     # required columns
     expected_cols = {id_col, time_col}
     if target_col is not None:
         expected_cols.add(target_col)
-    missing_cols = sorted(expected_cols - set(df.columns))
+    columns = df.column_names if isinstance(df, pa_Table) else df.columns
+    missing_cols = sorted(expected_cols - set(columns))
     if missing_cols:
         raise ValueError(f"The following columns are missing: {missing_cols}")
 
     # time col
     if not _is_dt_or_int(df[time_col]):
-        times_dtype = df[time_col].dtype
+        times = df[time_col]
+        times_dtype = times.type if isinstance(times, pa_ChunkedArray) else times.dtype
         raise ValueError(
             f"The time column ('{time_col}') should have either timestamps or integers, got '{times_dtype}'."
         )
@@ -119,8 +147,13 @@ def validate_format(
     if target_col is None:
         return None
     target = df[target_col]
+    target_type = target.type if isinstance(target, pa_ChunkedArray) else target.dtype
     if isinstance(target, pd.Series):
-        is_numeric = pd.api.types.is_numeric_dtype(target.dtype)
+        is_numeric = pd.api.types.is_numeric_dtype(target_type)
+    elif isinstance(target, pa_ChunkedArray):
+        is_numeric = pa.types.is_integer(target_type) or pa.types.is_floating(
+            target_type
+        )
     else:
         try:
             is_numeric = target.dtype.is_numeric()
@@ -128,10 +161,10 @@ def validate_format(
             is_numeric = target.is_numeric()
     if not is_numeric:
         raise ValueError(
-            f"The target column ('{target_col}') should have a numeric data type, got '{target.dtype}')"
+            f"The target column ('{target_col}') should have a numeric data type, got '{target_type}')"
         )
 
-# %% ../nbs/validation.ipynb 19
+# %% ../nbs/validation.ipynb 20
 def validate_freq(
     times: Series,
     freq: Union[str, int],